@@ -5,6 +5,12 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from backend.config import DATABASE_URL
+from backend.db.database import Base
+
+# Import every model so Base.metadata knows all tables
+from backend.models import user, email_log, gmail_token, scheduler_lease, send_job, reply_check, processed_message, profiling, contact, suppression, campaign  # noqa: F401
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -14,11 +20,15 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# The app's DATABASE_URL wins over the placeholder in alembic.ini
+# ("%" must be escaped for configparser)
+config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -65,7 +75,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
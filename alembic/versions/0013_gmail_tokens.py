@@ -0,0 +1,40 @@
+"""gmail tokens
+
+Used to be created by 0001, which older databases are stamped at
+without running it; databases that did run it already have the table.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 11:44:02.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, Sequence[str], None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('gmail_tokens'):
+        return
+
+    op.create_table('gmail_tokens',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('token_encrypted', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('gmail_tokens')
@@ -1,20 +1,31 @@
+import json
+from typing import Optional
+
 from fastapi import APIRouter, Request, HTTPException, Depends
 from fastapi.responses import JSONResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.database import get_db
+from backend.db.database import get_db, get_async_db, get_pool_metrics
 from backend.models.user import User
+from backend.models.profiling import PassProfile
 from backend.auth.website_auth import admin_required
+from backend.services.user_cache import refresh_user_profile
+from backend.services.profiler import profiling_switch
+from backend.services.send_queue import send_queue
+from backend.services.suppression import suppression_index
 
 router = APIRouter(prefix="/admin")
 
 
 @router.get("/users")
-def get_all_users(request: Request, db: Session = Depends(get_db)):
+async def get_all_users(request: Request, db: AsyncSession = Depends(get_async_db)):
     if not admin_required(request):
         raise HTTPException(status_code=403, detail="Unauthorized")
 
-    users = db.query(User).all()
+    result = await db.execute(select(User))
+    users = result.scalars().all()
 
     return JSONResponse(content=[
         {
@@ -39,6 +50,7 @@ def pause_user(user_id: int, request: Request, db: Session = Depends(get_db)):
 
     user.is_paused = True
     db.commit()
+    refresh_user_profile(user)
     return {"status": "paused"}
 
 
@@ -53,4 +65,101 @@ def resume_user(user_id: int, request: Request, db: Session = Depends(get_db)):
 
     user.is_paused = False
     db.commit()
-    return {"status": "active"}
\ No newline at end of file
+    refresh_user_profile(user)
+    return {"status": "active"}
+
+
+@router.get("/db/pool")
+def db_pool_metrics(request: Request):
+    if not admin_required(request):
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    return get_pool_metrics()
+
+
+# -------------------------------------------------
+# PROFILING (scheduler / reply-check passes)
+# -------------------------------------------------
+
+@router.get("/profiling")
+def list_profiles(request: Request, kind: str = None, limit: int = 50, db: Session = Depends(get_db)):
+    if not admin_required(request):
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    query = db.query(PassProfile)
+    if kind:
+        query = query.filter(PassProfile.kind == kind)
+    profiles = query.order_by(PassProfile.id.desc()).limit(min(max(limit, 1), 200)).all()
+
+    return {
+        "enabled": profiling_switch.is_enabled(),
+        "profiles": [
+            {
+                "id": p.id,
+                "kind": p.kind,
+                "label": p.label,
+                "node": p.node,
+                "started_at": p.started_at.isoformat() if p.started_at else None,
+                "wall_seconds": p.wall_seconds
+            } for p in profiles
+        ]
+    }
+
+
+@router.post("/profiling/enable")
+def enable_profiling(request: Request, db: Session = Depends(get_db)):
+    if not admin_required(request):
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    # Processes only read the flag with the runtime switch on
+    if not profiling_switch.runtime_switch:
+        raise HTTPException(status_code=409, detail="PROFILING_RUNTIME_SWITCH is off")
+
+    profiling_switch.set(db, True)
+    return {"status": "enabled"}
+
+
+@router.post("/profiling/disable")
+def disable_profiling(request: Request, db: Session = Depends(get_db)):
+    if not admin_required(request):
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    profiling_switch.set(db, False)
+    return {"status": "disabled"}
+
+
+@router.get("/profiling/{profile_id}")
+def get_profile(profile_id: int, request: Request, db: Session = Depends(get_db)):
+    if not admin_required(request):
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    profile = db.get(PassProfile, profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return {
+        "id": profile.id,
+        "kind": profile.kind,
+        "label": profile.label,
+        "node": profile.node,
+        "started_at": profile.started_at.isoformat() if profile.started_at else None,
+        **json.loads(profile.data)
+    }
+
+
+@router.post("/suppression/backfill")
+def backfill_suppression(request: Request, db: Session = Depends(get_db)):
+    """Index BOUNCED / REPLIED logs written before the suppression index existed"""
+    if not admin_required(request):
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    return {"status": "success", "logs_scanned": suppression_index.backfill(db)}
+
+
+@router.post("/send-jobs/requeue")
+def requeue_dead_jobs(request: Request, user_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Retry dead-lettered sends that ran out of attempts (all users, or one)"""
+    if not admin_required(request):
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    return {"status": "success", "requeued": send_queue.requeue_dead(db, user_id)}
@@ -0,0 +1,210 @@
+from fastapi import APIRouter, Request, Depends
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from backend.api.user_settings import FollowupCadence, cadence_error, cadence_json
+from backend.config import MAX_CAMPAIGNS_PER_USER
+from backend.db.database import get_db
+from backend.models.campaign import Campaign
+from backend.models.send_job import SendJob
+from backend.models.user import User
+from backend.services.cadence import compile_cadence
+from backend.services.campaigns import campaign_cache
+from backend.services.contact_sources import FILE_SOURCE, SHEETS_SOURCE
+from backend.services.send_queue import PENDING, CLAIMED
+
+router = APIRouter(prefix="/campaigns")
+
+# Imported contacts live in one table per user: they stay with the user's own list
+CAMPAIGN_SOURCES = (SHEETS_SOURCE, FILE_SOURCE)
+
+
+# -------------------------------------------------
+# REQUEST MODELS
+# -------------------------------------------------
+
+class CampaignRequest(BaseModel):
+    name: Optional[str] = None
+    contact_source: Optional[str] = None
+    sheet_id: Optional[str] = None
+    email_template: Optional[str] = None
+    followup_template: Optional[str] = None
+    email_subject: Optional[str] = None
+    followup_cadence: Optional[FollowupCadence] = None
+    daily_share: Optional[int] = None
+    is_paused: Optional[bool] = None
+
+
+def campaign_dict(campaign: Campaign):
+    return {
+        "id": campaign.id,
+        "name": campaign.name,
+        "contact_source": campaign.contact_source,
+        "sheet_id": campaign.sheet_id,
+        "email_template": campaign.email_template,
+        "followup_template": campaign.followup_template,
+        "email_subject": campaign.email_subject,
+        "followup_cadence": compile_cadence(campaign.followup_cadence).to_dict() if campaign.followup_cadence else None,
+        "daily_share": campaign.daily_share,
+        "is_paused": campaign.is_paused,
+    }
+
+
+def apply_changes(db: Session, user: User, campaign: Campaign, payload: CampaignRequest) -> Optional[str]:
+    """Copy the given fields onto `campaign`; returns an error message instead if one is invalid"""
+    if payload.name is not None:
+        if not payload.name.strip():
+            return "Campaign name must not be empty"
+        campaign.name = payload.name.strip()
+
+    if payload.contact_source is not None:
+        if payload.contact_source not in CAMPAIGN_SOURCES:
+            return "contact_source must be 'sheets' or 'file'"
+        campaign.contact_source = payload.contact_source
+
+    if payload.sheet_id is not None:
+        campaign.sheet_id = payload.sheet_id.strip() or None
+
+    if campaign.contact_source == SHEETS_SOURCE and campaign.sheet_id:
+        # Two campaigns writing the same sheet would step on each other's rows
+        others = db.query(Campaign.id).filter(
+            Campaign.user_id == user.id,
+            Campaign.sheet_id == campaign.sheet_id,
+            Campaign.contact_source == SHEETS_SOURCE
+        )
+        if campaign.id is not None:
+            others = others.filter(Campaign.id != campaign.id)
+        if others.first() or campaign.sheet_id == user.sheet_id:
+            return "This sheet is already used by another campaign"
+
+    if payload.email_template is not None:
+        campaign.email_template = payload.email_template or None
+
+    if payload.followup_template is not None:
+        campaign.followup_template = payload.followup_template or None
+
+    if payload.email_subject is not None:
+        campaign.email_subject = payload.email_subject or None
+
+    if payload.followup_cadence is not None:
+        error = cadence_error(payload.followup_cadence)
+        if error:
+            return error
+        campaign.followup_cadence = cadence_json(payload.followup_cadence)
+
+    if payload.daily_share is not None:
+        if payload.daily_share < 0:
+            return "daily_share must not be negative"
+        campaign.daily_share = payload.daily_share
+
+    if payload.is_paused is not None:
+        campaign.is_paused = payload.is_paused
+
+    return None
+
+
+# -------------------------------------------------
+# LIST CAMPAIGNS
+# -------------------------------------------------
+
+@router.get("")
+def list_campaigns(request: Request, db: Session = Depends(get_db)):
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JSONResponse({"error": "Not logged in"}, status_code=401)
+
+    campaigns = db.query(Campaign).filter(Campaign.user_id == user_id).order_by(Campaign.id).all()
+    return {"campaigns": [campaign_dict(campaign) for campaign in campaigns]}
+
+
+# -------------------------------------------------
+# CREATE CAMPAIGN
+# -------------------------------------------------
+
+@router.post("")
+def create_campaign(request: Request, payload: CampaignRequest, db: Session = Depends(get_db)):
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JSONResponse({"error": "Not logged in"}, status_code=401)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        return JSONResponse({"error": "User not found"}, status_code=404)
+
+    if db.query(Campaign).filter(Campaign.user_id == user.id).count() >= MAX_CAMPAIGNS_PER_USER:
+        return JSONResponse({"error": f"At most {MAX_CAMPAIGNS_PER_USER} campaigns"}, status_code=400)
+
+    if not payload.name:
+        return JSONResponse({"error": "Campaign name is required"}, status_code=400)
+
+    campaign = Campaign(user_id=user.id, contact_source=SHEETS_SOURCE, daily_share=1, is_paused=False)
+    error = apply_changes(db, user, campaign, payload)
+    if error:
+        return JSONResponse({"error": error}, status_code=400)
+
+    db.add(campaign)
+    db.commit()
+    campaign_cache.invalidate(user.id)
+
+    return {"status": "success", "campaign": campaign_dict(campaign)}
+
+
+# -------------------------------------------------
+# UPDATE CAMPAIGN
+# -------------------------------------------------
+
+@router.post("/{campaign_id}")
+def update_campaign(campaign_id: int, request: Request, payload: CampaignRequest, db: Session = Depends(get_db)):
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JSONResponse({"error": "Not logged in"}, status_code=401)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    campaign = db.query(Campaign).filter(Campaign.id == campaign_id, Campaign.user_id == user_id).first()
+    if not user or not campaign:
+        return JSONResponse({"error": "Campaign not found"}, status_code=404)
+
+    error = apply_changes(db, user, campaign, payload)
+    if error:
+        db.rollback()
+        return JSONResponse({"error": error}, status_code=400)
+
+    db.commit()
+    campaign_cache.invalidate(user.id)
+
+    return {"status": "success", "campaign": campaign_dict(campaign)}
+
+
+# -------------------------------------------------
+# DELETE CAMPAIGN
+# -------------------------------------------------
+
+@router.delete("/{campaign_id}")
+def delete_campaign(campaign_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Unsent jobs of the campaign are dropped; sent ones stay in the
+    queue (keeping their idempotency keys) without the campaign.
+    """
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JSONResponse({"error": "Not logged in"}, status_code=401)
+
+    campaign = db.query(Campaign).filter(Campaign.id == campaign_id, Campaign.user_id == user_id).first()
+    if not campaign:
+        return JSONResponse({"error": "Campaign not found"}, status_code=404)
+
+    db.query(SendJob).filter(
+        SendJob.campaign_id == campaign.id,
+        SendJob.status.in_((PENDING, CLAIMED))
+    ).delete(synchronize_session=False)
+    db.query(SendJob).filter(SendJob.campaign_id == campaign.id).update(
+        {SendJob.campaign_id: None},
+        synchronize_session=False
+    )
+    db.delete(campaign)
+    db.commit()
+    campaign_cache.invalidate(user_id)
+
+    return {"status": "deleted"}
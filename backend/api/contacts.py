@@ -0,0 +1,138 @@
+from fastapi import APIRouter, Request, Depends, File, Form, UploadFile
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.auth.website_auth import admin_required
+from backend.config import CONTACT_IMPORT_MAX_BYTES
+from backend.db.database import get_db
+from backend.models.campaign import Campaign
+from backend.models.user import User
+from backend.services.contact_import import ContactImportError, import_contacts, read_rows, save_contacts_file
+from backend.services.contact_sources import FILE_SOURCE, LOCAL_SOURCE, SHEETS_SOURCE, contact_file_path
+from backend.services.contact_store import contact_counts
+from backend.services.suppression import suppression_index, UNSUBSCRIBED
+from backend.services.user_cache import refresh_user_profile
+
+router = APIRouter(prefix="/contacts")
+
+
+# -------------------------------------------------
+# REQUEST MODELS
+# -------------------------------------------------
+
+class UnsubscribeRequest(BaseModel):
+    email: str
+
+
+# -------------------------------------------------
+# IMPORT CSV / XLSX
+# -------------------------------------------------
+
+@router.post("/import")
+def import_contacts_file(
+    request: Request,
+    file: UploadFile = File(...),
+    use_for_sending: bool = Form(True),
+    store: str = Form(LOCAL_SOURCE),
+    campaign_id: Optional[int] = Form(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Sync route: parsing and batched inserts run in the threadpool.
+    The upload is spooled to disk by Starlette, so it is never held in
+    memory whole.
+
+    store="local" merges the rows into the contacts table;
+    store="file" keeps them as the user's CSV contacts file instead.
+    With campaign_id, the file becomes that campaign's contacts file
+    (the campaign must use contact_source "file").
+    """
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JSONResponse({"error": "Not logged in"}, status_code=401)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        return JSONResponse({"error": "User not found"}, status_code=404)
+
+    if store not in (LOCAL_SOURCE, FILE_SOURCE):
+        return JSONResponse({"error": "store must be 'local' or 'file'"}, status_code=400)
+
+    campaign = None
+    if campaign_id is not None:
+        campaign = db.query(Campaign).filter(Campaign.id == campaign_id, Campaign.user_id == user.id).first()
+        if not campaign:
+            return JSONResponse({"error": "Campaign not found"}, status_code=404)
+        if campaign.contact_source != FILE_SOURCE:
+            return JSONResponse({"error": "Campaign does not use a contacts file"}, status_code=400)
+        store = FILE_SOURCE
+
+    if file.size is not None and file.size > CONTACT_IMPORT_MAX_BYTES:
+        return JSONResponse({"error": "File too large"}, status_code=413)
+
+    try:
+        rows = read_rows(file.file, file.filename)
+        if store == FILE_SOURCE:
+            result = save_contacts_file(contact_file_path(user.id, campaign_id), rows)
+        else:
+            result = import_contacts(db, user.id, rows)
+    except ContactImportError as e:
+        db.rollback()
+        return JSONResponse({"error": str(e)}, status_code=400)
+    except IntegrityError:
+        # Row numbers collided with an import running at the same time
+        db.rollback()
+        return JSONResponse({"error": "Another import is in progress, try again"}, status_code=409)
+
+    if campaign is None and use_for_sending and user.contact_source != store:
+        user.contact_source = store
+        db.commit()
+        refresh_user_profile(user)
+
+    return {
+        "status": "success",
+        "contact_source": user.contact_source or SHEETS_SOURCE,
+        **result.as_dict()
+    }
+
+
+# -------------------------------------------------
+# SUMMARY
+# -------------------------------------------------
+
+@router.get("/summary")
+def contacts_summary(request: Request, db: Session = Depends(get_db)):
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JSONResponse({"error": "Not logged in"}, status_code=401)
+
+    return contact_counts(db, user_id)
+
+
+# -------------------------------------------------
+# UNSUBSCRIBE
+# -------------------------------------------------
+
+@router.post("/unsubscribe")
+def unsubscribe(payload: UnsubscribeRequest, request: Request, db: Session = Depends(get_db)):
+    """
+    The address asked not to be emailed: no user sends to it again.
+    Admin only, since it blocks the address for every user.
+    """
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return JSONResponse({"error": "Not logged in"}, status_code=401)
+
+    if not admin_required(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=403)
+
+    email = payload.email.strip().lower()
+    if "@" not in email:
+        return JSONResponse({"error": "Invalid email"}, status_code=400)
+
+    suppression_index.add(db, user_id, email, UNSUBSCRIBED)
+    db.commit()
+    return {"status": "success"}
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Request, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.database import get_db
+from backend.db.database import get_async_db
 from backend.models.email_log import EmailLog
 from backend.auth.website_auth import login_required
 
@@ -9,19 +10,19 @@ router = APIRouter(prefix="/logs")
 
 
 @router.get("/my")
-def my_logs(request: Request, db: Session = Depends(get_db)):
+async def my_logs(request: Request, db: AsyncSession = Depends(get_async_db)):
     if not login_required(request):
         raise HTTPException(status_code=401, detail="Not logged in")
 
     user_id = request.session.get("user_id")
     
-    logs = (
-        db.query(EmailLog)
-        .filter(EmailLog.user_id == user_id)
+    result = await db.execute(
+        select(EmailLog)
+        .where(EmailLog.user_id == user_id)
         .order_by(EmailLog.sent_at.desc())
         .limit(200)
-        .all()
     )
+    logs = result.scalars().all()
 
     return [
         {
@@ -0,0 +1,33 @@
+import hmac
+
+from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from backend.config import METRICS_TOKEN
+from backend.services.metrics import REGISTRY
+
+router = APIRouter()
+
+
+# -------------------------------------------------
+# PROMETHEUS SCRAPE ENDPOINT
+# -------------------------------------------------
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    if not REGISTRY.enabled:
+        raise HTTPException(status_code=404, detail="Metrics disabled")
+
+    # Never served anonymously: per-user queue depths would be public
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=403, detail="METRICS_TOKEN not configured")
+
+    supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(supplied, METRICS_TOKEN):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    # Sync route: collectors query the DB, so this runs in the threadpool
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
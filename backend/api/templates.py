@@ -1,11 +1,13 @@
 # backend/api/templates.py
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Depends
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
 from backend.db.database import get_db
 from backend.models.user import User
+from backend.services.user_cache import get_user_profile, refresh_user_profile
 
 router = APIRouter(prefix="/templates")
 
@@ -23,7 +25,7 @@ class TemplateRequest(BaseModel):
 # -------------------------------------------------
 
 @router.post("/save")
-async def save_template(request: Request, data: TemplateRequest):
+def save_template(request: Request, data: TemplateRequest, db: Session = Depends(get_db)):
     """
     Save email template for logged-in user.
     This ONE template will be used for initial email and ALL follow-ups.
@@ -32,7 +34,6 @@ async def save_template(request: Request, data: TemplateRequest):
     if not user_id:
         return JSONResponse({"error": "Not logged in"}, status_code=401)
 
-    db = next(get_db())
     user = db.query(User).filter(User.id == user_id).first()
 
     if not user:
@@ -41,6 +42,7 @@ async def save_template(request: Request, data: TemplateRequest):
     # Save template to database
     user.email_template = data.template
     db.commit()
+    refresh_user_profile(user)
 
     return {"status": "template_saved"}
 
@@ -50,7 +52,7 @@ async def save_template(request: Request, data: TemplateRequest):
 # -------------------------------------------------
 
 @router.get("/load")
-def load_template(request: Request):
+def load_template(request: Request, db: Session = Depends(get_db)):
     """
     Load email template for logged-in user.
     """
@@ -58,8 +60,7 @@ def load_template(request: Request):
     if not user_id:
         return JSONResponse({"error": "Not logged in"}, status_code=401)
 
-    db = next(get_db())
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_user_profile(db, user_id)
 
     if not user:
         return JSONResponse({"error": "User not found"}, status_code=404)
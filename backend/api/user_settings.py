@@ -1,11 +1,22 @@
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.database import get_db
+from backend.db.database import get_db, get_async_db
 from backend.models.user import User
+from backend.services.user_cache import (
+    get_user_profile,
+    get_user_profile_async,
+    refresh_user_profile,
+)
+from backend.services.cadence import MAX_CADENCE_EMAILS, MAX_FOLLOWUP_DELAY_DAYS, Cadence, cadence_for
+from backend.services.campaigns import campaign_cache, campaign_list_ids
+from backend.services.contact_sources import CONTACT_SOURCES, SHEETS_SOURCE, contact_list_id, uses_local_contacts
+from backend.services.contact_store import reschedule
+from backend.workers.pacing import is_valid_timezone
 
 router = APIRouter(prefix="/user")
 
@@ -14,13 +25,39 @@ router = APIRouter(prefix="/user")
 # REQUEST MODELS
 # -------------------------------------------------
 
+class FollowupCadence(BaseModel):
+    delays: List[int] = []              # days between emails; empty = default cadence
+    max_emails: Optional[int] = None    # defaults to len(delays) + 1
+    business_days: bool = False
+
+
+def cadence_error(spec: FollowupCadence) -> Optional[str]:
+    if any(days < 0 for days in spec.delays):
+        return "Follow-up delays must not be negative"
+    if any(days > MAX_FOLLOWUP_DELAY_DAYS for days in spec.delays):
+        return f"Follow-up delays must be at most {MAX_FOLLOWUP_DELAY_DAYS} days"
+    if spec.max_emails is not None and not 1 <= spec.max_emails <= MAX_CADENCE_EMAILS:
+        return f"max_emails must be 1-{MAX_CADENCE_EMAILS}"
+    return None
+
+
+def cadence_json(spec: FollowupCadence) -> Optional[str]:
+    """The stored form of a cadence; None (the default) if no delays are given"""
+    if not spec.delays:
+        return None
+    return Cadence.from_dict(spec.model_dump()).to_json()
+
+
 class UpdateSettingsRequest(BaseModel):
     full_name: Optional[str] = None
     resume_link: Optional[str] = None
     sheet_id: Optional[str] = None
+    contact_source: Optional[str] = None
     email_template: Optional[str] = None
     followup_template: Optional[str] = None
     email_subject: Optional[str] = None
+    timezone: Optional[str] = None
+    followup_cadence: Optional[FollowupCadence] = None
 
 
 # -------------------------------------------------
@@ -28,12 +65,12 @@ class UpdateSettingsRequest(BaseModel):
 # -------------------------------------------------
 
 @router.get("/settings")
-def get_user_settings(request: Request, db: Session = Depends(get_db)):
+async def get_user_settings(request: Request, db: AsyncSession = Depends(get_async_db)):
     user_id = request.session.get("user_id")
     if not user_id:
         return JSONResponse({"error": "Not logged in"}, status_code=401)
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await get_user_profile_async(db, user_id)
 
     if not user:
         return JSONResponse({"error": "User not found"}, status_code=404)
@@ -43,9 +80,12 @@ def get_user_settings(request: Request, db: Session = Depends(get_db)):
         "full_name": user.full_name,
         "resume_link": user.resume_link,
         "sheet_id": user.sheet_id,
+        "contact_source": user.contact_source or SHEETS_SOURCE,
         "email_template": user.email_template,
         "followup_template": user.followup_template,
         "email_subject": user.email_subject,
+        "timezone": user.timezone,
+        "followup_cadence": cadence_for(user).to_dict(),
         "gmail_connected": bool(user.gmail_token_path),
         "is_paused": user.is_paused
     }
@@ -79,6 +119,11 @@ def update_user_settings(
     
     if settings.sheet_id is not None:
         user.sheet_id = settings.sheet_id
+
+    if settings.contact_source is not None:
+        if settings.contact_source not in CONTACT_SOURCES:
+            return JSONResponse({"error": "Unknown contact source"}, status_code=400)
+        user.contact_source = settings.contact_source
     
     if settings.email_template is not None:
         user.email_template = settings.email_template
@@ -89,7 +134,30 @@ def update_user_settings(
     if settings.email_subject is not None:
         user.email_subject = settings.email_subject
 
+    if settings.timezone is not None:
+        if settings.timezone and not is_valid_timezone(settings.timezone):
+            return JSONResponse({"error": "Unknown timezone"}, status_code=400)
+        user.timezone = settings.timezone or None
+
+    cadence_changed = False
+    if settings.followup_cadence is not None:
+        error = cadence_error(settings.followup_cadence)
+        if error:
+            return JSONResponse({"error": error}, status_code=400)
+
+        followup_cadence = cadence_json(settings.followup_cadence)
+        cadence_changed = followup_cadence != user.followup_cadence
+        user.followup_cadence = followup_cadence
+
     db.commit()
+    refresh_user_profile(user)
+    # The default campaign is built from these settings
+    campaign_cache.invalidate(user.id)
+
+    # Imported contacts already scheduled move to the new cadence
+    # (sheets and files pick it up from their next send)
+    if cadence_changed and uses_local_contacts(user):
+        reschedule(db, user.id, cadence_for(user))
 
     return {
         "status": "success",
@@ -107,7 +175,7 @@ def start_sending(request: Request, db: Session = Depends(get_db)):
     if not user_id:
         return JSONResponse({"error": "Not logged in"}, status_code=401)
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_user_profile(db, user_id)
 
     if not user:
         return JSONResponse({"error": "User not found"}, status_code=404)
@@ -124,7 +192,8 @@ def start_sending(request: Request, db: Session = Depends(get_db)):
             status_code=400
         )
 
-    if not user.sheet_id:
+    # The user's own list or at least one campaign
+    if not campaign_list_ids(db, user):
         return JSONResponse(
             {"error": "Google Sheet not linked"},
             status_code=400
@@ -142,7 +211,7 @@ def start_sending(request: Request, db: Session = Depends(get_db)):
             status_code=400
         )
     
-    if not user.email_template:
+    if contact_list_id(user) and not user.email_template:
         return JSONResponse(
             {"error": "Email template not set"},
             status_code=400
@@ -172,6 +241,7 @@ def pause_sending(request: Request, db: Session = Depends(get_db)):
     
     user.is_paused = True
     db.commit()
+    refresh_user_profile(user)
 
     return {"status": "paused"}
 
@@ -193,5 +263,6 @@ def resume_sending(request: Request, db: Session = Depends(get_db)):
     
     user.is_paused = False
     db.commit()
+    refresh_user_profile(user)
 
     return {"status": "resumed"}
\ No newline at end of file
@@ -1,12 +1,11 @@
-import os
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import RedirectResponse
-from google_auth_oauthlib.flow import Flow
-from google.oauth2.credentials import Credentials
 from sqlalchemy.orm import Session
 
 from backend.db.database import get_db
 from backend.models.user import User
+from backend.services.user_cache import refresh_user_profile
+from backend.services.token_store import credential_cache, token_store
 from backend.config import GMAIL_SCOPES, GMAIL_CLIENT_SECRET_FILE, GMAIL_REDIRECT_URI
 
 router = APIRouter()
@@ -15,13 +14,15 @@ router = APIRouter()
 # Google OAuth Config
 # -----------------------------
 
-TOKEN_DIR = "tokens"
-os.makedirs(TOKEN_DIR, exist_ok=True)
+def build_oauth_flow():
+    # Deferred: google_auth_oauthlib is slow to import
+    from google_auth_oauthlib.flow import Flow
 
-
-def get_token_path(user_id: int) -> str:
-    """Each user has their own Gmail token JSON file"""
-    return os.path.join(TOKEN_DIR, f"gmail_token_user_{user_id}.json")
+    return Flow.from_client_secrets_file(
+        str(GMAIL_CLIENT_SECRET_FILE),
+        scopes=GMAIL_SCOPES,
+        redirect_uri=GMAIL_REDIRECT_URI  # ✅ Now uses dynamic URI
+    )
 
 
 # -----------------------------
@@ -34,11 +35,7 @@ def connect_gmail(request: Request):
     if not user_id:
         return {"error": "User not logged in"}
 
-    flow = Flow.from_client_secrets_file(
-        str(GMAIL_CLIENT_SECRET_FILE),
-        scopes=GMAIL_SCOPES,
-        redirect_uri=GMAIL_REDIRECT_URI  # ✅ Now uses dynamic URI
-    )
+    flow = build_oauth_flow()
 
     authorization_url, state = flow.authorization_url(
         access_type="offline",
@@ -57,22 +54,18 @@ def gmail_callback(request: Request, code: str, db: Session = Depends(get_db)):
     if not user_id:
         return {"error": "User not logged in"}
 
-    flow = Flow.from_client_secrets_file(
-        str(GMAIL_CLIENT_SECRET_FILE),
-        scopes=GMAIL_SCOPES,
-        redirect_uri=GMAIL_REDIRECT_URI  # ✅ Now uses dynamic URI
-    )
+    flow = build_oauth_flow()
 
     flow.fetch_token(code=code)
     credentials = flow.credentials
 
-    token_path = get_token_path(user_id)
-    with open(token_path, "w") as token_file:
-        token_file.write(credentials.to_json())
+    # Encrypted at rest; cached decrypted for the senders
+    credential_cache.put(user_id, credentials)
 
-    # Save token path in DB
+    # Save token location in DB
     user = db.query(User).filter(User.id == user_id).first()
-    user.gmail_token_path = token_path
+    user.gmail_token_path = token_store.location(user_id)
     db.commit()
+    refresh_user_profile(user)
 
     return RedirectResponse("/frontend/dashboard.html")
\ No newline at end of file
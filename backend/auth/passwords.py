@@ -0,0 +1,152 @@
+# backend/auth/passwords.py
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from backend.config import (
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    LOGIN_MAX_FAILED_ATTEMPTS,
+    LOGIN_LOCKOUT_SECONDS,
+    LOGIN_THROTTLE_MAX_KEYS,
+)
+
+# ======================================================
+# HASHING CONTEXT
+# ======================================================
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    # Deferred: passlib/bcrypt are only needed on signup/login
+    from passlib.context import CryptContext
+
+    # min == max == default, so any hash made with a different cost
+    # is reported by needs_update() and rehashed on next login
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=BCRYPT_ROUNDS,
+        bcrypt__min_rounds=BCRYPT_ROUNDS,
+        bcrypt__max_rounds=BCRYPT_ROUNDS,
+    )
+
+
+# bcrypt only looks at the first 72 bytes
+MAX_PASSWORD_LENGTH = 72
+
+# Dedicated pool so a login burst can't starve the API threadpool
+_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+
+
+def hash_password(password: str) -> str:
+    return get_pwd_context().hash(password[:MAX_PASSWORD_LENGTH])
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    return get_pwd_context().verify(password[:MAX_PASSWORD_LENGTH], hashed)
+
+
+def verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    Returns (valid, new_hash). new_hash is set when the stored hash
+    was made with a different cost and should be replaced.
+    """
+    return get_pwd_context().verify_and_update(password[:MAX_PASSWORD_LENGTH], hashed)
+
+
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, hash_password, password)
+
+
+async def verify_and_update_async(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_and_update, password, hashed)
+
+
+# ======================================================
+# LOGIN THROTTLING
+# ======================================================
+
+class LoginThrottle:
+    """
+    Counts failed logins per key inside a sliding lockout window.
+    Checked before any bcrypt work so brute-force attempts are cheap.
+
+    Entries are kept oldest window first: expired ones are dropped from
+    the front on every failure, and past max_keys the oldest go too, so
+    a flood of made-up emails can't grow memory without bound. Locked
+    keys are kept apart and only leave when their window ends, so the
+    same flood can't push a locked account out and lift its lockout.
+    """
+
+    def __init__(self, max_attempts: int, window_seconds: float, max_keys: int = 100000):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.max_keys = max(max_keys, 1)
+        self._failures: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._locked: "OrderedDict[str, float]" = OrderedDict()     # key -> window start
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        """Caller holds the lock"""
+        while self._failures:
+            key, (_, first_failure) = next(iter(self._failures.items()))
+            if now - first_failure <= self.window_seconds and len(self._failures) <= self.max_keys:
+                break
+            del self._failures[key]
+
+        while self._locked:
+            key, first_failure = next(iter(self._locked.items()))
+            if now - first_failure <= self.window_seconds:
+                break
+            del self._locked[key]
+
+    def is_blocked(self, key: str) -> bool:
+        with self._lock:
+            first_failure = self._locked.get(key)
+            if first_failure is None:
+                return False
+            if time.monotonic() - first_failure > self.window_seconds:
+                del self._locked[key]
+                return False
+            return True
+
+    def record_failure(self, key: str):
+        now = time.monotonic()
+        with self._lock:
+            locked_at = self._locked.get(key)
+            if locked_at is not None:
+                if now - locked_at <= self.window_seconds:
+                    return
+                del self._locked[key]
+            count, first_failure = self._failures.get(key, (0, now))
+            if now - first_failure > self.window_seconds:
+                count, first_failure = 0, now
+
+            if count + 1 >= self.max_attempts:
+                # Locked until the window ends, out of reach of max_keys
+                self._failures.pop(key, None)
+                self._locked[key] = first_failure
+            else:
+                self._failures[key] = (count + 1, first_failure)
+                if count == 0:
+                    # New window: now the newest entry
+                    self._failures.move_to_end(key)
+            self._evict(now)
+
+    def reset(self, key: str):
+        with self._lock:
+            self._failures.pop(key, None)
+            self._locked.pop(key, None)
+
+
+login_throttle = LoginThrottle(LOGIN_MAX_FAILED_ATTEMPTS, LOGIN_LOCKOUT_SECONDS, LOGIN_THROTTLE_MAX_KEYS)
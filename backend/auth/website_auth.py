@@ -1,23 +1,18 @@
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import RedirectResponse, HTMLResponse
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.database import get_db
+from backend.db.database import get_async_db
 from backend.models.user import User
+from backend.services.user_cache import get_user_profile_async
+from backend.auth.passwords import (
+    hash_password_async,
+    verify_and_update_async,
+    login_throttle,
+)
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# -----------------------------
-# Password helpers
-# -----------------------------
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password[:72])
-
-def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password[:72], hashed)
 
 # -----------------------------
 # Session / Auth helpers
@@ -44,22 +39,22 @@ def admin_required(request: Request) -> bool:
 # -----------------------------
 
 @router.post("/signup")
-def signup(
+async def signup(
     request: Request,
     email: str = Form(...),
     password: str = Form(...),
     full_name: str = Form(None),
     resume_link: str = Form(None),
     sheet_id: str = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    existing = db.query(User).filter(User.email == email).first()
-    if existing:
+    result = await db.execute(select(User).where(User.email == email))
+    if result.scalar_one_or_none():
         return HTMLResponse("User already exists", status_code=400)
 
     user = User(
         email=email,
-        password_hash=hash_password(password),
+        password_hash=await hash_password_async(password),
         full_name=full_name,
         is_admin=False,
         is_paused=False,
@@ -67,24 +62,44 @@ def signup(
         sheet_id=sheet_id
     )
     db.add(user)
-    db.commit()
+    await db.commit()
 
     login_user(request, user)
     return RedirectResponse("/frontend/dashboard.html", status_code=302)
 
 
 @router.post("/login")
-def login(
+async def login(
     request: Request,
     email: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == email).first()
+    throttle_key = email.strip().lower()
+
+    # Reject brute-force traffic before doing any bcrypt work
+    if login_throttle.is_blocked(throttle_key):
+        return HTMLResponse("Too many failed attempts. Try again later.", status_code=429)
 
-    if not user or not verify_password(password, user.password_hash):
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalar_one_or_none()
+
+    if not user:
+        login_throttle.record_failure(throttle_key)
+        return HTMLResponse("Invalid credentials", status_code=401)
+
+    valid, new_hash = await verify_and_update_async(password, user.password_hash)
+    if not valid:
+        login_throttle.record_failure(throttle_key)
         return HTMLResponse("Invalid credentials", status_code=401)
 
+    login_throttle.reset(throttle_key)
+
+    # Cost changed since this hash was made: store the rehashed value
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+
     login_user(request, user)
     return RedirectResponse("/frontend/dashboard.html", status_code=302)
 
@@ -96,11 +111,11 @@ def logout(request: Request):
 
 
 @router.get("/me")
-def get_current_user(request: Request, db: Session = Depends(get_db)):
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_db)):
     if not login_required(request):
         return {"authenticated": False}
 
-    user = db.query(User).filter(User.id == request.session["user_id"]).first()
+    user = await get_user_profile_async(db, request.session["user_id"])
 
     if not user:
         return {"authenticated": False}
@@ -113,6 +128,7 @@ def get_current_user(request: Request, db: Session = Depends(get_db)):
         "is_admin": user.is_admin,
         "resume_link": user.resume_link,
         "sheet_id": user.sheet_id,
+        "contact_source": user.contact_source,
         "email_subject": user.email_subject,
         "gmail_connected": bool(user.gmail_token_path),
         "is_paused": user.is_paused
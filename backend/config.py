@@ -43,10 +43,27 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Use psycopg 3 for Postgres (supports server-side prepared statements)
+if DATABASE_URL and DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
+
 # ✅ Fallback to SQLite for local development
 if not DATABASE_URL:
     DATABASE_URL = f"sqlite:///{BASE_DIR}/email_outreach.db"
 
+# Postgres pool sizing (per process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Postgres statement timeout and prepared statements
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+DB_PREPARE_THRESHOLD = int(os.getenv("DB_PREPARE_THRESHOLD", "5"))
+
+# SQLite lock wait before raising "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
 # ======================================================
 # GOOGLE OAUTH (GMAIL)
 # ======================================================
@@ -55,8 +72,17 @@ if not DATABASE_URL:
 GMAIL_CLIENT_SECRET_FILE = CREDENTIALS_DIR / "client_secret.json"
 
 # Where user Gmail tokens will be stored
-GMAIL_TOKEN_DIR = BASE_DIR / "tokens"
-GMAIL_TOKEN_DIR.mkdir(exist_ok=True)
+GMAIL_TOKEN_DIR = BASE_DIR / "tokens"  # created on first save
+
+# Token backend: "file" (GMAIL_TOKEN_DIR) or "db" (gmail_tokens table)
+GMAIL_TOKEN_STORE = os.getenv("GMAIL_TOKEN_STORE", "file")
+
+# Fernet key for tokens at rest (derived from SECRET_KEY if unset)
+GMAIL_TOKEN_ENCRYPTION_KEY = os.getenv("GMAIL_TOKEN_ENCRYPTION_KEY")
+
+# Refresh access tokens this long before they expire
+GMAIL_TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv("GMAIL_TOKEN_REFRESH_MARGIN_SECONDS", "600"))
+GMAIL_TOKEN_PREFETCH_INTERVAL_SECONDS = int(os.getenv("GMAIL_TOKEN_PREFETCH_INTERVAL_SECONDS", "300"))
 
 # Gmail API scopes
 GMAIL_SCOPES_STRING = os.getenv(
@@ -75,6 +101,19 @@ SHEETS_SERVICE_ACCOUNT_FILE = CREDENTIALS_DIR / "sheets_service.json"
 # Sheet settings
 DEFAULT_SHEET_NAME = os.getenv("DEFAULT_SHEET_NAME", "Sheet1")
 
+# ======================================================
+# LOCAL CONTACTS (CSV / XLSX IMPORT)
+# ======================================================
+
+# Rows per insert/update batch on import and per read page afterwards
+CONTACT_BATCH_SIZE = int(os.getenv("CONTACT_BATCH_SIZE", "1000"))
+
+# Largest contacts file accepted for import
+CONTACT_IMPORT_MAX_BYTES = int(os.getenv("CONTACT_IMPORT_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Uploaded CSVs kept as files (contact source "file"), one per user
+CONTACT_FILE_DIR = Path(os.getenv("CONTACT_FILE_DIR", str(BASE_DIR / "contact_files")))
+
 # ======================================================
 # EMAIL SENDING RULES (SAFE LIMITS)
 # ======================================================
@@ -84,9 +123,173 @@ MAX_EMAILS_PER_DAY = int(os.getenv("MAX_EMAILS_PER_DAY", "50"))
 MIN_DELAY_SECONDS = int(os.getenv("MIN_DELAY_SECONDS", "120"))
 MAX_DELAY_SECONDS = int(os.getenv("MAX_DELAY_SECONDS", "300"))
 
-# Follow-up rules
+# Follow-up rules (default cadence; users can set their own).
+# MAX_FOLLOWUPS counts every email to a contact, the initial one included.
 MAX_FOLLOWUPS = int(os.getenv("MAX_FOLLOWUPS", "5"))
 FOLLOWUP_2_DELAY_DAYS = int(os.getenv("FOLLOWUP_2_DELAY_DAYS", "60"))
+# Days after email 1, 2, ... until the next one (the last repeats)
+FOLLOWUP_DELAYS_DAYS = os.getenv("FOLLOWUP_DELAYS_DAYS", f"7,7,{FOLLOWUP_2_DELAY_DAYS},{FOLLOWUP_2_DELAY_DAYS}")
+FOLLOWUP_BUSINESS_DAYS = os.getenv("FOLLOWUP_BUSINESS_DAYS", "false").lower() == "true"
+# Emails sent after a delay this long show as "Retry-n" instead of "Follow-up-n"
+FOLLOWUP_RETRY_AFTER_DAYS = int(os.getenv("FOLLOWUP_RETRY_AFTER_DAYS", "30"))
+
+# Sending window in each user's timezone (hours 0-24, weekdays 0=Mon).
+# Default: no window (all hours, every day, MIN/MAX_DELAY pacing). With
+# a window, the daily quota is spread evenly across what is left of it.
+SEND_WINDOW_START_HOUR = int(os.getenv("SEND_WINDOW_START_HOUR", "0"))
+SEND_WINDOW_END_HOUR = int(os.getenv("SEND_WINDOW_END_HOUR", "0"))
+SEND_WINDOW_DAYS = os.getenv("SEND_WINDOW_DAYS", "")
+DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "UTC")
+SEND_PACING_JITTER = float(os.getenv("SEND_PACING_JITTER", "0.3"))
+
+# Send queue: jobs pulled per batch, retries before dead-lettering
+SEND_JOB_BATCH_SIZE = int(os.getenv("SEND_JOB_BATCH_SIZE", "10"))
+SEND_JOB_MAX_ATTEMPTS = int(os.getenv("SEND_JOB_MAX_ATTEMPTS", "3"))
+SEND_JOB_RETRY_BACKOFF_SECONDS = int(os.getenv("SEND_JOB_RETRY_BACKOFF_SECONDS", "300"))
+SEND_JOB_CLAIM_TTL_SECONDS = int(os.getenv("SEND_JOB_CLAIM_TTL_SECONDS", "1800"))
+
+# Per recipient domain, per user: sends per rolling hour and the gap
+# between two sends. Big mailbox providers (gmail.com, outlook.com, ...)
+# are many unrelated people and get the looser PROVIDER_* limits.
+DOMAIN_HOURLY_CAP = int(os.getenv("DOMAIN_HOURLY_CAP", "4"))
+DOMAIN_COOLDOWN_SECONDS = int(os.getenv("DOMAIN_COOLDOWN_SECONDS", "600"))
+PROVIDER_HOURLY_CAP = int(os.getenv("PROVIDER_HOURLY_CAP", "20"))
+PROVIDER_COOLDOWN_SECONDS = int(os.getenv("PROVIDER_COOLDOWN_SECONDS", "0"))
+
+# Which due rows get the daily budget first:
+#   "sheet"       - sheet order
+#   "overdue"     - longest past their Next_Send_Date first
+#   "followup"    - furthest along the sequence first, then overdue
+#   "round_robin" - one row of each followup stage in turn
+#   "weighted"    - SEND_ORDER_WEIGHTS score: overdue=<per day overdue>,
+#                   followup=<per followup>, initial=<per initial email>
+SEND_ORDER_POLICY = os.getenv("SEND_ORDER_POLICY", "overdue")
+SEND_ORDER_WEIGHTS = os.getenv("SEND_ORDER_WEIGHTS", "overdue=1,followup=2,initial=1")
+
+# Best due rows kept per queued job, for rows dropped at enqueue time
+# (invalid address, already sent)
+SEND_CANDIDATE_LOOKAHEAD = int(os.getenv("SEND_CANDIDATE_LOOKAHEAD", "3"))
+
+# Campaigns a user may run besides their own list; all of them share
+# MAX_EMAILS_PER_DAY by daily share
+MAX_CAMPAIGNS_PER_USER = int(os.getenv("MAX_CAMPAIGNS_PER_USER", "20"))
+
+# Gmail message ids already handled (bounces, replies) are remembered
+# this long; must be longer than the bounce/reply search windows
+PROCESSED_MESSAGE_TTL_DAYS = int(os.getenv("PROCESSED_MESSAGE_TTL_DAYS", "30"))
+
+# ======================================================
+# ADDRESS VALIDATION (before queueing)
+# ======================================================
+
+# Syntax + MX check; addresses that can't receive mail are marked bounced
+EMAIL_VALIDATION_ENABLED = os.getenv("EMAIL_VALIDATION_ENABLED", "true").lower() == "true"
+
+# "dns", or "static" (no network: MX_STATIC_RECORDS, e.g.
+# "bad.example=no_mail", everything else accepts mail)
+MX_RESOLVER = os.getenv("MX_RESOLVER", "dns")
+MX_STATIC_RECORDS = os.getenv("MX_STATIC_RECORDS", "")
+MX_LOOKUP_TIMEOUT_SECONDS = float(os.getenv("MX_LOOKUP_TIMEOUT_SECONDS", "3"))
+
+# Per-domain results, shared by all users
+MX_CACHE_TTL_SECONDS = int(os.getenv("MX_CACHE_TTL_SECONDS", "86400"))
+MX_NEGATIVE_CACHE_TTL_SECONDS = int(os.getenv("MX_NEGATIVE_CACHE_TTL_SECONDS", "3600"))
+MX_CACHE_SIZE = int(os.getenv("MX_CACHE_SIZE", "50000"))
+
+# Must resolve for a "no mail" answer to be trusted (empty disables)
+MX_CANARY_DOMAIN = os.getenv("MX_CANARY_DOMAIN", "gmail.com")
+
+# After this many lookups in a row fail (timeouts, SERVFAIL), stop
+# resolving for the cool-off and let addresses through unchecked
+MX_BREAKER_FAILURES = int(os.getenv("MX_BREAKER_FAILURES", "5"))
+MX_BREAKER_COOLOFF_SECONDS = int(os.getenv("MX_BREAKER_COOLOFF_SECONDS", "300"))
+
+# ======================================================
+# SUPPRESSION INDEX (bounced / replied / unsubscribed)
+# ======================================================
+
+# Bloom filter sizing: addresses expected, and the share of unknown
+# addresses that still cost a DB lookup (it grows when full)
+SUPPRESSION_BLOOM_CAPACITY = int(os.getenv("SUPPRESSION_BLOOM_CAPACITY", "1000000"))
+SUPPRESSION_BLOOM_ERROR_RATE = float(os.getenv("SUPPRESSION_BLOOM_ERROR_RATE", "0.01"))
+
+# How often a node loads entries added by other nodes
+SUPPRESSION_REFRESH_SECONDS = int(os.getenv("SUPPRESSION_REFRESH_SECONDS", "60"))
+
+# Suppressed addresses whose entries are kept in memory
+SUPPRESSION_CACHE_SIZE = int(os.getenv("SUPPRESSION_CACHE_SIZE", "10000"))
+
+# ======================================================
+# BACKGROUND WORKERS
+# ======================================================
+
+# Run the scheduler inside the web process. Set to "false" when the
+# scheduler runs on its own (`python -m backend.workers`) so that
+# several web workers don't send duplicate emails.
+RUN_SCHEDULER_IN_WEB = os.getenv("RUN_SCHEDULER_IN_WEB", "true").lower() == "true"
+
+# Seconds between scheduler passes over all users
+SCHEDULER_POLL_SECONDS = int(os.getenv("SCHEDULER_POLL_SECONDS", "60"))
+
+# Per-user leases let several scheduler nodes share users safely.
+# A crashed node's users are picked up once its leases expire.
+SCHEDULER_NODE_ID = os.getenv("SCHEDULER_NODE_ID")  # default: host:pid:random
+SCHEDULER_LEASE_TTL_SECONDS = int(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", "90"))
+
+# Daily reply check: users checked in parallel, each with a time budget.
+# Progress is checkpointed every REPLY_CHECK_CHECKPOINT_ROWS rows.
+REPLY_CHECK_WORKERS = int(os.getenv("REPLY_CHECK_WORKERS", "4"))
+REPLY_CHECK_USER_BUDGET_SECONDS = int(os.getenv("REPLY_CHECK_USER_BUDGET_SECONDS", "300"))
+REPLY_CHECK_CHECKPOINT_ROWS = int(os.getenv("REPLY_CHECK_CHECKPOINT_ROWS", "25"))
+# Users whose check timed out or failed are retried this often, same day
+REPLY_CHECK_RESUME_INTERVAL_SECONDS = int(os.getenv("REPLY_CHECK_RESUME_INTERVAL_SECONDS", "3600"))
+
+# Bounce checks run as their own job, only for users who sent within
+# BOUNCE_WINDOW_HOURS. Each quiet check doubles that user's interval
+# up to the max; a new send or a bounce resets it.
+BOUNCE_CHECK_INTERVAL_SECONDS = int(os.getenv("BOUNCE_CHECK_INTERVAL_SECONDS", "300"))
+BOUNCE_CHECK_MAX_INTERVAL_SECONDS = int(os.getenv("BOUNCE_CHECK_MAX_INTERVAL_SECONDS", "7200"))
+BOUNCE_WINDOW_HOURS = int(os.getenv("BOUNCE_WINDOW_HOURS", "48"))
+
+# ======================================================
+# CACHING
+# ======================================================
+
+# How long a cached user profile may be served before reloading
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+
+# Same for each user's campaigns
+CAMPAIGN_CACHE_TTL_SECONDS = int(os.getenv("CAMPAIGN_CACHE_TTL_SECONDS", "30"))
+
+# A campaign's Google Sheet is re-read after this long (0 = every pass);
+# edits made in the sheet show up within this time
+CONTACT_SNAPSHOT_TTL_SECONDS = int(os.getenv("CONTACT_SNAPSHOT_TTL_SECONDS", "300"))
+
+# ======================================================
+# METRICS
+# ======================================================
+
+# Prometheus metrics at /metrics (web) and on WORKER_METRICS_PORT
+# (python -m backend.workers, 0 = off). Off unless enabled: both
+# endpoints also refuse to serve until METRICS_TOKEN is set, which
+# scrapers send as a bearer token.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))
+
+# ======================================================
+# PROFILING
+# ======================================================
+
+# Sample scheduler passes and reply checks. With PROFILING_RUNTIME_SWITCH
+# it can also be switched on at runtime from the admin API
+# (POST /admin/profiling/enable); every process then re-reads the flag
+# from the DB every 15 seconds, so it is off by default.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_RUNTIME_SWITCH = os.getenv("PROFILING_RUNTIME_SWITCH", "false").lower() == "true"
+PROFILE_SAMPLE_INTERVAL_MS = int(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "10"))
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "25"))
+PROFILE_HISTORY = int(os.getenv("PROFILE_HISTORY", "200"))
 
 # ======================================================
 # LOGGING
@@ -94,6 +297,28 @@ FOLLOWUP_2_DELAY_DAYS = int(os.getenv("FOLLOWUP_2_DELAY_DAYS", "60"))
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
+# Lines waiting for the writer thread; beyond this they're dropped, not waited on
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Identical warnings/errors (same event and sheet) allowed per window
+LOG_SAMPLE_WINDOW_SECONDS = int(os.getenv("LOG_SAMPLE_WINDOW_SECONDS", "60"))
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "5"))
+
+# ======================================================
+# PASSWORD HASHING & LOGIN THROTTLING
+# ======================================================
+
+# bcrypt cost factor; existing hashes are upgraded on next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+# Failed logins allowed per email before it's locked for the window
+LOGIN_MAX_FAILED_ATTEMPTS = int(os.getenv("LOGIN_MAX_FAILED_ATTEMPTS", "5"))
+LOGIN_LOCKOUT_SECONDS = int(os.getenv("LOGIN_LOCKOUT_SECONDS", "900"))
+# Emails tracked at once; the oldest are dropped past this (locked
+# emails are kept until their lockout ends)
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+
 # ======================================================
 # WEBSITE AUTH (FIXED ACCESS GATE)
 # ======================================================
@@ -122,18 +347,3 @@ else:
     if not RENDER_EXTERNAL_URL:
         raise ValueError("RENDER_EXTERNAL_URL environment variable must be set in production")
     GMAIL_REDIRECT_URI = f"{RENDER_EXTERNAL_URL}/auth/gmail/callback"
-
-# ======================================================
-# DEBUG INFO (only print in development)
-# ======================================================
-
-if ENV == "development":
-    print("=" * 60)
-    print("🔧 CONFIGURATION LOADED")
-    print("=" * 60)
-    print(f"Environment: {ENV}")
-    print(f"Database: {DATABASE_URL}")
-    print(f"Gmail Redirect URI: {GMAIL_REDIRECT_URI}")
-    print(f"Max Emails/Day: {MAX_EMAILS_PER_DAY}")
-    print(f"Gate ID: {WEBSITE_ACCESS_ID}")
-    print("=" * 60)
\ No newline at end of file
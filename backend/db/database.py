@@ -1,22 +1,115 @@
-from sqlalchemy import create_engine
+from contextlib import nullcontext
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from backend.config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_STATEMENT_TIMEOUT_MS,
+    DB_PREPARE_THRESHOLD,
+    SQLITE_BUSY_TIMEOUT_MS,
+)
+from backend.services import profiler
+
+# ======================================================
+# ENGINE PROFILES
+# ======================================================
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def sqlite_engine_options() -> dict:
+    """
+    SQLite: connections are shared across the scheduler thread and
+    the API threadpool, so same-thread checks are disabled. Pool
+    sizing is left to SQLAlchemy's defaults.
+    """
+    return {
+        "connect_args": {
+            "check_same_thread": False,
+            "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+    }
+
+
+def postgres_engine_options() -> dict:
+    """
+    Postgres: sized pool, per-connection statement timeout and
+    server-side prepared statements after DB_PREPARE_THRESHOLD runs.
+    """
+    return {
+        "connect_args": {
+            "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}",
+            "prepare_threshold": DB_PREPARE_THRESHOLD,
+        },
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def async_database_url(url: str) -> str:
+    """
+    Map the sync URL onto its async driver. psycopg 3 serves both
+    modes, SQLite needs aiosqlite.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def engine_options(url: str) -> dict:
+    if is_sqlite(url):
+        return sqlite_engine_options()
+    return postgres_engine_options()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets API reads proceed while the scheduler writes.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
 
-from backend.config import DATABASE_URL
 
 # ======================================================
 # DATABASE ENGINE
 # ======================================================
 
-engine: Engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Required for SQLite
-    pool_size=20,           # ✅ Increased from default 5
-    max_overflow=40,        # ✅ Increased from default 10
-    pool_pre_ping=True,     # ✅ Verify connections before using
-    pool_recycle=3600       # ✅ Recycle connections after 1 hour
+engine: Engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+
+# Async engine for FastAPI routes (same pool profile, separate pool)
+async_engine: AsyncEngine = create_async_engine(
+    async_database_url(DATABASE_URL),
+    **engine_options(DATABASE_URL)
 )
 
+if is_sqlite(DATABASE_URL):
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+# "db" phase of profiled scheduler passes (no-op unless profiling)
+profiler.instrument_engine(engine)
+
 # ======================================================
 # SESSION
 # ======================================================
@@ -27,12 +120,22 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # ======================================================
 # BASE MODEL
 # ======================================================
 
 Base = declarative_base()
 
+# Times request sessions for /metrics; replaced by
+# backend.services.metrics.instrument_database() at startup
+session_timer = lambda kind: nullcontext()
+
 # ======================================================
 # DEPENDENCY (FastAPI)
 # ======================================================
@@ -43,6 +146,45 @@ def get_db():
     """
     db = SessionLocal()
     try:
-        yield db
+        with session_timer("sync"):
+            yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    FastAPI dependency to get an async DB session
+    """
+    async with AsyncSessionLocal() as db:
+        with session_timer("async"):
+            yield db
+
+# ======================================================
+# POOL METRICS
+# ======================================================
+
+def _pool_snapshot(pool) -> dict:
+    snapshot = {
+        "pool_class": type(pool).__name__,
+        "status": pool.status(),
+    }
+
+    # QueuePool exposes live counters; other pool classes don't
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        getter = getattr(pool, name, None)
+        if callable(getter):
+            snapshot[name] = getter()
+
+    return snapshot
+
+
+def get_pool_metrics() -> dict:
+    """
+    Snapshot of the sync and async connection pools for the admin API.
+    """
+    return {
+        "backend": engine.dialect.name,
+        "sync": _pool_snapshot(engine.pool),
+        "async": _pool_snapshot(async_engine.pool),
+    }
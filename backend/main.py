@@ -2,14 +2,11 @@ from fastapi import FastAPI, Request
 from starlette.middleware.sessions import SessionMiddleware  # ✅ FIXED: starlette not starlettes
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse, FileResponse
-import threading
-from apscheduler.schedulers.background import BackgroundScheduler
 
 # -------------------------------------------------
 # Core
 # -------------------------------------------------
-from backend.config import SECRET_KEY
-from backend.db.database import engine, Base
+from backend.config import SECRET_KEY, RUN_SCHEDULER_IN_WEB
 
 # -------------------------------------------------
 # Routers
@@ -19,11 +16,15 @@ from backend.auth.website_auth import router as website_auth_router
 from backend.auth.gmail_oauth import router as gmail_router
 
 from backend.api import logs, admin, user_settings, templates  # ✅ Added templates
+from backend.api import metrics
+from backend.api import contacts
+from backend.api import campaigns
 
 # -------------------------------------------------
 # Background workers
 # -------------------------------------------------
-from backend.workers.scheduler import scheduler_loop, check_all_replies_daily
+from backend.workers.jobs import BackgroundWorkers
+from backend.services.metrics import instrument_database
 
 # =================================================
 # APP INIT
@@ -57,6 +58,9 @@ app.include_router(templates.router)  # ✅ Added templates router
 app.include_router(logs.router)
 app.include_router(admin.router)
 app.include_router(user_settings.router)
+app.include_router(contacts.router)
+app.include_router(campaigns.router)
+app.include_router(metrics.router)
 
 # =================================================
 # STATIC FILES (CSS / JS ONLY)
@@ -79,23 +83,30 @@ def root(request: Request):
 # STARTUP
 # =================================================
 
+background_workers = None
+
+
 @app.on_event("startup")
 def on_startup():
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
-    
-    # Start main sending loop (continuous)
-    threading.Thread(target=scheduler_loop, daemon=True).start()
-    
-    # Start daily reply checker (runs once per day at 2 AM)
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(
-        check_all_replies_daily,
-        'cron',
-        hour=2,  # Run at 2 AM every day
-        minute=0
-    )
-    scheduler.start()
+    global background_workers
+
+    # Schema is managed by Alembic (`alembic upgrade head`)
+
+    # DB timings for /metrics (no-op when metrics are disabled)
+    instrument_database()
+
+    # Scheduler may run in its own process instead (`python -m backend.workers`)
+    if not RUN_SCHEDULER_IN_WEB:
+        return
+
+    background_workers = BackgroundWorkers()
+    background_workers.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    if background_workers:
+        background_workers.stop()
 
 # =================================================
 # HEALTH
@@ -0,0 +1,40 @@
+#campaign.py
+from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, Index
+from datetime import datetime
+
+from backend.db.database import Base
+
+
+class Campaign(Base):
+    __tablename__ = "campaigns"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    name = Column(String, nullable=False)
+
+    # ----------------------------------
+    # Contacts: "sheets" (sheet_id) or "file" (its own CSV)
+    # ----------------------------------
+    contact_source = Column(String, nullable=False, default="sheets")
+    sheet_id = Column(String, nullable=True)
+
+    # ----------------------------------
+    # Email personalization (same fields as on users)
+    # ----------------------------------
+    email_template = Column(Text, nullable=True)
+    followup_template = Column(Text, nullable=True)
+    email_subject = Column(String, nullable=True)
+    followup_cadence = Column(Text, nullable=True)     # JSON, see services/cadence.py; NULL = default
+
+    # ----------------------------------
+    # Scheduling
+    # ----------------------------------
+    daily_share = Column(Integer, nullable=False, default=1)    # weight within the user's daily limit
+    is_paused = Column(Boolean, nullable=False, default=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_campaigns_user", "user_id"),
+    )
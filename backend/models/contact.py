@@ -0,0 +1,40 @@
+#contact.py
+from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, Text, ForeignKey, Index, UniqueConstraint
+from datetime import datetime
+
+from backend.db.database import Base
+
+
+class Contact(Base):
+    __tablename__ = "contacts"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # ----------------------------------
+    # Owner / position (row_number plays the sheet row's role)
+    # ----------------------------------
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    row_number = Column(Integer, nullable=False)
+
+    # ----------------------------------
+    # Same columns as the Google Sheet (A-K)
+    # ----------------------------------
+    email = Column(String, nullable=False)              # lower-cased
+    name = Column(String, nullable=True)
+    company = Column(String, nullable=True)
+    status = Column(String, nullable=True)
+    replied = Column(Boolean, nullable=False, default=False)
+    bounced = Column(Boolean, nullable=False, default=False)
+    followup_count = Column(Integer, nullable=False, default=0)
+    last_sent_date = Column(Date, nullable=True)
+    next_send_date = Column(Date, nullable=True)
+    notes = Column(Text, nullable=True)
+    last_error = Column(String, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "row_number", name="uq_contacts_user_row"),
+        UniqueConstraint("user_id", "email", name="uq_contacts_user_email"),
+        Index("ix_contacts_user_next_send", "user_id", "next_send_date"),
+    )
@@ -0,0 +1,17 @@
+#gmail_token.py
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from datetime import datetime
+
+from backend.db.database import Base
+
+
+class GmailToken(Base):
+    __tablename__ = "gmail_tokens"
+
+    # One token per user
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    # Encrypted authorized-user JSON (see services/token_store.py)
+    token_encrypted = Column(Text, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,21 @@
+#processed_message.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+
+from backend.db.database import Base
+
+
+class ProcessedMessage(Base):
+    __tablename__ = "processed_messages"
+
+    # ----------------------------------
+    # Gmail message already handled for a user
+    # ----------------------------------
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    kind = Column(String, primary_key=True)          # bounce | reply
+    message_id = Column(String, primary_key=True)
+
+    processed_at = Column(DateTime, default=datetime.utcnow)
+
+    # Pruned after this; must outlive the Gmail search window
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,33 @@
+#profiling.py
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text
+from datetime import datetime
+
+from backend.db.database import Base
+
+
+class RuntimeFlag(Base):
+    __tablename__ = "runtime_flags"
+
+    # Switches flipped from the admin API, read by every process
+    name = Column(String, primary_key=True)
+    value = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class PassProfile(Base):
+    __tablename__ = "pass_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # ----------------------------------
+    # What was profiled
+    # ----------------------------------
+    kind = Column(String, nullable=False, index=True)   # send_pass | reply_check
+    label = Column(String, nullable=True)               # e.g. user id
+    node = Column(String, nullable=True)
+
+    started_at = Column(DateTime, default=datetime.utcnow, index=True)
+    wall_seconds = Column(Float, nullable=False)
+
+    # JSON: phases, top functions, sample count
+    data = Column(Text, nullable=False)
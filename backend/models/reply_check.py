@@ -0,0 +1,45 @@
+#reply_check.py
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, ForeignKey
+from datetime import datetime
+
+from backend.db.database import Base
+
+
+class ReplyCheckRun(Base):
+    __tablename__ = "reply_check_runs"
+
+    # One row per daily run; finished_at stays empty if the run was cut short
+    run_date = Column(Date, primary_key=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    # ----------------------------------
+    # Summary
+    # ----------------------------------
+    users_done = Column(Integer, default=0)
+    users_failed = Column(Integer, default=0)
+    users_timed_out = Column(Integer, default=0)
+    gmail_calls = Column(Integer, default=0)
+    sheets_calls = Column(Integer, default=0)
+    duration_seconds = Column(Float, nullable=True)
+
+
+class ReplyCheckProgress(Base):
+    __tablename__ = "reply_check_progress"
+
+    # Latest reply check for each user (checkpoint for resuming)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    run_date = Column(Date, nullable=False)
+
+    status = Column(String, nullable=False)
+    # RUNNING | DONE | TIMED_OUT | FAILED
+
+    # Next sheet row to check, in list_id (the user's lists are checked
+    # one after another); kept when a run is interrupted or times out
+    list_id = Column(String, nullable=True)
+    next_row = Column(Integer, nullable=False, default=2)
+
+    owner = Column(String, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    error = Column(String, nullable=True)
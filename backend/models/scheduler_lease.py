@@ -0,0 +1,26 @@
+#scheduler_lease.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+
+from backend.db.database import Base
+
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    # One lease per user: only the owner runs that user's scheduler pass
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    # Scheduler node id (host:pid:random)
+    owner = Column(String, nullable=False, index=True)
+
+    # Renewed by heartbeat; an expired lease can be taken by any node
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class SchedulerNode(Base):
+    __tablename__ = "scheduler_nodes"
+
+    # One row per running node, renewed by the lease heartbeat; work
+    # stamped with an owner whose row has expired belongs to a dead node
+    owner = Column(String, primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
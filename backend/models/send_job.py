@@ -0,0 +1,48 @@
+#send_job.py
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Index
+from datetime import datetime
+
+from backend.db.database import Base
+
+
+class SendJob(Base):
+    __tablename__ = "send_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # ----------------------------------
+    # What to send
+    # ----------------------------------
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    sheet_id = Column(String, nullable=False)
+    row_number = Column(Integer, nullable=False)
+    to_email = Column(String, nullable=False)
+    name = Column(String, nullable=True)
+    company = Column(String, nullable=True)
+    followup_count = Column(Integer, nullable=False)  # NEW count after this send
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=True)  # NULL = the user's own settings
+
+    # sheet_id:row_number:followup_count:email_hash - one job per email ever
+    idempotency_key = Column(String, unique=True, nullable=False)
+
+    # ----------------------------------
+    # Queue state
+    # ----------------------------------
+    status = Column(String, nullable=False, default="PENDING")
+    # PENDING | CLAIMED | SENDING | DONE | DEAD
+
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    # DEAD jobs: True = not worth retrying (bounce, suppressed, maybe sent);
+    # False = ran out of attempts, can be requeued
+    permanent = Column(Boolean, nullable=True)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_send_jobs_user_status_available", "user_id", "status", "available_at"),
+    )
@@ -0,0 +1,28 @@
+#suppression.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+
+from backend.db.database import Base
+
+
+class SuppressionEntry(Base):
+    __tablename__ = "suppression_entries"
+
+    id = Column(Integer, primary_key=True)
+
+    # ----------------------------------
+    # Address (sha256 of the lower-cased email, never the email itself)
+    # ----------------------------------
+    email_hash = Column(String(64), nullable=False)
+
+    # bounced | unsubscribed (every user) - replied | contacted (this user)
+    reason = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # Other nodes pick up new entries by this
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    # Also serves lookups by email_hash (leading column)
+    __table_args__ = (
+        UniqueConstraint("email_hash", "user_id", "reason", name="uq_suppression_hash_user_reason"),
+    )
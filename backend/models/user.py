@@ -34,6 +34,9 @@ class User(Base):
     # Google Sheet linked to this user
     # ----------------------------------
     sheet_id = Column(String, nullable=True)
+
+    # Where contacts come from: "sheets" (default) or "local" (imported)
+    contact_source = Column(String, nullable=True)
     
     # ----------------------------------
     # Email personalization
@@ -41,4 +44,14 @@ class User(Base):
     email_template = Column(Text, nullable=True)       # Initial email template
     followup_template = Column(Text, nullable=True)    # ✅ NEW: Follow-up email template
     email_subject = Column(String, nullable=True)      # ✅ NEW: Email subject line
-    resume_link = Column(String, nullable=True)
\ No newline at end of file
+    resume_link = Column(String, nullable=True)
+
+    # ----------------------------------
+    # Sending window
+    # ----------------------------------
+    timezone = Column(String, nullable=True)           # IANA name, e.g. "Europe/Berlin"
+
+    # ----------------------------------
+    # Follow-up cadence
+    # ----------------------------------
+    followup_cadence = Column(Text, nullable=True)     # JSON, see services/cadence.py; NULL = default
\ No newline at end of file
@@ -0,0 +1,212 @@
+# backend/services/bounce_parser.py
+
+import base64
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+from backend.services.metrics import google_execute
+
+# ======================================================
+# PATTERNS
+# ======================================================
+
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+DSN_FIELD_PATTERN = re.compile(r"^([A-Za-z][A-Za-z0-9-]*)\s*:\s*(.*)$")
+
+DSN_MIME_TYPES = ("message/delivery-status", "message/global-delivery-status")
+
+# Headers asked for in the cheap metadata fetch
+METADATA_HEADERS = ["X-Failed-Recipients", "Content-Type"]
+
+# Only what the DSN walk needs from a full fetch
+FULL_FETCH_FIELDS = "payload(mimeType,body,parts)"
+
+
+@dataclass(frozen=True)
+class BouncedRecipient:
+    email: str
+    status: str = ""          # DSN status code, e.g. 5.1.1
+    diagnostic: str = ""      # remote server's reason
+    source: str = "dsn"       # dsn | header | regex
+
+    def describe(self) -> str:
+        detail = " ".join(part for part in (self.status, self.diagnostic) if part)
+        return f"Mail bounced ({detail})" if detail else "Mail bounced (mailer-daemon)"
+
+
+# ======================================================
+# PARSING
+# ======================================================
+
+def decode_body(data: Optional[str]) -> str:
+    if not data:
+        return ""
+    return base64.urlsafe_b64decode(data).decode(errors="ignore")
+
+
+def parse_failed_recipients_header(value: str) -> List[BouncedRecipient]:
+    """X-Failed-Recipients: a@x.com, b@y.com"""
+    return [
+        BouncedRecipient(email=address.lower(), source="header")
+        for address in EMAIL_PATTERN.findall(value or "")
+    ]
+
+
+def _dsn_field_groups(text: str) -> Iterator[Dict[str, str]]:
+    """
+    Split a delivery-status body into its blank-line separated field
+    groups (per-message first, then one per recipient). Folded lines
+    are joined onto the previous field.
+    """
+    fields: Dict[str, str] = {}
+    last_name = None
+
+    for line in text.splitlines():
+        if not line.strip():
+            if fields:
+                yield fields
+            fields, last_name = {}, None
+            continue
+
+        if line[0] in " \t" and last_name:
+            fields[last_name] += " " + line.strip()
+            continue
+
+        match = DSN_FIELD_PATTERN.match(line)
+        if match:
+            last_name = match.group(1).lower()
+            fields[last_name] = match.group(2).strip()
+
+    if fields:
+        yield fields
+
+
+def parse_delivery_status(text: str) -> List[BouncedRecipient]:
+    """
+    Failed recipients from a message/delivery-status body (RFC 3464).
+    Delayed / delivered / relayed recipients are ignored.
+    """
+    recipients = []
+
+    for fields in _dsn_field_groups(text):
+        recipient = fields.get("final-recipient") or fields.get("original-recipient")
+        if not recipient:
+            continue
+
+        action = fields.get("action", "").lower()
+        status = fields.get("status", "")
+        if action and action != "failed":
+            continue
+        if not action and not status.startswith("5"):
+            continue
+
+        # "rfc822; someone@example.com"
+        address = recipient.split(";", 1)[-1].strip().strip("<>").lower()
+        if not EMAIL_PATTERN.fullmatch(address):
+            continue
+
+        recipients.append(BouncedRecipient(
+            email=address,
+            status=status,
+            diagnostic=fields.get("diagnostic-code", "").split(";", 1)[-1].strip()[:200]
+        ))
+
+    return recipients
+
+
+def walk_parts(payload: dict) -> Iterator[dict]:
+    yield payload
+    for part in payload.get("parts", []) or []:
+        yield from walk_parts(part)
+
+
+def regex_candidates(text: str) -> List[BouncedRecipient]:
+    """
+    Last resort for non-standard bounces: every address in the text.
+    The caller keeps only addresses it actually sent to.
+    """
+    seen = []
+    for address in EMAIL_PATTERN.findall(text):
+        address = address.lower()
+        if address not in seen:
+            seen.append(address)
+    return [BouncedRecipient(email=address, source="regex") for address in seen]
+
+
+# ======================================================
+# GMAIL FETCHING
+# ======================================================
+
+def _part_text(service, message_id: str, part: dict, api_calls: Counter) -> str:
+    body = part.get("body", {}) or {}
+    if body.get("data"):
+        return decode_body(body["data"])
+
+    # Larger parts come back as attachments: fetch just this one
+    if body.get("attachmentId"):
+        attachment = google_execute(service.users().messages().attachments().get(
+            userId="me",
+            messageId=message_id,
+            id=body["attachmentId"]
+        ), "gmail")
+        api_calls["gmail"] += 1
+        return decode_body(attachment.get("data"))
+
+    return ""
+
+
+def extract_bounced_recipients(
+    service,
+    message_id: str,
+    api_calls: Optional[Counter] = None
+) -> List[BouncedRecipient]:
+    """
+    Recipients a bounce message reports as failed, cheapest source first:
+    1. X-Failed-Recipients header (metadata fetch, no body)
+    2. message/delivery-status parts
+    3. address regex over the text/plain parts
+    """
+    api_calls = api_calls if api_calls is not None else Counter()
+
+    metadata = google_execute(service.users().messages().get(
+        userId="me",
+        id=message_id,
+        format="metadata",
+        metadataHeaders=METADATA_HEADERS
+    ), "gmail")
+    api_calls["gmail"] += 1
+
+    headers = {
+        h["name"].lower(): h["value"]
+        for h in metadata.get("payload", {}).get("headers", [])
+    }
+
+    failed = parse_failed_recipients_header(headers.get("x-failed-recipients", ""))
+    if failed:
+        return failed
+
+    message = google_execute(service.users().messages().get(
+        userId="me",
+        id=message_id,
+        format="full",
+        fields=FULL_FETCH_FIELDS
+    ), "gmail")
+    api_calls["gmail"] += 1
+
+    parts = list(walk_parts(message.get("payload", {})))
+
+    recipients = []
+    for part in parts:
+        if part.get("mimeType", "").lower() in DSN_MIME_TYPES:
+            recipients.extend(parse_delivery_status(_part_text(service, message_id, part, api_calls)))
+    if recipients:
+        return recipients
+
+    text = "".join(
+        decode_body((part.get("body", {}) or {}).get("data"))
+        for part in parts
+        if part.get("mimeType", "").lower() == "text/plain"
+    )
+    return regex_candidates(text)
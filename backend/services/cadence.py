@@ -0,0 +1,192 @@
+# backend/services/cadence.py
+
+import json
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.config import (
+    MAX_FOLLOWUPS,
+    FOLLOWUP_DELAYS_DAYS,
+    FOLLOWUP_BUSINESS_DAYS,
+    FOLLOWUP_RETRY_AFTER_DAYS,
+)
+from backend.services.structured_log import get_logger
+
+logger = get_logger("cadence")
+
+# ======================================================
+# STATUSES (Status column)
+# ======================================================
+
+PENDING_STATUS = "Pending"
+SENT_STATUS = "Sent"
+FINISHED_STATUS = "Permanently-Rejected"
+UNKNOWN_STATUS = "Unknown"
+
+# Upper bound on emails per contact a cadence may ask for
+MAX_CADENCE_EMAILS = 20
+
+# Upper bound on one delay (days): keeps send dates far from date.max
+MAX_FOLLOWUP_DELAY_DAYS = 3650
+
+
+def _business_day_offset(weekday: int, days: int) -> int:
+    """Calendar days from a day with `weekday` to `days` business days later"""
+    offset = 0
+    while days > 0:
+        offset += 1
+        if (weekday + offset) % 7 < 5:
+            days -= 1
+    return offset
+
+
+# ======================================================
+# COMPILED CADENCE
+# ======================================================
+
+class Cadence:
+    """
+    A follow-up sequence: up to max_emails per contact, delays[n - 1]
+    days between email n and email n + 1 (the last delay repeats if
+    max_emails asks for more), counted in business days if
+    business_days is set.
+
+    Compiled once into lookup tables indexed by followup count (the
+    count AFTER a send, as stored in the sheet): the status to show
+    and, per weekday of the send, how many calendar days until the
+    next email. Every method is a table lookup.
+    """
+
+    def __init__(
+        self,
+        delays: Sequence[int],
+        max_emails: int,
+        business_days: bool = False,
+        retry_after_days: int = FOLLOWUP_RETRY_AFTER_DAYS
+    ):
+        delays = [min(max(int(days), 0), MAX_FOLLOWUP_DELAY_DAYS) for days in delays] or [0]
+        self.max_emails = min(max(int(max_emails), 1), MAX_CADENCE_EMAILS)
+        self.business_days = bool(business_days)
+        self.retry_after_days = retry_after_days
+
+        # Delay after email n, for n = 1 .. max_emails - 1
+        self.delays = tuple(
+            delays[min(n, len(delays) - 1)] for n in range(self.max_emails - 1)
+        )
+
+        # followup count -> status
+        statuses = [PENDING_STATUS, SENT_STATUS]
+        followups = retries = 0
+        for count in range(2, self.max_emails + 1):
+            if count == self.max_emails:
+                statuses.append(FINISHED_STATUS)
+            elif self.delays[count - 2] >= retry_after_days:
+                retries += 1
+                statuses.append(f"Retry-{retries}")
+            else:
+                followups += 1
+                statuses.append(f"Follow-up-{followups}")
+        self._statuses: Tuple[str, ...] = tuple(statuses[:self.max_emails + 1])
+
+        # followup count -> weekday of the send -> calendar days to the next email
+        offsets: List[Optional[Tuple[int, ...]]] = [None]
+        for days in self.delays:
+            if self.business_days:
+                offsets.append(tuple(_business_day_offset(weekday, days) for weekday in range(7)))
+            else:
+                offsets.append((days,) * 7)
+        self._offsets: Tuple[Optional[Tuple[int, ...]], ...] = tuple(offsets) + (None,)
+
+    # ---------------- lookups
+
+    def is_finished(self, followup_count: int) -> bool:
+        """No more emails after `followup_count` have been sent"""
+        return followup_count >= self.max_emails
+
+    def status(self, followup_count: int) -> str:
+        if 0 <= followup_count < len(self._statuses):
+            return self._statuses[followup_count]
+        return UNKNOWN_STATUS
+
+    def next_send_date(self, followup_count: int, sent_on: date) -> Optional[date]:
+        """When the next email is due after email `followup_count` went out on `sent_on`"""
+        if not 0 < followup_count < self.max_emails:
+            return None
+        return sent_on + timedelta(days=self._offsets[followup_count][sent_on.weekday()])
+
+    def next_send_dates(self, sends: Iterable[Tuple[int, date]]) -> List[Optional[date]]:
+        """next_send_date for many (followup_count, sent_on) pairs at once"""
+        offsets = self._offsets
+        max_emails = self.max_emails
+        return [
+            sent_on + timedelta(days=offsets[count][sent_on.weekday()])
+            if sent_on is not None and 0 < count < max_emails else None
+            for count, sent_on in sends
+        ]
+
+    # ---------------- (de)serialization
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "delays": list(self.delays),
+            "max_emails": self.max_emails,
+            "business_days": self.business_days,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, object]) -> "Cadence":
+        """
+        {"delays": [7, 7, 60, 60], "max_emails": 5, "business_days": false}
+        Missing keys take the defaults from config.
+        """
+        delays = spec.get("delays")
+        if delays is None:
+            delays = DEFAULT_CADENCE.delays
+        if isinstance(delays, str):
+            delays = _parse_delays(delays)
+        return cls(
+            delays,
+            spec.get("max_emails") or len(delays) + 1,
+            bool(spec.get("business_days", False)),
+        )
+
+
+def _parse_delays(spec: str) -> List[int]:
+    """ "7,7,60,60" """
+    return [int(item) for item in spec.split(",") if item.strip()]
+
+
+DEFAULT_CADENCE = Cadence(
+    _parse_delays(FOLLOWUP_DELAYS_DAYS),
+    MAX_FOLLOWUPS,
+    FOLLOWUP_BUSINESS_DAYS,
+)
+
+
+# ======================================================
+# LOOKUP
+# ======================================================
+
+@lru_cache(maxsize=1024)
+def compile_cadence(spec: Optional[str]) -> Cadence:
+    """
+    The Cadence for a stored spec (JSON, see Cadence.from_dict),
+    compiled once per distinct spec. Empty or broken specs get the
+    default cadence.
+    """
+    if not spec:
+        return DEFAULT_CADENCE
+    try:
+        return Cadence.from_dict(json.loads(spec))
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.warning("cadence_invalid", spec=spec, error=str(e))
+        return DEFAULT_CADENCE
+
+
+def cadence_for(user) -> Cadence:
+    """The user's follow-up cadence (default if they haven't set one)"""
+    return compile_cadence(getattr(user, "followup_cadence", None))
@@ -0,0 +1,241 @@
+# backend/services/campaigns.py
+
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.config import CAMPAIGN_CACHE_TTL_SECONDS, CONTACT_SNAPSHOT_TTL_SECONDS
+from backend.models.campaign import Campaign
+from backend.services.cadence import Cadence, compile_cadence
+from backend.services.contact_sources import (
+    ContactSource,
+    SheetsContactSource,
+    campaign_list_id,
+    contact_list_id,
+    source_for_list,
+)
+from backend.utils.template_engine import CompiledTemplate
+
+DEFAULT_CAMPAIGN_NAME = "Default"
+DEFAULT_TEMPLATE = "Hi {Name},\n\nBest regards,\n{MyName}"
+DEFAULT_SUBJECT = "Application / Follow-up"
+
+# ======================================================
+# CAMPAIGN SNAPSHOT
+# ======================================================
+
+@dataclass(frozen=True)
+class CampaignProfile:
+    """
+    Detached, read-only copy of a Campaign row, or of the user's own
+    settings (the default campaign, id None). Templates and subject
+    already fall back to the user's, then to the built-in defaults.
+    Safe to share across sessions and threads.
+    """
+    id: Optional[int]
+    user_id: int
+    name: str
+    list_id: Optional[str]
+    email_template: str
+    followup_template: str
+    email_subject: str
+    followup_cadence: Optional[str]
+    daily_share: int
+    is_paused: bool
+
+    @classmethod
+    def default_for(cls, user) -> "CampaignProfile":
+        return cls(
+            id=None,
+            user_id=user.id,
+            name=DEFAULT_CAMPAIGN_NAME,
+            list_id=contact_list_id(user),
+            email_template=user.email_template or DEFAULT_TEMPLATE,
+            followup_template=user.followup_template or user.email_template or DEFAULT_TEMPLATE,
+            email_subject=user.email_subject or DEFAULT_SUBJECT,
+            followup_cadence=getattr(user, "followup_cadence", None),
+            daily_share=1,
+            is_paused=False,
+        )
+
+    @classmethod
+    def from_campaign(cls, campaign: Campaign, user) -> "CampaignProfile":
+        email_template = campaign.email_template or user.email_template or DEFAULT_TEMPLATE
+        return cls(
+            id=campaign.id,
+            user_id=campaign.user_id,
+            name=campaign.name,
+            list_id=campaign_list_id(campaign),
+            email_template=email_template,
+            followup_template=campaign.followup_template or user.followup_template or email_template,
+            email_subject=campaign.email_subject or user.email_subject or DEFAULT_SUBJECT,
+            followup_cadence=campaign.followup_cadence or getattr(user, "followup_cadence", None),
+            daily_share=max(campaign.daily_share or 0, 0),
+            is_paused=bool(campaign.is_paused),
+        )
+
+    # Compiled on first use, then kept with this snapshot
+    @cached_property
+    def cadence(self) -> Cadence:
+        return compile_cadence(self.followup_cadence)
+
+    @cached_property
+    def initial_compiled(self) -> CompiledTemplate:
+        return CompiledTemplate(self.email_template)
+
+    @cached_property
+    def followup_compiled(self) -> CompiledTemplate:
+        return CompiledTemplate(self.followup_template)
+
+    def template_for(self, followup_count: int) -> CompiledTemplate:
+        return self.initial_compiled if followup_count == 1 else self.followup_compiled
+
+
+# ======================================================
+# CACHE
+# ======================================================
+
+class CampaignCache:
+    """
+    user_id -> that user's campaigns (default first), with a short TTL
+    like the user profile cache. Campaign writes call invalidate().
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, Tuple[CampaignProfile, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Tuple[CampaignProfile, ...]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if not entry:
+                return None
+            expires_at, campaigns = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            return campaigns
+
+    def put(self, user_id: int, campaigns: Tuple[CampaignProfile, ...]) -> Tuple[CampaignProfile, ...]:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, campaigns)
+        return campaigns
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+        contact_snapshots.invalidate(user_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+campaign_cache = CampaignCache(CAMPAIGN_CACHE_TTL_SECONDS)
+
+
+def user_campaigns(db: Session, user) -> Tuple[CampaignProfile, ...]:
+    """
+    Every campaign of the user, paused ones included. The user's own
+    settings come first as the default campaign when they have a
+    contact list.
+    """
+    campaigns = campaign_cache.get(user.id)
+    if campaigns is not None:
+        return campaigns
+
+    profiles = []
+    if contact_list_id(user):
+        profiles.append(CampaignProfile.default_for(user))
+    rows = db.query(Campaign).filter(Campaign.user_id == user.id).order_by(Campaign.id).all()
+    profiles.extend(CampaignProfile.from_campaign(row, user) for row in rows)
+    return campaign_cache.put(user.id, tuple(profiles))
+
+
+def active_campaigns(db: Session, user) -> Tuple[CampaignProfile, ...]:
+    """Campaigns the scheduler sends for: not paused, with a contact list"""
+    return tuple(
+        campaign for campaign in user_campaigns(db, user)
+        if not campaign.is_paused and campaign.list_id
+    )
+
+
+def campaign_list_ids(db: Session, user) -> Tuple[str, ...]:
+    """
+    Every contact list the user sends from, default list first, paused
+    campaigns included (replies and bounces still come in)
+    """
+    return tuple(dict.fromkeys(
+        campaign.list_id for campaign in user_campaigns(db, user) if campaign.list_id
+    ))
+
+
+def find_campaign(db: Session, user, campaign_id: Optional[int]) -> Optional[CampaignProfile]:
+    for campaign in user_campaigns(db, user):
+        if campaign.id == campaign_id:
+            return campaign
+    return None
+
+
+# ======================================================
+# CONTACT SNAPSHOTS
+# ======================================================
+
+class ContactSnapshots:
+    """
+    One SheetsContactSource per (user, campaign), kept for ttl_seconds
+    so a campaign's sheet is read once per TTL instead of once per pass.
+    Writes go through the same source, which patches its cached rows,
+    so the snapshot stays in step with this node's own sends; edits
+    made in the sheet show up once it expires. Until then, writes check
+    the address in each row first (see SheetsContactSource.verify_rows).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[int, Optional[int]], Tuple[float, SheetsContactSource]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, campaign: CampaignProfile, api_calls: Optional[Counter] = None) -> SheetsContactSource:
+        key = (campaign.user_id, campaign.id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                expires_at, source = entry
+                if expires_at >= now and source.list_id == campaign.list_id and source.cadence is campaign.cadence:
+                    return source
+
+            source = SheetsContactSource(campaign.list_id, api_calls, cadence=campaign.cadence, verify_rows=True)
+            self._entries[key] = (now + self.ttl_seconds, source)
+            return source
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+contact_snapshots = ContactSnapshots(CONTACT_SNAPSHOT_TTL_SECONDS)
+
+
+def campaign_source(db: Session, user, campaign: CampaignProfile, api_calls: Optional[Counter] = None) -> ContactSource:
+    """The campaign's contact list, on the campaign's cadence"""
+    if not _is_sheet(campaign.list_id) or CONTACT_SNAPSHOT_TTL_SECONDS <= 0:
+        return source_for_list(db, user, campaign.list_id, api_calls, cadence=campaign.cadence)
+    return contact_snapshots.get(campaign, api_calls)
+
+
+def _is_sheet(list_id: str) -> bool:
+    # Local and file list ids carry a "kind:" prefix; Sheet ids never contain ":"
+    return ":" not in list_id
@@ -0,0 +1,390 @@
+# backend/services/contact_import.py
+
+import csv
+import io
+from dataclasses import dataclass, asdict
+from datetime import date, datetime
+from itertools import chain, islice
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.orm import Session
+
+from backend.config import CONTACT_BATCH_SIZE
+from backend.models.contact import Contact
+from backend.services.contact_sources import write_contacts_file
+
+# ======================================================
+# COLUMNS
+# ======================================================
+
+# Sheet columns A-K, in order (used when the file has no header row)
+FIELDS = (
+    "email",
+    "name",
+    "company",
+    "status",
+    "replied",
+    "bounced",
+    "followup_count",
+    "last_sent_date",
+    "next_send_date",
+    "notes",
+    "last_error",
+)
+
+FIELD_INDEX = {field: index for index, field in enumerate(FIELDS)}
+
+# Normalized header -> field
+HEADER_ALIASES = {
+    "email": "email",
+    "email_address": "email",
+    "name": "name",
+    "company": "company",
+    "status": "status",
+    "replied": "replied",
+    "bounce": "bounced",
+    "bounced": "bounced",
+    "followup_count": "followup_count",
+    "follow_up_count": "followup_count",
+    "last_sent_date": "last_sent_date",
+    "next_send_date": "next_send_date",
+    "notes": "notes",
+    "last_error": "last_error",
+}
+
+# Values for new contacts when the file leaves a column out or blank
+INSERT_DEFAULTS = {
+    "name": None,
+    "company": None,
+    "status": None,
+    "replied": False,
+    "bounced": False,
+    "followup_count": 0,
+    "last_sent_date": None,
+    "next_send_date": None,
+    "notes": None,
+    "last_error": None,
+}
+
+# Progress the app records after sending; a file can only move it forward
+SEND_PROGRESS_FIELDS = ("status", "followup_count", "last_sent_date", "next_send_date", "last_error")
+
+
+class ContactImportError(ValueError):
+    """The uploaded file can't be read as a contacts list"""
+
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0     # no usable email, or repeated later in the same batch
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _normalize_header(value: str) -> str:
+    return value.strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def column_map(first_row: List[str]) -> Tuple[Dict[int, str], bool]:
+    """
+    (column index -> field, has_header). A first row with an Email
+    header is a header row; otherwise columns are read as A-K.
+    """
+    columns = {}
+    for index, value in enumerate(first_row):
+        field = HEADER_ALIASES.get(_normalize_header(value or ""))
+        if field and field not in columns.values():
+            columns[index] = field
+
+    if "email" in columns.values():
+        return columns, True
+    return {index: field for index, field in enumerate(FIELDS[:len(first_row)])}, False
+
+
+# ======================================================
+# VALUE PARSING (same conventions as the sheet)
+# ======================================================
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().upper() in ("TRUE", "YES", "Y", "1")
+
+
+def _parse_int(value: str) -> int:
+    try:
+        return int(float(value))
+    except ValueError:
+        return 0
+
+
+def _parse_date(value: str) -> Optional[date]:
+    try:
+        return datetime.strptime(value.strip()[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+PARSERS = {
+    "replied": _parse_bool,
+    "bounced": _parse_bool,
+    "followup_count": _parse_int,
+    "last_sent_date": _parse_date,
+    "next_send_date": _parse_date,
+}
+
+
+def parse_contact(row: List[str], columns: Dict[int, str]) -> Optional[dict]:
+    """
+    Field values for one row, leaving out blank cells (so re-importing
+    a file never wipes progress the app has recorded). None if the row
+    has no usable email.
+    """
+    values = {}
+    for index, field in columns.items():
+        if index >= len(row):
+            continue
+        cell = (row[index] or "").strip()
+        if not cell:
+            continue
+        parser = PARSERS.get(field)
+        values[field] = parser(cell) if parser else cell
+
+    email = values.get("email", "").lower()
+    if "@" not in email:
+        return None
+    values["email"] = email
+    return values
+
+
+# ======================================================
+# FILE READERS (streaming)
+# ======================================================
+
+def iter_csv_rows(fileobj: BinaryIO) -> Iterator[List[str]]:
+    """Rows of a UTF-8 CSV file, read incrementally"""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ContactImportError(f"Could not read CSV: {e}") from e
+    finally:
+        # Leave the upload's file open for its owner
+        text.detach()
+
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def iter_xlsx_rows(fileobj: BinaryIO) -> Iterator[List[str]]:
+    """
+    Rows of the first worksheet. openpyxl's read-only mode streams the
+    sheet XML row by row (shared strings are still loaded up front).
+    """
+    # Deferred: openpyxl is only needed for imports
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception as e:
+        raise ContactImportError(f"Could not open XLSX: {e}") from e
+
+    try:
+        for values in workbook.worksheets[0].iter_rows(values_only=True):
+            yield [_cell_text(value) for value in values]
+    finally:
+        workbook.close()
+
+
+READERS = {
+    ".csv": iter_csv_rows,
+    ".xlsx": iter_xlsx_rows,
+}
+
+
+def read_rows(fileobj: BinaryIO, filename: str) -> Iterator[List[str]]:
+    extension = "." + filename.rsplit(".", 1)[-1].lower() if "." in (filename or "") else ""
+    reader = READERS.get(extension)
+    if not reader:
+        raise ContactImportError("Upload a .csv or .xlsx file")
+    return reader(fileobj)
+
+
+# ======================================================
+# IMPORT
+# ======================================================
+
+def _batches(rows: Iterator[List[str]], size: int) -> Iterator[List[List[str]]]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _forward_only(values: dict, current_followup_count: int) -> dict:
+    """
+    Changes a file may make to a known contact: details always, reply /
+    bounce flags only to TRUE, send progress only from a later step.
+    An old export re-imported must never make the app send again.
+    """
+    changes = {
+        field: value for field, value in values.items()
+        if field not in SEND_PROGRESS_FIELDS and field not in ("replied", "bounced")
+    }
+    for flag in ("replied", "bounced"):
+        if values.get(flag):
+            changes[flag] = True
+    if values.get("followup_count", 0) > current_followup_count:
+        changes.update({field: values[field] for field in SEND_PROGRESS_FIELDS if field in values})
+    return changes
+
+
+def _write_batch(db: Session, user_id: int, contacts: Dict[str, dict], next_row: int, result: ImportResult) -> int:
+    """Upsert one batch by email; returns the next free row number"""
+    existing = {
+        row.email: row for row in db.execute(
+            select(Contact.email, Contact.id, Contact.followup_count)
+            .where(Contact.user_id == user_id, Contact.email.in_(list(contacts)))
+        ).all()
+    }
+
+    now = datetime.utcnow()
+    inserts, updates = [], []
+    for email, values in contacts.items():
+        current = existing.get(email)
+        if current is not None:
+            updates.append({
+                "id": current.id,
+                "updated_at": now,
+                **_forward_only(values, current.followup_count)
+            })
+        else:
+            inserts.append({
+                **INSERT_DEFAULTS,
+                **values,
+                "user_id": user_id,
+                "row_number": next_row,
+                "updated_at": now,
+            })
+            next_row += 1
+
+    if inserts:
+        db.execute(insert(Contact), inserts)
+    if updates:
+        db.execute(update(Contact), updates)
+    db.commit()
+
+    result.inserted += len(inserts)
+    result.updated += len(updates)
+    return next_row
+
+
+def _header_and_rows(rows: Iterable[List[str]]) -> Tuple[Optional[Dict[int, str]], Iterator[List[str]]]:
+    """(column map, data rows); the map is None for an empty file"""
+    rows = iter(rows)
+    first_row = next(rows, None)
+    if first_row is None:
+        return None, rows
+
+    columns, has_header = column_map(first_row)
+    if not has_header:
+        rows = chain([first_row], rows)
+    return columns, rows
+
+
+def import_contacts(
+    db: Session,
+    user_id: int,
+    rows: Iterable[List[str]],
+    batch_size: int = CONTACT_BATCH_SIZE
+) -> ImportResult:
+    """
+    Stream rows into the user's contacts, batch_size rows per
+    transaction, so memory is bounded by the batch, not the file.
+
+    Contacts are matched by email: known ones are updated with the
+    non-blank cells (see _forward_only), new ones are appended after
+    the last row number.
+    """
+    result = ImportResult()
+    columns, rows = _header_and_rows(rows)
+    if columns is None:
+        return result
+
+    next_row = (
+        db.query(func.max(Contact.row_number))
+        .filter(Contact.user_id == user_id)
+        .scalar() or 1
+    ) + 1
+
+    for batch in _batches(rows, batch_size):
+        contacts = {}
+        for row in batch:
+            result.rows_read += 1
+            values = parse_contact(row, columns)
+            if values is None or values["email"] in contacts:
+                result.skipped += 1
+                continue
+            contacts[values["email"]] = values
+
+        if contacts:
+            next_row = _write_batch(db, user_id, contacts, next_row, result)
+
+    return result
+
+
+# ======================================================
+# SAVE AS FILE (contact source "file")
+# ======================================================
+
+def to_sheet_row(row: List[str], columns: Dict[int, str]) -> Optional[List[str]]:
+    """The row laid out as columns A-K, cells kept as text. None without an email."""
+    out = [""] * len(FIELDS)
+    for index, field in columns.items():
+        if index < len(row):
+            out[FIELD_INDEX[field]] = (row[index] or "").strip()
+
+    out[0] = out[0].lower()
+    if "@" not in out[0]:
+        return None
+    return out
+
+
+def save_contacts_file(path: Path, rows: Iterable[List[str]]) -> ImportResult:
+    """
+    Replace the user's contacts file with the upload, streamed row by
+    row. Unlike import_contacts this is not a merge: the file is the
+    list, the way a sheet is.
+    """
+    result = ImportResult()
+    columns, rows = _header_and_rows(rows)
+
+    def sheet_rows():
+        if columns is None:
+            return
+        for row in rows:
+            result.rows_read += 1
+            out = to_sheet_row(row, columns)
+            if out is None:
+                result.skipped += 1
+                continue
+            yield out
+
+    result.inserted = write_contacts_file(path, sheet_rows())
+    return result
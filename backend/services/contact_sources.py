@@ -0,0 +1,680 @@
+# backend/services/contact_sources.py
+
+import csv
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from sqlalchemy.orm import Session
+
+try:
+    import fcntl
+except ImportError:  # Windows: the per-process lock below is all there is
+    fcntl = None
+
+from backend.config import CONTACT_BATCH_SIZE, CONTACT_FILE_DIR, DEFAULT_SHEET_NAME
+from backend.services import contact_store
+from backend.services.cadence import DEFAULT_CADENCE, Cadence, cadence_for
+from backend.services.sheets_service import read_all_rows, read_cells, update_cells
+from backend.services.structured_log import get_logger
+from backend.utils.date_utils import format_date
+
+logger = get_logger("contact_sources")
+
+# (row_number, row) with row = columns A-K as the Sheets API returns them
+ContactRow = Tuple[int, List[str]]
+
+# ======================================================
+# SOURCE KINDS
+# ======================================================
+
+SHEETS_SOURCE = "sheets"
+LOCAL_SOURCE = "local"
+FILE_SOURCE = "file"
+CONTACT_SOURCES = (SHEETS_SOURCE, LOCAL_SOURCE, FILE_SOURCE)
+
+# List ids (send_jobs.sheet_id) of lists that are not Google Sheets
+LOCAL_LIST_PREFIX = "local:"
+FILE_LIST_PREFIX = "file:"
+MEMORY_LIST_PREFIX = "memory:"
+
+
+def uses_local_contacts(user) -> bool:
+    return getattr(user, "contact_source", None) == LOCAL_SOURCE
+
+
+def contact_list_id(user) -> Optional[str]:
+    """
+    The id send jobs and logs use for the user's contact list: the
+    Google Sheet id, "local:<user_id>" for imported contacts or
+    "file:<user_id>" for an uploaded CSV kept as a file.
+    None when the user has no contact list yet.
+    """
+    source = getattr(user, "contact_source", None)
+    if source == LOCAL_SOURCE:
+        return f"{LOCAL_LIST_PREFIX}{user.id}"
+    if source == FILE_SOURCE:
+        return f"{FILE_LIST_PREFIX}{user.id}"
+    return user.sheet_id or None
+
+
+def contact_file_path(user_id: int, campaign_id: Optional[int] = None) -> Path:
+    if campaign_id is not None:
+        return Path(CONTACT_FILE_DIR) / f"{user_id}-{campaign_id}.csv"
+    return Path(CONTACT_FILE_DIR) / f"{user_id}.csv"
+
+
+def campaign_list_id(campaign) -> Optional[str]:
+    """
+    contact_list_id for a campaign: its Google Sheet id, or
+    "file:<user_id>:<campaign_id>" for its own contacts file.
+    """
+    if campaign.contact_source == FILE_SOURCE:
+        return f"{FILE_LIST_PREFIX}{campaign.user_id}:{campaign.id}"
+    return campaign.sheet_id or None
+
+
+def _file_list_path(user_id: int, list_id: str) -> Path:
+    """The CSV behind file:<user_id> or file:<user_id>:<campaign_id>"""
+    _, _, campaign_id = list_id[len(FILE_LIST_PREFIX):].partition(":")
+    return contact_file_path(user_id, int(campaign_id) if campaign_id else None)
+
+
+# ======================================================
+# ROW UPDATES
+# ======================================================
+
+SENT = "sent"
+BOUNCED = "bounced"
+REPLIED = "replied"
+
+# Column positions (A-K)
+STATUS_COL = 3
+REPLIED_COL = 4
+BOUNCE_COL = 5
+FOLLOWUP_COL = 6
+LAST_SENT_COL = 7
+NEXT_SEND_COL = 8
+LAST_ERROR_COL = 10
+
+COLUMN_LETTERS = "ABCDEFGHIJK"
+
+HEADER = [
+    "Email", "Name", "Company", "Status", "Replied", "Bounce",
+    "Followup_Count", "Last_Sent_Date", "Next_Send_Date", "Notes", "Last_Error",
+]
+
+
+@dataclass(frozen=True)
+class RowUpdate:
+    """
+    One status change. kind is SENT (followup_count is the NEW count),
+    BOUNCED (with error) or REPLIED.
+    """
+    row_number: int
+    kind: str
+    followup_count: int = 0
+    error: str = ""
+
+
+def cell_changes(update: RowUpdate, today: Optional[date] = None, cadence: Cadence = DEFAULT_CADENCE) -> Dict[int, object]:
+    """column index -> new value, as the sheets_service helpers write them"""
+    if update.kind == SENT:
+        today = today or datetime.utcnow().date()
+        next_send = cadence.next_send_date(update.followup_count, today)
+        return {
+            STATUS_COL: cadence.status(update.followup_count),
+            FOLLOWUP_COL: update.followup_count,
+            LAST_SENT_COL: format_date(today),
+            NEXT_SEND_COL: format_date(next_send) if next_send else "",
+        }
+    if update.kind == BOUNCED:
+        return {BOUNCE_COL: "TRUE", LAST_ERROR_COL: update.error}
+    if update.kind == REPLIED:
+        return {REPLIED_COL: "TRUE"}
+    raise ValueError(f"Unknown row update: {update.kind}")
+
+
+def _cell(row: List[str], index: int) -> str:
+    return row[index] if len(row) > index else ""
+
+
+def _followup_count(row: List[str]) -> int:
+    try:
+        return int(_cell(row, FOLLOWUP_COL) or 0)
+    except ValueError:
+        return 0
+
+
+def is_due(row: List[str], today: date, cadence: Cadence = DEFAULT_CADENCE) -> bool:
+    """Same stop conditions as the scheduler (contact_store.read_batch due_only)"""
+    if not _cell(row, 0):
+        return False
+    if _cell(row, REPLIED_COL) == "TRUE" or _cell(row, BOUNCE_COL) == "TRUE":
+        return False
+    if cadence.is_finished(_followup_count(row)):
+        return False
+
+    next_send = _cell(row, NEXT_SEND_COL)
+    if next_send:
+        try:
+            return datetime.strptime(next_send, "%Y-%m-%d").date() <= today
+        except ValueError:
+            pass
+    return True
+
+
+def was_sent(row: List[str]) -> bool:
+    """Emailed, and no reply or bounce recorded yet"""
+    return (
+        bool(_cell(row, 0))
+        and _cell(row, REPLIED_COL) != "TRUE"
+        and _cell(row, BOUNCE_COL) != "TRUE"
+        and _followup_count(row) > 0
+    )
+
+
+def _matches(row: List[str], due_only: bool, sent_only: bool, today: date, cadence: Cadence) -> bool:
+    if due_only and not is_due(row, today, cadence):
+        return False
+    if sent_only and not was_sent(row):
+        return False
+    return True
+
+
+def _apply_to_row(row: List[str], changes: Dict[int, object]):
+    row.extend([""] * (len(HEADER) - len(row)))
+    for index, value in changes.items():
+        row[index] = "" if value is None else str(value)
+
+
+# ======================================================
+# INTERFACE
+# ======================================================
+
+class ContactSource(Protocol):
+    """
+    Where a user's contacts live. Rows are sheet-shaped (columns A-K)
+    and addressed by row number, whatever the storage.
+
+    due_only / sent_only narrow the rows returned; a source may return
+    extra rows, so callers keep their own checks.
+    """
+
+    list_id: str
+    cadence: Cadence
+
+    def read_batch(self, after_row: int, limit: int, due_only: bool = False, sent_only: bool = False) -> List[ContactRow]:
+        ...
+
+    def iter_rows(self, start_row: int = 2, due_only: bool = False, sent_only: bool = False) -> Iterator[ContactRow]:
+        ...
+
+    def find_rows(self, emails: Iterable[str]) -> Dict[str, ContactRow]:
+        ...
+
+    def apply(self, updates: Iterable[RowUpdate]):
+        ...
+
+    def mark_sent(self, row_number: int, new_followup_count: int):
+        ...
+
+    def mark_bounced(self, row_number: int, error: str):
+        ...
+
+    def mark_replied(self, row_number: int):
+        ...
+
+    def hold_sent_marks(self):
+        ...
+
+    def flush(self):
+        ...
+
+
+class BaseContactSource(ABC):
+    """
+    Cursor iteration and the single-row helpers on top of read_batch()
+    and apply(), which each source implements.
+    """
+
+    list_id: str = ""
+    batch_size: int = CONTACT_BATCH_SIZE
+    # Decides which rows are due and what a send writes back
+    cadence: Cadence = DEFAULT_CADENCE
+    # mark_sent() updates waiting for flush(); None when not holding
+    _held: Optional[List[RowUpdate]] = None
+
+    @abstractmethod
+    def read_batch(self, after_row: int, limit: int, due_only: bool = False, sent_only: bool = False) -> List[ContactRow]:
+        ...
+
+    @abstractmethod
+    def apply(self, updates: Iterable[RowUpdate]):
+        ...
+
+    def iter_rows(self, start_row: int = 2, due_only: bool = False, sent_only: bool = False) -> Iterator[ContactRow]:
+        """
+        (row_number, row) from start_row on, batch_size rows per read.
+        The first batch is read before returning, so an unreachable
+        source fails here rather than halfway through a loop.
+        """
+        first = self.read_batch(start_row - 1, self.batch_size, due_only, sent_only)
+        return self._pages(first, due_only, sent_only)
+
+    def _pages(self, batch: List[ContactRow], due_only: bool, sent_only: bool) -> Iterator[ContactRow]:
+        while True:
+            yield from batch
+            if len(batch) < self.batch_size:
+                return
+            batch = self.read_batch(batch[-1][0], self.batch_size, due_only, sent_only)
+
+    def find_rows(self, emails: Iterable[str]) -> Dict[str, ContactRow]:
+        """email (lower-case) -> first (row_number, row) with that address"""
+        wanted = {email.strip().lower() for email in emails if email}
+        found = {}
+        if not wanted:
+            return found
+        for row_number, row in self.iter_rows():
+            email = _cell(row, 0).strip().lower()
+            if email in wanted and email not in found:
+                found[email] = (row_number, row)
+                if len(found) == len(wanted):
+                    break
+        return found
+
+    def mark_sent(self, row_number: int, new_followup_count: int):
+        update = RowUpdate(row_number, SENT, followup_count=new_followup_count)
+        if self._held is not None:
+            self._held.append(update)
+            return
+        self.apply([update])
+
+    def hold_sent_marks(self):
+        """
+        Keep mark_sent() updates until flush(), to write a pass's sends
+        at once. Safe to lose: a sent job's row is repaired from the
+        queue on the next pass.
+        """
+        if self._held is None:
+            self._held = []
+
+    def flush(self):
+        """Write the held sent marks (one apply) and stop holding"""
+        held, self._held = self._held, None
+        if held:
+            self.apply(held)
+
+    def mark_bounced(self, row_number: int, error: str):
+        self.apply([RowUpdate(row_number, BOUNCED, error=error)])
+
+    def mark_replied(self, row_number: int):
+        self.apply([RowUpdate(row_number, REPLIED)])
+
+
+# ======================================================
+# IN-MEMORY ROWS (Sheets cache, benchmarks)
+# ======================================================
+
+class MemoryContactSource(BaseContactSource):
+    """
+    Rows held in a list; row 2 is rows[0] (row 1 is the header).
+    Used on its own for benchmarks and tests.
+    """
+
+    def __init__(self, rows: List[List[str]], list_id: str = f"{MEMORY_LIST_PREFIX}default", cadence: Cadence = DEFAULT_CADENCE):
+        self.list_id = list_id
+        self.rows = rows
+        self.cadence = cadence
+        self._by_email: Optional[Dict[str, int]] = None
+
+    def read_batch(self, after_row: int, limit: int, due_only: bool = False, sent_only: bool = False) -> List[ContactRow]:
+        today = date.today()
+        batch = []
+        for index in range(max(after_row - 1, 0), len(self.rows)):
+            row = self.rows[index]
+            if _matches(row, due_only, sent_only, today, self.cadence):
+                batch.append((index + 2, row))
+                if len(batch) >= limit:
+                    break
+        return batch
+
+    def find_rows(self, emails: Iterable[str]) -> Dict[str, ContactRow]:
+        # email -> first row index, built on the first lookup
+        # (apply() never changes an email)
+        if self._by_email is None:
+            self._by_email = {}
+            for index, row in enumerate(self.rows):
+                email = _cell(row, 0).strip().lower()
+                if email:
+                    self._by_email.setdefault(email, index)
+
+        found = {}
+        for email in {email.strip().lower() for email in emails if email}:
+            index = self._by_email.get(email)
+            if index is not None:
+                found[email] = (index + 2, self.rows[index])
+        return found
+
+    def _changed_cells(self, updates: Iterable[RowUpdate]) -> List[Tuple[int, int, object]]:
+        """(row_number, column, value) for every cell, applied to the cached rows"""
+        today = datetime.utcnow().date()
+        cells = []
+        for update in updates:
+            changes = cell_changes(update, today, self.cadence)
+            index = update.row_number - 2
+            if 0 <= index < len(self.rows):
+                _apply_to_row(self.rows[index], changes)
+            cells.extend((update.row_number, column, value) for column, value in changes.items())
+        return cells
+
+    def apply(self, updates: Iterable[RowUpdate]):
+        self._changed_cells(updates)
+
+
+# Resolvable by list id (send jobs only store the id)
+_memory_sources: Dict[str, MemoryContactSource] = {}
+
+
+def register_memory_source(source: MemoryContactSource) -> MemoryContactSource:
+    _memory_sources[source.list_id] = source
+    return source
+
+
+# ======================================================
+# GOOGLE SHEETS
+# ======================================================
+
+class SheetsContactSource(MemoryContactSource):
+    """
+    The sheet is read in one call the first time rows are needed and
+    kept for the life of this object; apply() writes every changed cell
+    in one values.batchUpdate call. Sheets calls are counted in
+    api_calls["sheets"].
+
+    verify_rows (long-lived snapshots): before writing, check that each
+    row still holds the address the cached copy has there. Rows that
+    moved (inserts, deletes, sorting in the sheet) are found again in a
+    fresh read, so a write never lands on another contact.
+    """
+
+    def __init__(
+        self,
+        sheet_id: str,
+        api_calls: Optional[Counter] = None,
+        sheet_name: str = DEFAULT_SHEET_NAME,
+        cadence: Cadence = DEFAULT_CADENCE,
+        verify_rows: bool = False
+    ):
+        super().__init__(None, list_id=sheet_id, cadence=cadence)
+        self.sheet_name = sheet_name
+        self.api_calls = api_calls if api_calls is not None else Counter()
+        self.verify_rows = verify_rows
+
+    def _load(self) -> List[List[str]]:
+        if self.rows is None:
+            self.rows = read_all_rows(self.list_id, self.sheet_name)
+            self.api_calls["sheets"] += 1
+        return self.rows
+
+    def read_batch(self, after_row: int, limit: int, due_only: bool = False, sent_only: bool = False) -> List[ContactRow]:
+        self._load()
+        return super().read_batch(after_row, limit, due_only, sent_only)
+
+    def find_rows(self, emails: Iterable[str]) -> Dict[str, ContactRow]:
+        self._load()
+        return super().find_rows(emails)
+
+    def apply(self, updates: Iterable[RowUpdate]):
+        if self.verify_rows and self.rows is not None:
+            updates = self._relocate(list(updates))
+
+        # Cached rows are only patched if the sheet was read
+        cells = self._changed_cells(updates)
+        if not cells:
+            return
+        update_cells(
+            self.list_id,
+            [(row_number, COLUMN_LETTERS[column], value) for row_number, column, value in cells],
+            self.sheet_name
+        )
+        self.api_calls["sheets"] += 1
+
+    def _relocate(self, updates: List[RowUpdate]) -> List[RowUpdate]:
+        """`updates` pointed at the rows their contacts are in now"""
+        expected = {}
+        for update in updates:
+            index = update.row_number - 2
+            if 0 <= index < len(self.rows):
+                expected[update.row_number] = _cell(self.rows[index], 0).strip().lower()
+        if not expected:
+            return updates
+
+        current = read_cells(self.list_id, [f"A{row_number}" for row_number in expected], self.sheet_name)
+        self.api_calls["sheets"] += 1
+        if all(email.strip().lower() == expected[row_number] for row_number, email in zip(expected, current)):
+            return updates
+
+        # The snapshot is stale: re-read and follow each contact to its row
+        logger.warning("contact_snapshot_stale", list_id=self.list_id, rows=len(expected))
+        self.rows = None
+        self._by_email = None
+        self._load()
+        found = self.find_rows(expected.values())
+
+        relocated = []
+        for update in updates:
+            email = expected.get(update.row_number)
+            if email is None:
+                relocated.append(update)
+            elif email in found:
+                relocated.append(replace(update, row_number=found[email][0]))
+            else:
+                logger.warning("contact_row_gone", list_id=self.list_id, row=update.row_number, kind=update.kind)
+        return relocated
+
+    def _changed_cells(self, updates: Iterable[RowUpdate]) -> List[Tuple[int, int, object]]:
+        if self.rows is None:
+            today = datetime.utcnow().date()
+            return [
+                (update.row_number, column, value)
+                for update in updates
+                for column, value in cell_changes(update, today, self.cadence).items()
+            ]
+        return super()._changed_cells(updates)
+
+
+# ======================================================
+# LOCAL DATABASE (imported contacts)
+# ======================================================
+
+class LocalContactSource(BaseContactSource):
+    """The contacts table (see contact_store); updates are bulk SQL"""
+
+    def __init__(self, db: Session, user_id: int, cadence: Cadence = DEFAULT_CADENCE):
+        self.db = db
+        self.user_id = user_id
+        self.list_id = f"{LOCAL_LIST_PREFIX}{user_id}"
+        self.cadence = cadence
+
+    def read_batch(self, after_row: int, limit: int, due_only: bool = False, sent_only: bool = False) -> List[ContactRow]:
+        return contact_store.read_batch(self.db, self.user_id, after_row, limit, due_only, sent_only, self.cadence)
+
+    def find_rows(self, emails: Iterable[str]) -> Dict[str, ContactRow]:
+        # Indexed lookups instead of a scan
+        return contact_store.find_rows_by_email(self.db, self.user_id, emails)
+
+    def apply(self, updates: Iterable[RowUpdate]):
+        sent, bounced, replied = {}, {}, []
+        for update in updates:
+            if update.kind == SENT:
+                sent[update.row_number] = update.followup_count
+            elif update.kind == BOUNCED:
+                bounced[update.row_number] = update.error
+            elif update.kind == REPLIED:
+                replied.append(update.row_number)
+            else:
+                raise ValueError(f"Unknown row update: {update.kind}")
+
+        if sent or bounced or replied:
+            contact_store.apply_updates(
+                self.db, self.user_id, sent=sent, bounced=bounced, replied=replied, cadence=self.cadence
+            )
+
+
+# ======================================================
+# CSV FILE
+# ======================================================
+
+# One writer per file within this process; the flock below extends
+# that to the web app and the worker processes
+_file_locks: Dict[str, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: Path):
+    """
+    Exclusive lock on `path` across threads and processes, held for a
+    whole read-modify-write. The lock is taken on a sidecar
+    "<name>.lock" file, since the CSV itself is replaced on every write.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _file_locks_guard:
+        lock = _file_locks.setdefault(str(path), threading.Lock())
+
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        with open(f"{path}.lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _replace_file(path: Path, rows: Iterable[List[str]]) -> int:
+    """
+    Replace the file with HEADER plus `rows`, atomically (readers see
+    the old file or the new one, never half of it). The caller holds
+    file_lock(path).
+    """
+    written = 0
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as out:
+            writer = csv.writer(out)
+            writer.writerow(HEADER)
+            for row in rows:
+                writer.writerow(row)
+                written += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return written
+
+
+def write_contacts_file(path: Path, rows: Iterable[List[str]]) -> int:
+    """
+    Replace the file with HEADER plus `rows` under file_lock. Returns
+    the number of rows written.
+    """
+    path = Path(path)
+    with file_lock(path):
+        return _replace_file(path, rows)
+
+
+class FileContactSource(BaseContactSource):
+    """
+    A CSV in the sheet's layout (header in row 1, columns A-K). Reads
+    stream the file; apply() rewrites it once per batch of updates, so
+    callers should batch updates rather than mark rows one by one on
+    large files (the scheduler holds a pass's sent marks, see
+    hold_sent_marks). The read and the rewrite happen under one
+    file_lock, so the web app and the worker never undo each other's
+    writes.
+    """
+
+    def __init__(self, path: Path, list_id: str, cadence: Cadence = DEFAULT_CADENCE):
+        self.path = Path(path)
+        self.list_id = list_id
+        self.cadence = cadence
+
+    def iter_rows(self, start_row: int = 2, due_only: bool = False, sent_only: bool = False) -> Iterator[ContactRow]:
+        # Opened here so a missing file fails before iteration starts
+        handle = open(self.path, encoding="utf-8", newline="")
+        return self._stream(handle, start_row, due_only, sent_only)
+
+    def _stream(self, handle, start_row: int, due_only: bool, sent_only: bool) -> Iterator[ContactRow]:
+        today = date.today()
+        with handle:
+            reader = csv.reader(handle)
+            next(reader, None)  # header
+            for row_number, row in enumerate(reader, start=2):
+                if row_number >= start_row and _matches(row, due_only, sent_only, today, self.cadence):
+                    yield row_number, row
+
+    def read_batch(self, after_row: int, limit: int, due_only: bool = False, sent_only: bool = False) -> List[ContactRow]:
+        return list(islice(self.iter_rows(after_row + 1, due_only, sent_only), limit))
+
+    def apply(self, updates: Iterable[RowUpdate]):
+        today = datetime.utcnow().date()
+        changes: Dict[int, Dict[int, object]] = {}
+        for update in updates:
+            changes.setdefault(update.row_number, {}).update(cell_changes(update, today, self.cadence))
+        if not changes:
+            return
+
+        def patched():
+            for row_number, row in self.iter_rows():
+                if row_number in changes:
+                    _apply_to_row(row, changes[row_number])
+                yield row
+
+        with file_lock(self.path):
+            _replace_file(self.path, patched())
+
+
+# ======================================================
+# FACTORY
+# ======================================================
+
+def source_for_list(
+    db: Session,
+    user,
+    list_id: str,
+    api_calls: Optional[Counter] = None,
+    cadence: Optional[Cadence] = None
+) -> ContactSource:
+    """
+    The source behind a list id (as stored on send jobs), on `cadence`
+    (a campaign's) or else the user's cadence
+    """
+    cadence = cadence or cadence_for(user)
+    if list_id.startswith(LOCAL_LIST_PREFIX):
+        return LocalContactSource(db, user.id, cadence)
+    if list_id.startswith(FILE_LIST_PREFIX):
+        return FileContactSource(_file_list_path(user.id, list_id), list_id, cadence)
+    if list_id.startswith(MEMORY_LIST_PREFIX):
+        return _memory_sources[list_id]
+    return SheetsContactSource(list_id, api_calls, cadence=cadence)
+
+
+def get_contact_source(db: Session, user, api_calls: Optional[Counter] = None) -> Optional[ContactSource]:
+    """The user's current contact list, or None if they haven't set one up"""
+    list_id = contact_list_id(user)
+    if not list_id:
+        return None
+    return source_for_list(db, user, list_id, api_calls)
@@ -0,0 +1,243 @@
+# backend/services/contact_store.py
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import select, update, or_, func, case, bindparam
+from sqlalchemy.orm import Session
+
+from backend.config import CONTACT_BATCH_SIZE
+from backend.models.contact import Contact
+from backend.services.cadence import DEFAULT_CADENCE, Cadence
+from backend.utils.date_utils import format_date
+
+
+# ======================================================
+# READS (sheet-shaped rows)
+# ======================================================
+
+ROW_COLUMNS = (
+    Contact.row_number,
+    Contact.email,
+    Contact.name,
+    Contact.company,
+    Contact.status,
+    Contact.replied,
+    Contact.bounced,
+    Contact.followup_count,
+    Contact.last_sent_date,
+    Contact.next_send_date,
+    Contact.notes,
+    Contact.last_error,
+)
+
+
+def _flag(value) -> str:
+    return "TRUE" if value else "FALSE"
+
+
+def _day(value) -> str:
+    return format_date(value) if value else ""
+
+
+def to_row(contact) -> List[str]:
+    """Columns A-K as the Sheets API would return them"""
+    return [
+        contact.email,
+        contact.name or "",
+        contact.company or "",
+        contact.status or "",
+        _flag(contact.replied),
+        _flag(contact.bounced),
+        str(contact.followup_count or 0),
+        _day(contact.last_sent_date),
+        _day(contact.next_send_date),
+        contact.notes or "",
+        contact.last_error or "",
+    ]
+
+
+def read_batch(
+    db: Session,
+    user_id: int,
+    after_row: int,
+    limit: int = CONTACT_BATCH_SIZE,
+    due_only: bool = False,
+    sent_only: bool = False,
+    cadence: Cadence = DEFAULT_CADENCE
+) -> List[Tuple[int, List[str]]]:
+    """
+    Up to `limit` (row_number, row) pairs after `after_row`, in row
+    order. Keyset paging: no cursor stays open between batches, so
+    callers may commit in between.
+
+    due_only: rows the scheduler may send to today (contacts stop
+    after cadence.max_emails, same rule as the sheet).
+    sent_only: rows that were emailed and have no reply/bounce yet.
+    """
+    query = (
+        select(*ROW_COLUMNS)
+        .where(Contact.user_id == user_id, Contact.row_number > after_row)
+    )
+    if due_only:
+        query = query.where(
+            Contact.replied.is_(False),
+            Contact.bounced.is_(False),
+            Contact.followup_count < cadence.max_emails,
+            or_(Contact.next_send_date.is_(None), Contact.next_send_date <= date.today())
+        )
+    if sent_only:
+        query = query.where(
+            Contact.replied.is_(False),
+            Contact.bounced.is_(False),
+            Contact.followup_count > 0
+        )
+
+    batch = db.execute(query.order_by(Contact.row_number).limit(limit)).all()
+    return [(contact.row_number, to_row(contact)) for contact in batch]
+
+
+def find_rows_by_email(db: Session, user_id: int, emails: Iterable[str]) -> Dict[str, Tuple[int, List[str]]]:
+    """email (lower-case) -> (row_number, row) for the given addresses"""
+    emails = list({email.strip().lower() for email in emails if email})
+    if not emails:
+        return {}
+
+    result = db.execute(
+        select(*ROW_COLUMNS).where(Contact.user_id == user_id, Contact.email.in_(emails))
+    ).all()
+    return {contact.email: (contact.row_number, to_row(contact)) for contact in result}
+
+
+# ======================================================
+# WRITES
+# ======================================================
+
+def apply_updates(
+    db: Session,
+    user_id: int,
+    sent: Dict[int, int] = None,
+    bounced: Dict[int, str] = None,
+    replied: Iterable[int] = (),
+    cadence: Cadence = DEFAULT_CADENCE
+):
+    """
+    Bulk status update in one transaction.
+    sent: row_number -> new followup count; bounced: row_number -> error;
+    replied: row numbers. Same effect as the sheets_service helpers,
+    with statuses and next send dates from `cadence`.
+    """
+    now = datetime.utcnow()
+    today_date = now.date()
+
+    # Rows at the same followup step get identical values: one UPDATE each
+    by_step: Dict[int, List[int]] = {}
+    for row_number, followup_count in (sent or {}).items():
+        by_step.setdefault(followup_count, []).append(row_number)
+
+    steps = list(by_step)
+    next_sends = cadence.next_send_dates((followup_count, today_date) for followup_count in steps)
+    for followup_count, next_send in zip(steps, next_sends):
+        db.execute(
+            update(Contact)
+            .where(Contact.user_id == user_id, Contact.row_number.in_(by_step[followup_count]))
+            .values(
+                status=cadence.status(followup_count),
+                followup_count=followup_count,
+                last_sent_date=today_date,
+                next_send_date=next_send,
+                updated_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    if bounced:
+        db.execute(
+            update(Contact)
+            .where(Contact.user_id == user_id, Contact.row_number == bindparam("b_row_number"))
+            .values(bounced=True, last_error=bindparam("b_error"), updated_at=now)
+            .execution_options(synchronize_session=False),
+            [
+                {"b_row_number": row_number, "b_error": (error or "")[:1000]}
+                for row_number, error in bounced.items()
+            ]
+        )
+
+    replied = list(replied)
+    if replied:
+        db.execute(
+            update(Contact)
+            .where(Contact.user_id == user_id, Contact.row_number.in_(replied))
+            .values(replied=True, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    db.commit()
+
+
+def reschedule(db: Session, user_id: int, cadence: Cadence, batch_size: int = CONTACT_BATCH_SIZE) -> int:
+    """
+    Recompute status and next send date of every emailed contact from
+    its followup count and last send, after the user's cadence changed.
+    One bulk UPDATE (and commit) per batch. Returns the rows updated.
+    """
+    updated = 0
+    after_row = 0
+    while True:
+        batch = db.execute(
+            select(Contact.id, Contact.row_number, Contact.followup_count, Contact.last_sent_date)
+            .where(
+                Contact.user_id == user_id,
+                Contact.row_number > after_row,
+                Contact.followup_count > 0,
+                Contact.replied.is_(False),
+                Contact.bounced.is_(False)
+            )
+            .order_by(Contact.row_number)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+
+        next_sends = cadence.next_send_dates(
+            (contact.followup_count, contact.last_sent_date) for contact in batch
+        )
+        # ORM bulk UPDATE by primary key: one executemany
+        db.execute(
+            update(Contact),
+            [
+                {
+                    "id": contact.id,
+                    "status": cadence.status(contact.followup_count),
+                    "next_send_date": next_send,
+                }
+                for contact, next_send in zip(batch, next_sends)
+            ]
+        )
+        db.commit()
+
+        updated += len(batch)
+        after_row = batch[-1].row_number
+    return updated
+
+
+# ======================================================
+# SUMMARY
+# ======================================================
+
+def contact_counts(db: Session, user_id: int) -> Dict[str, int]:
+    row = db.execute(
+        select(
+            func.count(Contact.id),
+            func.sum(case((Contact.replied.is_(True), 1), else_=0)),
+            func.sum(case((Contact.bounced.is_(True), 1), else_=0)),
+            func.sum(case((Contact.followup_count > 0, 1), else_=0)),
+        ).where(Contact.user_id == user_id)
+    ).one()
+
+    return {
+        "total": row[0] or 0,
+        "replied": row[1] or 0,
+        "bounced": row[2] or 0,
+        "contacted": row[3] or 0,
+    }
@@ -0,0 +1,313 @@
+# backend/services/email_validation.py
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Protocol, Tuple
+
+from backend.config import (
+    EMAIL_VALIDATION_ENABLED,
+    MX_RESOLVER,
+    MX_STATIC_RECORDS,
+    MX_LOOKUP_TIMEOUT_SECONDS,
+    MX_CACHE_TTL_SECONDS,
+    MX_NEGATIVE_CACHE_TTL_SECONDS,
+    MX_CACHE_SIZE,
+    MX_CANARY_DOMAIN,
+    MX_BREAKER_FAILURES,
+    MX_BREAKER_COOLOFF_SECONDS,
+)
+from backend.services.metrics import INVALID_ADDRESSES
+from backend.services.structured_log import get_logger
+
+logger = get_logger("email_validation")
+
+# ======================================================
+# SYNTAX (RFC 5321 / 5322, dot-atom addresses)
+# ======================================================
+
+# Printable characters allowed unquoted in the local part, plus any
+# non-ASCII character (RFC 6531 internationalized addresses)
+_ATOM = r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~\x80-\U0010ffff-]+"
+_LOCAL_PART = re.compile(rf"^{_ATOM}(\.{_ATOM})*$")
+_QUOTED_LOCAL_PART = re.compile(r'^"([\x20\x21\x23-\x5b\x5d-\x7e]|\\[\x20-\x7e])*"$')
+_LABEL = re.compile(r"^[A-Za-z0-9]([A-Za-z0-9-]{0,61}[A-Za-z0-9])?$")
+
+
+def syntax_error(email: str) -> Optional[str]:
+    """Why `email` is not a deliverable address, or None if it parses"""
+    if not email or len(email) > 254:
+        return "bad length"
+
+    local, at, domain = email.rpartition("@")
+    if not at or not local or not domain:
+        return "missing @"
+
+    if len(local.encode("utf-8")) > 64:
+        return "local part too long"
+    if not (_LOCAL_PART.match(local) or _QUOTED_LOCAL_PART.match(local)):
+        return "bad local part"
+
+    try:
+        # Internationalized domains are checked in their ASCII form
+        ascii_domain = domain.encode("idna").decode("ascii")
+    except UnicodeError:
+        return "bad domain"
+
+    labels = ascii_domain.rstrip(".").split(".")
+    if len(ascii_domain) > 253 or len(labels) < 2:
+        return "bad domain"
+    if not all(_LABEL.match(label) for label in labels):
+        return "bad domain"
+    if labels[-1].isdigit():
+        return "bad domain"
+
+    return None
+
+
+def mail_domain(email: str) -> str:
+    return email.rpartition("@")[2].strip().lower().rstrip(".")
+
+
+# ======================================================
+# MX LOOKUP
+# ======================================================
+
+HAS_MAIL = "has_mail"    # MX records, or an A/AAAA record (implicit MX)
+NO_MAIL = "no_mail"      # domain doesn't exist, or publishes a null MX
+UNKNOWN = "unknown"      # lookup failed; never treated as invalid
+
+# Lookup failures are retried after this long
+_UNKNOWN_TTL_SECONDS = 300
+
+
+class MxResolver(Protocol):
+    def lookup(self, domain: str) -> str:
+        """HAS_MAIL, NO_MAIL or UNKNOWN"""
+        ...
+
+
+class DnsMxResolver:
+    """MX lookup over DNS (dnspython), falling back to A/AAAA per RFC 5321"""
+
+    def __init__(self, timeout_seconds: float):
+        self.timeout_seconds = timeout_seconds
+        self._resolver = None
+
+    def _get_resolver(self):
+        if self._resolver is None:
+            # Deferred: only the scheduler resolves domains
+            import dns.resolver
+
+            resolver = dns.resolver.Resolver()
+            resolver.lifetime = self.timeout_seconds
+            self._resolver = resolver
+        return self._resolver
+
+    def lookup(self, domain: str) -> str:
+        try:
+            import dns.exception
+            import dns.resolver
+        except ImportError:
+            return UNKNOWN
+
+        resolver = self._get_resolver()
+        try:
+            answer = resolver.resolve(domain, "MX")
+            exchanges = [record.exchange.to_text() for record in answer]
+            # RFC 7505 null MX: the domain accepts no mail
+            if exchanges == ["."]:
+                return NO_MAIL
+            return HAS_MAIL
+        except dns.resolver.NXDOMAIN:
+            return NO_MAIL
+        except dns.resolver.NoAnswer:
+            pass
+        except dns.exception.DNSException:
+            return UNKNOWN
+
+        for record_type in ("A", "AAAA"):
+            try:
+                resolver.resolve(domain, record_type)
+                return HAS_MAIL
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+                continue
+            except dns.exception.DNSException:
+                return UNKNOWN
+        return NO_MAIL
+
+
+class StaticMxResolver:
+    """
+    Local stand-in: answers from a fixed table, HAS_MAIL for anything
+    else. For tests and development without network access.
+    """
+
+    def __init__(self, records: Optional[Dict[str, str]] = None, default: str = HAS_MAIL):
+        self.records = {domain.lower(): result for domain, result in (records or {}).items()}
+        self.default = default
+
+    @classmethod
+    def from_config(cls, spec: str) -> "StaticMxResolver":
+        """ "bad.example=no_mail,flaky.example=unknown" """
+        records = {}
+        for item in spec.split(","):
+            domain, _, result = item.strip().partition("=")
+            if domain:
+                records[domain] = result.strip() or HAS_MAIL
+        return cls(records)
+
+    def lookup(self, domain: str) -> str:
+        return self.records.get(domain.lower(), self.default)
+
+
+# ======================================================
+# TTL CACHE
+# ======================================================
+
+class TtlCache:
+    """Bounded key -> value cache; each entry carries its own TTL"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str, ttl_seconds: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# ======================================================
+# VALIDATOR
+# ======================================================
+
+class EmailValidator:
+    """
+    Syntax check, then an MX check per domain. Domain results are
+    cached for every user. Only a definite answer invalidates an
+    address: lookup failures, or a resolver that can't even see
+    canary_domain, let the send go ahead as before.
+
+    After breaker_failures failed lookups in a row, lookups stop for
+    breaker_cooloff_seconds so a dead resolver can't add its timeout
+    to every row of a pass; uncached domains are UNKNOWN meanwhile.
+    """
+
+    def __init__(
+        self,
+        resolver: MxResolver,
+        cache: TtlCache,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        canary_domain: Optional[str] = None,
+        enabled: bool = True,
+        breaker_failures: int = 5,
+        breaker_cooloff_seconds: float = 300
+    ):
+        self.resolver = resolver
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.canary_domain = canary_domain
+        self.enabled = enabled
+        self.breaker_failures = breaker_failures
+        self.breaker_cooloff_seconds = breaker_cooloff_seconds
+        self._failures = 0
+        self._suspended_until = 0.0
+        self._breaker_lock = threading.Lock()
+
+    def _lookup(self, domain: str) -> str:
+        """resolver.lookup behind the circuit breaker"""
+        if time.monotonic() < self._suspended_until:
+            return UNKNOWN
+
+        result = self.resolver.lookup(domain)
+
+        with self._breaker_lock:
+            if result != UNKNOWN:
+                self._failures = 0
+                return result
+
+            self._failures += 1
+            if self.breaker_failures and self._failures >= self.breaker_failures:
+                self._failures = 0
+                self._suspended_until = time.monotonic() + self.breaker_cooloff_seconds
+                logger.warning("mx_lookups_suspended", domain=domain, seconds=self.breaker_cooloff_seconds)
+        return result
+
+    def _resolve(self, domain: str) -> str:
+        result = self.cache.get(domain)
+        if result is not None:
+            return result
+
+        result = self._lookup(domain)
+
+        # A resolver that answers "no mail" for a known-good domain is
+        # broken (e.g. no network), not telling us anything
+        if result == NO_MAIL and self.canary_domain and domain != self.canary_domain:
+            if self._resolve(self.canary_domain) != HAS_MAIL:
+                logger.warning("mx_resolver_unreliable", domain=domain, canary=self.canary_domain)
+                result = UNKNOWN
+
+        ttl = {
+            HAS_MAIL: self.ttl_seconds,
+            NO_MAIL: self.negative_ttl_seconds,
+        }.get(result, _UNKNOWN_TTL_SECONDS)
+        self.cache.put(domain, result, ttl)
+        return result
+
+    def validate(self, email: str) -> Optional[str]:
+        """Why `email` can't receive mail, or None if it may"""
+        if not self.enabled:
+            return None
+
+        email = (email or "").strip()
+        error = syntax_error(email)
+        if error:
+            INVALID_ADDRESSES.inc(reason="syntax")
+            return f"Invalid address: {error}"
+
+        if self._resolve(mail_domain(email)) == NO_MAIL:
+            INVALID_ADDRESSES.inc(reason="no_mail")
+            return "Invalid address: domain does not accept mail"
+
+        return None
+
+
+def build_resolver(kind: str) -> MxResolver:
+    if kind == "static":
+        return StaticMxResolver.from_config(MX_STATIC_RECORDS)
+    return DnsMxResolver(MX_LOOKUP_TIMEOUT_SECONDS)
+
+
+email_validator = EmailValidator(
+    build_resolver(MX_RESOLVER),
+    TtlCache(MX_CACHE_SIZE),
+    MX_CACHE_TTL_SECONDS,
+    MX_NEGATIVE_CACHE_TTL_SECONDS,
+    canary_domain=MX_CANARY_DOMAIN or None,
+    enabled=EMAIL_VALIDATION_ENABLED,
+    breaker_failures=MX_BREAKER_FAILURES,
+    breaker_cooloff_seconds=MX_BREAKER_COOLOFF_SECONDS,
+)
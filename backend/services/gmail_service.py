@@ -1,36 +1,50 @@
 import base64
-import os
-import re
+import time
+from collections import Counter
 from email.message import EmailMessage
-from typing import List, Dict
-from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Optional, Sequence
+from datetime import datetime, timedelta, timezone
 
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from google.oauth2.credentials import Credentials
 from sqlalchemy.orm import Session
 
-from backend.config import GMAIL_SCOPES
+from backend.config import BOUNCE_WINDOW_HOURS
 from backend.models.email_log import EmailLog
-from backend.services.sheets_service import (
-    read_all_rows,
-    mark_email_sent,  # ✅ Use the proper function
-    mark_bounced,
-    mark_replied,
+from backend.services.token_store import credential_cache
+from backend.services.bounce_parser import extract_bounced_recipients
+from backend.services.message_ledger import message_ledger, BOUNCE, REPLY
+from backend.services.metrics import (
+    EMAILS_SENT,
+    SEND_FAILURES,
+    BOUNCES,
+    REPLIES,
+    google_execute,
+    timed,
 )
+from backend.services.contact_sources import (
+    BOUNCED,
+    REPLIED,
+    ContactSource,
+    RowUpdate,
+    source_for_list,
+)
+from backend.services import suppression
+from backend.services.suppression import suppression_index
 
 # ======================================================
 # GMAIL SERVICE
 # ======================================================
 
-def get_gmail_service(token_path: str):
-    if not token_path or not os.path.exists(token_path):
+def get_gmail_service(user):
+    if not user.gmail_token_path:
         raise Exception("Gmail not connected for this user")
 
-    creds = Credentials.from_authorized_user_file(
-        token_path,
-        GMAIL_SCOPES
-    )
+    # Cached and refreshed ahead of expiry by the token store
+    creds = credential_cache.get(user.id)
+    if not creds:
+        raise Exception("Gmail not connected for this user")
+
+    # Deferred: googleapiclient is slow to import
+    from googleapiclient.discovery import build
 
     return build("gmail", "v1", credentials=creds)
 
@@ -39,6 +53,25 @@ def get_gmail_service(token_path: str):
 # SEND EMAIL
 # ======================================================
 
+BOUNCE_ERROR_KEYWORDS = [
+    "address not found",
+    "user unknown",
+    "does not exist",
+    "invalid recipient",
+    "recipient address rejected"
+]
+
+
+class PostSendError(Exception):
+    """Gmail accepted the email, but logging or the sheet update failed"""
+
+
+def is_bounce_error(error_msg: str) -> bool:
+    error_msg = error_msg.lower()
+    return any(keyword in error_msg for keyword in BOUNCE_ERROR_KEYWORDS)
+
+
+@timed("send_email")
 def send_email(
     db: Session,
     user,
@@ -47,15 +80,20 @@ def send_email(
     subject: str,
     body: str,
     row_number: int,
-    followup_count: int  # ✅ This should be the NEW count (already incremented in scheduler)
+    followup_count: int,  # ✅ This should be the NEW count (already incremented in scheduler)
+    contacts: Optional[ContactSource] = None
 ):
     """
     Send an email via Gmail API.
     
     Args:
         followup_count: The NEW followup count (1, 2, 3, 4, or 5) AFTER this email is sent
+        contacts: The list the row belongs to (a campaign's, on its
+            cadence); looked up from sheet_id if not given
     """
-    service = get_gmail_service(user.gmail_token_path)
+    from googleapiclient.errors import HttpError
+
+    service = get_gmail_service(user)
 
     message = EmailMessage()
     message["To"] = to_email
@@ -77,38 +115,22 @@ def send_email(
     ).decode()
 
     try:
-        response = service.users().messages().send(
+        response = google_execute(service.users().messages().send(
             userId="me",
             body={"raw": encoded_message}
-        ).execute()
-
-        # ✅ Update Google Sheet properly (includes Next_Send_Date calculation)
-        mark_email_sent(sheet_id, row_number, followup_count)
-
-        # ✅ Log to database
-        log = EmailLog(
-            user_id=user.id,
-            to_email=to_email,
-            status=f"FOLLOWUP_{followup_count}" if followup_count > 1 else "SENT",
-            sent_at=datetime.utcnow()
-        )
-        db.add(log)
-        db.commit()
-
-        return response.get("threadId")
+        ), "gmail")
 
     except HttpError as e:
         error_msg = str(e)
         
         # ✅ Check if it's a bounce error (invalid email)
-        if any(keyword in error_msg.lower() for keyword in [
-            "address not found",
-            "user unknown",
-            "does not exist",
-            "invalid recipient",
-            "recipient address rejected"
-        ]):
-            mark_bounced(sheet_id, row_number, error_msg)
+        if is_bounce_error(error_msg):
+            SEND_FAILURES.inc(reason="bounce")
+            BOUNCES.inc(source="send")
+            (contacts or source_for_list(db, user, sheet_id)).mark_bounced(row_number, error_msg)
+
+            # Nobody emails this address again
+            suppression_index.add(db, user.id, to_email, suppression.BOUNCED)
             
             log = EmailLog(
                 user_id=user.id,
@@ -119,19 +141,52 @@ def send_email(
             )
             db.add(log)
             db.commit()
+        else:
+            SEND_FAILURES.inc(reason="error")
         
         raise
 
+    EMAILS_SENT.inc(kind="followup" if followup_count > 1 else "initial")
+
+    # The email is out; failures from here on must not cause a resend
+    try:
+        # ✅ Log to database
+        log = EmailLog(
+            user_id=user.id,
+            to_email=to_email,
+            status=f"FOLLOWUP_{followup_count}" if followup_count > 1 else "SENT",
+            sent_at=datetime.utcnow()
+        )
+        db.add(log)
+        if followup_count == 1:
+            # Same address on another row won't get a second initial email
+            suppression_index.add(db, user.id, to_email, suppression.CONTACTED)
+        db.commit()
+
+        # ✅ Update the contact list properly (includes Next_Send_Date calculation)
+        (contacts or source_for_list(db, user, sheet_id)).mark_sent(row_number, followup_count)
+    except Exception as e:
+        db.rollback()
+        raise PostSendError(str(e)) from e
+
+    return response.get("threadId")
+
 
 # ======================================================
 # CHECK REPLIES (Run Once Daily)
 # ======================================================
 
+@timed("check_replies")
 def check_replies(
     db: Session,
     user,
-    sheet_id: str
-):
+    sheet_id: str,
+    start_row: int = 2,
+    deadline: Optional[float] = None,
+    on_checkpoint: Optional[Callable[[int], None]] = None,
+    checkpoint_every: int = 25,
+    api_calls: Optional[Counter] = None
+) -> Optional[int]:
     """
     Check for replies to ALL previously sent emails.
     Should be run once per day as a separate scheduled task.
@@ -141,11 +196,34 @@ def check_replies(
     2. Finds emails that were sent but haven't replied yet
     3. Checks their Gmail threads for replies
     4. Marks them as replied if found
+
+    Starts at sheet row `start_row`. If the time.monotonic() `deadline`
+    passes, stops and returns the next row to check; returns None once
+    the whole sheet is done. on_checkpoint(next_row) is called every
+    `checkpoint_every` rows. Gmail/Sheets calls are counted in api_calls.
     """
-    service = get_gmail_service(user.gmail_token_path)
-    rows = read_all_rows(sheet_id)
+    from googleapiclient.errors import HttpError
+
+    api_calls = api_calls if api_calls is not None else Counter()
+
+    service = get_gmail_service(user)
+    contacts = source_for_list(db, user, sheet_id, api_calls)
+    # Only contacts that were emailed and haven't answered or bounced
+    rows = contacts.iter_rows(start_row=start_row, sent_only=True)
+
+    checked = 0
+    for row_index, row in rows:
+        if row_index < start_row:
+            continue
+
+        if deadline is not None and time.monotonic() >= deadline:
+            return row_index
+
+        # Persist the cursor now and then so a crash loses little work
+        if on_checkpoint and checked and checked % checkpoint_every == 0:
+            on_checkpoint(row_index)
+        checked += 1
 
-    for row_index, row in enumerate(rows, start=2):
         if len(row) < 9:
             continue
 
@@ -166,10 +244,11 @@ def check_replies(
         # ✅ Search for emails sent to this address
         try:
             # Search for messages TO this email address
-            results = service.users().messages().list(
+            results = google_execute(service.users().messages().list(
                 userId="me",
                 q=f"to:{email}"
-            ).execute()
+            ), "gmail")
+            api_calls["gmail"] += 1
 
             messages = results.get("messages", [])
             if not messages:
@@ -179,18 +258,32 @@ def check_replies(
             latest_msg = messages[0]
             thread_id = latest_msg["threadId"]
 
-            # Get the full thread
-            thread = service.users().threads().get(
+            # Get the thread (only the From headers are needed)
+            thread = google_execute(service.users().threads().get(
                 userId="me",
-                id=thread_id
-            ).execute()
+                id=thread_id,
+                format="metadata",
+                metadataHeaders=["From"]
+            ), "gmail")
+            api_calls["gmail"] += 1
 
             thread_messages = thread.get("messages", [])
 
             # ✅ If thread has more than 1 message, there might be a reply
             if len(thread_messages) > 1:
+                # Replies already in the ledger were handled on an earlier run
+                new_ids = set(message_ledger.filter_new(
+                    db,
+                    user.id,
+                    REPLY,
+                    [msg["id"] for msg in thread_messages[1:]]
+                ))
+
                 # Check messages after the first one
                 for msg in thread_messages[1:]:
+                    if msg["id"] not in new_ids:
+                        continue
+
                     headers = msg.get("payload", {}).get("headers", [])
                     from_header = next(
                         (h["value"] for h in headers if h["name"].lower() == "from"),
@@ -199,7 +292,8 @@ def check_replies(
 
                     # ✅ If the reply is FROM the recipient (not from us)
                     if email.lower() in from_header.lower():
-                        mark_replied(sheet_id, row_index)
+                        contacts.apply([RowUpdate(row_index, REPLIED)])
+                        suppression_index.add(db, user.id, email, suppression.REPLIED)
 
                         db.add(
                             EmailLog(
@@ -209,92 +303,142 @@ def check_replies(
                                 sent_at=datetime.utcnow()
                             )
                         )
-                        db.commit()
+                        # Commits the REPLIED log with the ledger entry
+                        if message_ledger.commit_processed(db, user.id, REPLY, msg["id"]):
+                            REPLIES.inc()
                         break
 
         except HttpError as e:
             # If there's an error checking this email, just continue
             continue
 
+    return None
+
 
 # ======================================================
 # CHECK BOUNCES (Run Periodically)
 # ======================================================
 
+class IncompleteBounceCheck(Exception):
+    """Some bounce messages couldn't be fetched; the others were processed"""
+
+    def __init__(self, bounced_count: int, message_ids: List[str]):
+        super().__init__(f"{len(message_ids)} bounce message(s) could not be fetched")
+        self.bounced_count = bounced_count
+        self.message_ids = message_ids
+
+
+@timed("check_bounces")
 def check_bounces(
     db: Session,
     user,
-    sheet_id: str
-):
+    sheet_ids: Sequence[str],
+    api_calls: Optional[Counter] = None,
+    since: Optional[datetime] = None
+) -> int:
     """
-    Check for bounced emails from the last 24 hours.
+    Check for bounced emails received after `since` (naive UTC; default
+    BOUNCE_WINDOW_HOURS ago).
+    Returns the number of sheet rows newly marked as bounced.
     Bounces are usually delivered as mailer-daemon messages.
-    """
-    service = get_gmail_service(user.gmail_token_path)
 
-    # ✅ Only check bounces from the last 24 hours
-    yesterday = (datetime.utcnow() - timedelta(days=1)).strftime("%Y/%m/%d")
-    
-    try:
-        results = service.users().messages().list(
-            userId="me",
-            q=f"from:mailer-daemon OR subject:'Delivery Status Notification' after:{yesterday}"
-        ).execute()
-    except HttpError:
-        return
+    sheet_ids are the user's contact lists (one per campaign); an
+    address is marked in the first list it appears in.
 
-    rows = read_all_rows(sheet_id)
+    Each new bounce is parsed as a DSN (see bounce_parser). Messages in
+    the processed-message ledger are skipped without being fetched.
 
-    for msg in results.get("messages", []):
-        try:
-            message = service.users().messages().get(
-                userId="me",
-                id=msg["id"],
-                format="full"
-            ).execute()
-        except HttpError:
-            continue
+    Errors listing messages propagate. Messages that can't be fetched
+    are left for the next check, after the rest are processed, by
+    raising IncompleteBounceCheck.
+    """
+    from googleapiclient.errors import HttpError
 
-        payload = message.get("payload", {})
-        body = ""
+    api_calls = api_calls if api_calls is not None else Counter()
 
-        # ✅ Extract body from all parts
-        if "parts" in payload:
-            for part in payload.get("parts", []):
-                if part.get("mimeType") == "text/plain":
-                    data = part.get("body", {}).get("data")
-                    if data:
-                        body += base64.urlsafe_b64decode(data).decode(errors="ignore")
-        else:
-            # Single-part message
-            data = payload.get("body", {}).get("data")
-            if data:
-                body = base64.urlsafe_b64decode(data).decode(errors="ignore")
-
-        # ✅ Extract bounced email address from body
-        match = re.search(
-            r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-z]{2,})',
-            body
-        )
+    service = get_gmail_service(user)
 
-        if not match:
-            continue
+    # after: takes epoch seconds, so the window isn't rounded to a day
+    since = since or datetime.utcnow() - timedelta(hours=BOUNCE_WINDOW_HOURS)
+    after = int(since.replace(tzinfo=timezone.utc).timestamp())
 
-        bounced_email = match.group(1).lower()
+    results = google_execute(service.users().messages().list(
+        userId="me",
+        q=f"(from:mailer-daemon OR subject:'Delivery Status Notification') after:{after}"
+    ), "gmail")
+    api_calls["gmail"] += 1
 
-        # ✅ Find the bounced email in the sheet
-        for idx, row in enumerate(rows, start=2):
-            if row and len(row) > 0 and row[0].lower() == bounced_email:
-                mark_bounced(sheet_id, idx, "Mail bounced (mailer-daemon)")
+    new_ids = message_ledger.filter_new(
+        db,
+        user.id,
+        BOUNCE,
+        [msg["id"] for msg in results.get("messages", [])]
+    )
+    if not new_ids:
+        return 0
+
+    recipients_by_message = {}
+    failed_ids = []
+    for message_id in new_ids:
+        try:
+            recipients_by_message[message_id] = extract_bounced_recipients(service, message_id, api_calls)
+        except HttpError:
+            # Try again next run
+            failed_ids.append(message_id)
+
+    # One lookup per list for every bounced address: email -> (list, row, cells).
+    # A contact list is only read when there is something left to match.
+    emails = {r.email for recipients in recipients_by_message.values() for r in recipients}
+    row_by_email = {}
+    for sheet_id in sheet_ids:
+        if not emails:
+            break
+        contacts = source_for_list(db, user, sheet_id, api_calls)
+        for email, (idx, row) in contacts.find_rows(emails).items():
+            row_by_email[email] = (contacts, idx, row)
+        emails -= row_by_email.keys()
+
+    bounced_count = 0
+    for message_id, recipients in recipients_by_message.items():
+        updates = {}
+        for recipient in recipients:
+            match = row_by_email.get(recipient.email)
+            if not match:
+                continue
+
+            contacts, idx, row = match
+            bounced = row[5] if len(row) > 5 else ""
+            if bounced != "TRUE":
+                updates.setdefault(contacts, []).append(RowUpdate(idx, BOUNCED, error=recipient.describe()))
+                suppression_index.add(db, user.id, recipient.email, suppression.BOUNCED)
+                row.extend([""] * (6 - len(row)))
+                row[5] = "TRUE"
 
                 db.add(
                     EmailLog(
                         user_id=user.id,
-                        to_email=bounced_email,
+                        to_email=recipient.email,
                         status="BOUNCED",
-                        error="Mail bounced",
+                        error=recipient.describe(),
                         sent_at=datetime.utcnow()
                     )
                 )
-                db.commit()
-                break
\ No newline at end of file
+
+            # The regex fallback can't tell which address bounced: first match wins
+            if recipient.source == "regex":
+                break
+
+        # All of this message's rows in one write per list
+        marked = 0
+        for contacts, list_updates in updates.items():
+            contacts.apply(list_updates)
+            marked += len(list_updates)
+        bounced_count += marked
+
+        # Commits the BOUNCED logs with the ledger entry
+        if message_ledger.commit_processed(db, user.id, BOUNCE, message_id):
+            BOUNCES.inc(marked, source="dsn")
+
+    if failed_ids:
+        raise IncompleteBounceCheck(bounced_count, failed_ids)
+    return bounced_count
@@ -0,0 +1,129 @@
+# backend/services/message_ledger.py
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.config import PROCESSED_MESSAGE_TTL_DAYS
+from backend.models.processed_message import ProcessedMessage
+
+BOUNCE = "bounce"
+REPLY = "reply"
+
+
+def _compact(message_id: str):
+    """
+    Gmail ids are 16 hex digits: keep them as ints (8 bytes of payload
+    instead of a 16-char string). Anything else is kept as-is.
+    """
+    try:
+        return int(message_id, 16)
+    except (TypeError, ValueError):
+        return message_id
+
+
+# ======================================================
+# LEDGER
+# ======================================================
+
+class MessageLedger:
+    """
+    Per-user set of Gmail message ids that were already processed, so
+    bounce and reply handling never fetch, log or mark the same message
+    twice.
+
+    The processed_messages table is the source of truth (shared across
+    nodes). Known ids are remembered in memory until they expire, and
+    unknown ids are looked up in one query per batch.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._known: Dict[Tuple[int, str], Dict[object, float]] = {}
+        self._lock = threading.Lock()
+
+    def _remember(self, user_id: int, kind: str, message_ids: Iterable[str], expires_at: float):
+        with self._lock:
+            known = self._known.setdefault((user_id, kind), {})
+            for message_id in message_ids:
+                known[_compact(message_id)] = expires_at
+
+    def filter_new(self, db: Session, user_id: int, kind: str, message_ids: List[str]) -> List[str]:
+        """
+        The ids from message_ids that have not been processed yet.
+        """
+        now = time.time()
+        with self._lock:
+            known = self._known.get((user_id, kind), {})
+            unknown = [m for m in message_ids if known.get(_compact(m), 0) <= now]
+
+        if not unknown:
+            return []
+
+        # Possibly processed by another node, or before a restart
+        recorded = {
+            row.message_id for row in
+            db.query(ProcessedMessage.message_id).filter(
+                ProcessedMessage.user_id == user_id,
+                ProcessedMessage.kind == kind,
+                ProcessedMessage.message_id.in_(unknown),
+                ProcessedMessage.expires_at > datetime.utcnow()
+            ).all()
+        }
+        if recorded:
+            self._remember(user_id, kind, recorded, now + self.ttl_seconds)
+
+        return [m for m in unknown if m not in recorded]
+
+    def is_new(self, db: Session, user_id: int, kind: str, message_id: str) -> bool:
+        return bool(self.filter_new(db, user_id, kind, [message_id]))
+
+    def commit_processed(self, db: Session, user_id: int, kind: str, message_id: str) -> bool:
+        """
+        Commit the ledger row together with whatever the caller added to
+        the session (e.g. an EmailLog). If another node recorded the
+        message first, everything is rolled back and False is returned.
+        """
+        db.add(ProcessedMessage(
+            user_id=user_id,
+            kind=kind,
+            message_id=message_id,
+            processed_at=datetime.utcnow(),
+            expires_at=datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            committed = False
+        else:
+            committed = True
+
+        self._remember(user_id, kind, [message_id], time.time() + self.ttl_seconds)
+        return committed
+
+    def prune(self, db: Session) -> int:
+        """Delete expired ledger rows and forget expired in-memory ids"""
+        deleted = (
+            db.query(ProcessedMessage)
+            .filter(ProcessedMessage.expires_at <= datetime.utcnow())
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+
+        now = time.time()
+        with self._lock:
+            for key, known in list(self._known.items()):
+                for message_id in [m for m, expires_at in known.items() if expires_at <= now]:
+                    del known[message_id]
+                if not known:
+                    del self._known[key]
+
+        return deleted
+
+
+message_ledger = MessageLedger(PROCESSED_MESSAGE_TTL_DAYS * 24 * 3600)
@@ -0,0 +1,349 @@
+# backend/services/metrics.py
+
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from backend.config import METRICS_ENABLED, METRICS_TOKEN
+from backend.services.profiler import profiling_active, record_phase
+from backend.services.structured_log import get_logger
+
+logger = get_logger("metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800)
+ROW_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# ======================================================
+# REGISTRY
+# ======================================================
+
+class MetricsRegistry:
+    """
+    Minimal Prometheus-style registry (text exposition format 0.0.4).
+    When disabled, every update is a single attribute check.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._metrics: List["Metric"] = []
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "Metric"):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Called before every render to refresh scrape-time gauges"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                logger.error("metrics_collector_failed", error=str(e))
+
+        lines = []
+        for metric in list(self._metrics):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry(METRICS_ENABLED)
+
+
+# ======================================================
+# METRIC TYPES
+# ======================================================
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: MetricsRegistry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            for key, value in items
+        ]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def replace(self, values: Dict[Tuple[str, ...], float]):
+        """Swap in a full snapshot (drops label sets that disappeared)"""
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values = {tuple(str(v) for v in key): value for key, value in values.items()}
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(name, documentation, labelnames, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            # [per-bucket counts..., +Inf count, sum]
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+
+        lines = self._header()
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                le = 'le="' + _format_number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# ======================================================
+# METRICS
+# ======================================================
+
+EMAILS_SENT = Counter("outreach_emails_sent_total", "Emails accepted by Gmail", ["kind"])
+SEND_FAILURES = Counter("outreach_send_failures_total", "Emails Gmail refused", ["reason"])
+BOUNCES = Counter("outreach_bounces_total", "Bounced recipients recorded", ["source"])
+REPLIES = Counter("outreach_replies_total", "Replies detected")
+INVALID_ADDRESSES = Counter("outreach_invalid_addresses_total", "Addresses marked bounced before sending", ["reason"])
+SENDS_SUPPRESSED = Counter("outreach_sends_suppressed_total", "Sends skipped by the suppression index", ["reason"])
+
+GOOGLE_API_SECONDS = Histogram("outreach_google_api_seconds", "Gmail / Sheets API call latency", ["api", "method"])
+GOOGLE_API_ERRORS = Counter("outreach_google_api_errors_total", "Gmail / Sheets API calls that raised", ["api", "method"])
+FUNCTION_SECONDS = Histogram("outreach_function_seconds", "Time spent in instrumented hot-path functions", ["function"], buckets=DURATION_BUCKETS)
+SHEET_ROWS_READ = Histogram("outreach_sheet_rows_read", "Rows returned per sheet read", buckets=ROW_BUCKETS)
+
+DB_QUERY_SECONDS = Histogram("outreach_db_query_seconds", "SQL statement execution time")
+DB_SESSION_SECONDS = Histogram("outreach_db_session_seconds", "Lifetime of request DB sessions (get_db)", ["kind"])
+
+SCHEDULER_PASS_SECONDS = Histogram("outreach_scheduler_pass_seconds", "Duration of a full scheduler pass over all users", buckets=DURATION_BUCKETS)
+SEND_QUEUE_DEPTH = Gauge("outreach_send_queue_depth", "Send jobs per user and state (DONE excluded)", ["user_id", "status"])
+
+
+# ======================================================
+# INSTRUMENTATION HELPERS
+# ======================================================
+
+def timed(function_name: str):
+    """
+    Decorator recording the call's duration in FUNCTION_SECONDS.
+    Returns the function untouched when metrics are disabled.
+    """
+    def decorator(func):
+        if not REGISTRY.enabled:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                FUNCTION_SECONDS.observe(time.perf_counter() - started, function=function_name)
+
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def _tracked(histogram: Histogram, labels: dict):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+
+
+def track(histogram: Histogram, **labels):
+    """Context manager timing a block into `histogram`"""
+    if not REGISTRY.enabled:
+        return nullcontext()
+    return _tracked(histogram, labels)
+
+
+def google_execute(request, api: str):
+    """
+    request.execute() for a googleapiclient request, timed by method
+    (e.g. gmail.users.messages.send). The time also counts towards the
+    api's phase when a pass is being profiled.
+    """
+    if not REGISTRY.enabled and not profiling_active():
+        return request.execute()
+
+    method = getattr(request, "methodId", None) or "unknown"
+    started = time.perf_counter()
+    try:
+        return request.execute()
+    except Exception:
+        GOOGLE_API_ERRORS.inc(api=api, method=method)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        GOOGLE_API_SECONDS.observe(elapsed, api=api, method=method)
+        record_phase(api, elapsed)
+
+
+def instrument_engine(engine):
+    """Time every statement run on a SQLAlchemy engine"""
+    if not REGISTRY.enabled:
+        return
+
+    from sqlalchemy import event
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started)
+
+    def handle_error(exception_context):
+        # after_cursor_execute doesn't fire for failed statements
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+
+
+_database_instrumented = False
+
+
+def instrument_database():
+    """
+    Statement and request-session timings for the app's engines. Called
+    once at process startup (web app and worker), not on import.
+    """
+    global _database_instrumented
+    if not REGISTRY.enabled or _database_instrumented:
+        return
+    _database_instrumented = True
+
+    from backend.db import database
+
+    instrument_engine(database.engine)
+    instrument_engine(database.async_engine.sync_engine)
+    database.session_timer = lambda kind: track(DB_SESSION_SECONDS, kind=kind)
+
+
+# ======================================================
+# STANDALONE EXPORTER (worker process)
+# ======================================================
+
+def start_metrics_server(port: int):
+    """
+    Serve /metrics from a daemon thread, for processes without FastAPI.
+    Same rules as the web endpoint: never served without METRICS_TOKEN,
+    which scrapers send as a bearer token.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            # Never served anonymously: per-user queue depths would be public
+            if not METRICS_TOKEN:
+                self.send_error(403, "METRICS_TOKEN not configured")
+                return
+            supplied = self.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+            if not hmac.compare_digest(supplied, METRICS_TOKEN):
+                self.send_error(401)
+                return
+
+            body = REGISTRY.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
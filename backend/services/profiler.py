@@ -0,0 +1,350 @@
+# backend/services/profiler.py
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+from backend.config import (
+    PROFILING_ENABLED,
+    PROFILING_RUNTIME_SWITCH,
+    PROFILE_SAMPLE_INTERVAL_MS,
+    PROFILE_TOP_N,
+    PROFILE_HISTORY,
+)
+from backend.services.structured_log import get_logger
+
+# DB is imported lazily below: backend.db.database imports this module
+
+logger = get_logger("profiler")
+
+PROFILING_FLAG = "profiling"
+FLAG_CACHE_SECONDS = 15
+MAX_STACK_DEPTH = 200
+
+
+# ======================================================
+# ON / OFF SWITCH
+# ======================================================
+
+class ProfilingSwitch:
+    """
+    PROFILING_ENABLED from the environment, or the runtime flag set by
+    the admin API (shared through the DB, re-read every 15 seconds so
+    worker processes pick it up without a restart). Without the runtime
+    switch the flag is never read.
+    """
+
+    def __init__(self, env_enabled: bool, runtime_switch: bool):
+        self.env_enabled = env_enabled
+        self.runtime_switch = runtime_switch
+        self._cached: Optional[bool] = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_enabled(self) -> bool:
+        if self.env_enabled:
+            return True
+        if not self.runtime_switch:
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            if self._cached is not None and now - self._cached_at < FLAG_CACHE_SECONDS:
+                return self._cached
+
+        enabled = self._read_flag()
+        with self._lock:
+            self._cached, self._cached_at = enabled, now
+        return enabled
+
+    def _read_flag(self) -> bool:
+        from backend.db.database import SessionLocal
+        from backend.models.profiling import RuntimeFlag
+
+        db = SessionLocal()
+        try:
+            flag = db.get(RuntimeFlag, PROFILING_FLAG)
+            return bool(flag and flag.value == "on")
+        except Exception:
+            # Table missing / DB down: never let profiling break a pass
+            return False
+        finally:
+            db.close()
+
+    def set(self, db, enabled: bool):
+        from backend.models.profiling import RuntimeFlag
+
+        db.merge(RuntimeFlag(
+            name=PROFILING_FLAG,
+            value="on" if enabled else "off",
+            updated_at=datetime.utcnow()
+        ))
+        db.commit()
+        with self._lock:
+            self._cached, self._cached_at = enabled, time.monotonic()
+
+
+profiling_switch = ProfilingSwitch(PROFILING_ENABLED, PROFILING_RUNTIME_SWITCH)
+
+
+# ======================================================
+# PROFILE SESSION
+# ======================================================
+
+class ProfileSession:
+    """
+    One profiled pass: wall time per phase (gmail, sheets, db, render)
+    plus stack samples from the calling thread and, optionally, worker
+    threads whose name starts with thread_prefix.
+    """
+
+    def __init__(self, kind: str, label: Optional[str], thread_prefix: Optional[str] = None):
+        self.kind = kind
+        self.label = label
+        self.thread_prefix = thread_prefix
+        self.owner_ident = threading.get_ident()
+        self.started_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = Counter()
+        self.self_samples: Counter = Counter()
+        self.total_samples: Counter = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def covers(self, thread: threading.Thread) -> bool:
+        if thread.ident == self.owner_ident:
+            return True
+        return bool(self.thread_prefix) and thread.name.startswith(self.thread_prefix)
+
+    def add_phase(self, name: str, seconds: float):
+        with self._lock:
+            self.phases[name] += seconds
+
+    def add_sample(self, frame):
+        seen = set()
+        leaf = None
+        depth = 0
+        while frame is not None and depth < MAX_STACK_DEPTH:
+            code = frame.f_code
+            key = (code.co_name, code.co_filename, code.co_firstlineno)
+            if leaf is None:
+                leaf = key
+            seen.add(key)
+            frame = frame.f_back
+            depth += 1
+
+        with self._lock:
+            self.samples += 1
+            if leaf:
+                self.self_samples[leaf] += 1
+            for key in seen:
+                self.total_samples[key] += 1
+
+    def summary(self, interval: float, top_n: int) -> dict:
+        wall = time.perf_counter() - self.started
+
+        def describe(key, count):
+            name, filename, line = key
+            return {
+                "function": name,
+                "location": f"{os.path.relpath(filename) if filename.startswith(os.getcwd()) else filename}:{line}",
+                "self_seconds": round(count * interval, 4),
+                "total_seconds": round(self.total_samples[key] * interval, 4),
+            }
+
+        phases = {name: round(seconds, 4) for name, seconds in self.phases.items()}
+        # Single-threaded passes: what the named phases don't explain
+        if not self.thread_prefix:
+            phases["other"] = round(max(wall - sum(self.phases.values()), 0.0), 4)
+
+        return {
+            "wall_seconds": round(wall, 4),
+            "samples": self.samples,
+            "sample_interval_ms": round(interval * 1000, 2),
+            "phases": phases,
+            "top_functions": [
+                describe(key, count)
+                for key, count in self.self_samples.most_common(top_n)
+            ],
+            "top_cumulative": [
+                describe(key, self.self_samples[key])
+                for key, _ in self.total_samples.most_common(top_n)
+            ],
+        }
+
+
+_active_sessions: List[ProfileSession] = []
+_active_lock = threading.Lock()
+
+
+def _sessions_for_current_thread() -> List[ProfileSession]:
+    thread = threading.current_thread()
+    return [s for s in list(_active_sessions) if s.covers(thread)]
+
+
+def profiling_active() -> bool:
+    """Some pass is being profiled right now (cheap: no lock, no DB)"""
+    return bool(_active_sessions)
+
+
+def record_phase(name: str, seconds: float):
+    """Attribute wall time to a phase of whatever pass is being profiled"""
+    if not _active_sessions:
+        return
+    for session in _sessions_for_current_thread():
+        session.add_phase(name, seconds)
+
+
+@contextmanager
+def profile_phase(name: str):
+    if not _active_sessions:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+# ======================================================
+# SAMPLER
+# ======================================================
+
+class StackSampler:
+    """
+    Samples the stacks of the threads a session covers every `interval`
+    seconds from a daemon thread. Cost is per sample, not per call, so
+    it stays low on call-heavy code.
+    """
+
+    def __init__(self, session: ProfileSession, interval: float):
+        self.session = session
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            threads = {t.ident: t for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                thread = threads.get(ident)
+                if thread and self.session.covers(thread):
+                    self.session.add_sample(frame)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join(timeout=1)
+
+
+# ======================================================
+# STORAGE
+# ======================================================
+
+def save_profile(session: ProfileSession, summary: dict):
+    from backend.db.database import SessionLocal
+    from backend.models.profiling import PassProfile
+    from backend.workers.leasing import lease_manager
+
+    db = SessionLocal()
+    try:
+        db.add(PassProfile(
+            kind=session.kind,
+            label=session.label,
+            node=lease_manager.owner,
+            started_at=session.started_at,
+            wall_seconds=summary["wall_seconds"],
+            data=json.dumps(summary)
+        ))
+        db.commit()
+
+        # Keep the newest PROFILE_HISTORY profiles
+        cutoff = (
+            db.query(PassProfile.id)
+            .order_by(PassProfile.id.desc())
+            .offset(PROFILE_HISTORY)
+            .limit(1)
+            .scalar()
+        )
+        if cutoff is not None:
+            db.query(PassProfile).filter(PassProfile.id <= cutoff).delete(synchronize_session=False)
+            db.commit()
+    except Exception as e:
+        logger.error("profile_save_failed", kind=session.kind, error=str(e))
+    finally:
+        db.close()
+
+
+# ======================================================
+# DECORATOR
+# ======================================================
+
+def profiled(kind: str, label: Optional[Callable[..., object]] = None, thread_prefix: Optional[str] = None):
+    """
+    Profile every call while profiling is switched on; otherwise call
+    straight through. label(*args, **kwargs) names the profile.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiling_switch.is_enabled():
+                return func(*args, **kwargs)
+
+            session = ProfileSession(
+                kind,
+                str(label(*args, **kwargs)) if label else None,
+                thread_prefix
+            )
+            interval = PROFILE_SAMPLE_INTERVAL_MS / 1000
+            sampler = StackSampler(session, interval)
+
+            with _active_lock:
+                _active_sessions.append(session)
+            sampler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sampler.stop()
+                with _active_lock:
+                    _active_sessions.remove(session)
+                save_profile(session, session.summary(interval, PROFILE_TOP_N))
+
+        return wrapper
+    return decorator
+
+
+# ======================================================
+# DB PHASE
+# ======================================================
+
+def instrument_engine(engine):
+    """Count statement time towards the "db" phase of profiled passes"""
+    from sqlalchemy import event
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _active_sessions:
+            conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("profile_started")
+        if started:
+            record_phase("db", time.perf_counter() - started.pop())
+
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("profile_started"):
+            connection.info["profile_started"].pop()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
@@ -0,0 +1,306 @@
+# backend/services/send_queue.py
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, inspect, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.config import (
+    SEND_JOB_MAX_ATTEMPTS,
+    SEND_JOB_CLAIM_TTL_SECONDS,
+    SEND_JOB_RETRY_BACKOFF_SECONDS,
+)
+from backend.db.database import SessionLocal
+from backend.models.send_job import SendJob
+from backend.services.metrics import REGISTRY, SEND_QUEUE_DEPTH
+
+# ======================================================
+# JOB STATES
+# ======================================================
+
+PENDING = "PENDING"    # waiting to be claimed
+CLAIMED = "CLAIMED"    # pulled by a worker, not attempted yet
+SENDING = "SENDING"    # Gmail call in flight - may or may not have gone out
+DONE = "DONE"          # sent (acked)
+DEAD = "DEAD"          # dead-lettered, never retried automatically
+
+
+def make_idempotency_key(sheet_id: str, row_number: int, followup_count: int, to_email: str) -> str:
+    """
+    One key per (sheet row, followup step). The address is hashed in so
+    rows shifted by edits to the sheet don't collide with old jobs.
+    """
+    email_hash = hashlib.sha1(to_email.strip().lower().encode()).hexdigest()[:12]
+    return f"{sheet_id}:{row_number}:{followup_count}:{email_hash}"
+
+
+# ======================================================
+# QUEUE
+# ======================================================
+
+class SendQueue:
+    """
+    DB-backed send queue. Jobs are pulled in batches, acked on success
+    and dead-lettered after max_attempts failures.
+
+    A job interrupted while SENDING is dead-lettered instead of retried:
+    the email may already have gone out, and a missed follow-up is
+    cheaper than a duplicate one.
+    """
+
+    def __init__(self, max_attempts: int, claim_ttl_seconds: int, retry_backoff_seconds: int):
+        self.max_attempts = max_attempts
+        self.claim_ttl = timedelta(seconds=claim_ttl_seconds)
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+    # ---------------- producer
+
+    def enqueue(
+        self,
+        db: Session,
+        user_id: int,
+        sheet_id: str,
+        row_number: int,
+        to_email: str,
+        followup_count: int,
+        name: Optional[str] = None,
+        company: Optional[str] = None,
+        campaign_id: Optional[int] = None,
+    ) -> SendJob:
+        """
+        Insert the job unless its idempotency key exists.
+        Returns the new or existing job.
+        """
+        key = make_idempotency_key(sheet_id, row_number, followup_count, to_email)
+
+        existing = db.query(SendJob).filter(SendJob.idempotency_key == key).first()
+        if existing:
+            return existing
+
+        job = SendJob(
+            user_id=user_id,
+            campaign_id=campaign_id,
+            sheet_id=sheet_id,
+            row_number=row_number,
+            to_email=to_email,
+            name=name,
+            company=company,
+            followup_count=followup_count,
+            idempotency_key=key,
+            status=PENDING,
+            attempts=0,
+            available_at=datetime.utcnow(),
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Enqueued concurrently by another worker
+            db.rollback()
+            return db.query(SendJob).filter(SendJob.idempotency_key == key).one()
+
+        return job
+
+    def statuses(self, db: Session, keys: List[str]) -> Dict[str, str]:
+        """idempotency_key -> status for the keys that already have a job"""
+        if not keys:
+            return {}
+        rows = (
+            db.query(SendJob.idempotency_key, SendJob.status)
+            .filter(SendJob.idempotency_key.in_(keys))
+            .all()
+        )
+        return {key: status for key, status in rows}
+
+    # ---------------- consumer
+
+    def claim_batch(self, db: Session, user_id: int, owner: str, limit: int) -> List[SendJob]:
+        """
+        Pull up to `limit` due jobs for a user (SKIP LOCKED on Postgres).
+        """
+        if limit <= 0:
+            return []
+
+        now = datetime.utcnow()
+        jobs = (
+            db.query(SendJob)
+            .filter(
+                SendJob.user_id == user_id,
+                SendJob.status == PENDING,
+                SendJob.available_at <= now
+            )
+            .order_by(SendJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for job in jobs:
+            job.status = CLAIMED
+            job.locked_by = owner
+            job.locked_until = now + self.claim_ttl
+
+        db.commit()
+        return jobs
+
+    def mark_sending(self, db: Session, job: SendJob):
+        """Committed right before the Gmail call"""
+        job.status = SENDING
+        job.attempts += 1
+        job.locked_until = datetime.utcnow() + self.claim_ttl
+        db.commit()
+
+    def ack(self, db: Session, job: SendJob):
+        job.status = DONE
+        job.completed_at = datetime.utcnow()
+        job.locked_by = None
+        job.locked_until = None
+        job.last_error = None
+        db.commit()
+
+    def fail(self, db: Session, job: SendJob, error: str, permanent: bool = False):
+        """
+        Retry with exponential backoff, or dead-letter once attempts run out
+        (or straight away for permanent errors such as bounces).
+        """
+        now = datetime.utcnow()
+        job.last_error = (error or "")[:500]
+        job.locked_by = None
+        job.locked_until = None
+
+        if permanent or job.attempts >= self.max_attempts:
+            job.status = DEAD
+            job.permanent = permanent
+            job.completed_at = now
+        else:
+            backoff = self.retry_backoff_seconds * (2 ** max(job.attempts - 1, 0))
+            job.status = PENDING
+            job.available_at = now + timedelta(seconds=backoff)
+
+        db.commit()
+
+    def defer(self, db: Session, job: SendJob, until: datetime):
+        """Put a claimed job back untried, not to be claimed before `until`"""
+        job.status = PENDING
+        job.available_at = until
+        job.locked_by = None
+        job.locked_until = None
+        db.commit()
+
+    def drop(self, db: Session, job: SendJob):
+        """
+        Remove a claimed job that was never sent. Its row is queued
+        again the next time it is due for an active campaign.
+        """
+        db.delete(job)
+        db.commit()
+
+    def release(self, db: Session, jobs: List[SendJob]):
+        """Return claimed-but-unattempted jobs to the queue"""
+        released = False
+        for job in jobs:
+            if inspect(job).was_deleted:
+                continue
+            if job.status == CLAIMED:
+                job.status = PENDING
+                job.locked_by = None
+                job.locked_until = None
+                released = True
+        if released:
+            db.commit()
+
+    def recover_stale(self, db: Session, user_id: int, owner: str) -> int:
+        """
+        Clean up after a crashed worker: CLAIMED jobs go back to PENDING,
+        SENDING jobs are dead-lettered (they may already have been sent).
+        Only jobs whose lock expired or belongs to another node are touched.
+        """
+        now = datetime.utcnow()
+        stale = (
+            db.query(SendJob)
+            .filter(
+                SendJob.user_id == user_id,
+                SendJob.status.in_([CLAIMED, SENDING]),
+                or_(SendJob.locked_until < now, SendJob.locked_by != owner)
+            )
+            .all()
+        )
+
+        for job in stale:
+            if job.status == CLAIMED:
+                job.status = PENDING
+            else:
+                job.status = DEAD
+                job.permanent = True
+                job.completed_at = now
+                job.last_error = "Interrupted during send; not retried to avoid a duplicate"
+            job.locked_by = None
+            job.locked_until = None
+
+        if stale:
+            db.commit()
+        return len(stale)
+
+    def requeue_dead(self, db: Session, user_id: Optional[int] = None) -> int:
+        """
+        Give dead-lettered jobs that only ran out of attempts (e.g. a
+        Gmail outage) a fresh set of attempts. Permanent failures, and
+        jobs dead-lettered before this was recorded, stay DEAD.
+        """
+        query = db.query(SendJob).filter(SendJob.status == DEAD, SendJob.permanent.is_(False))
+        if user_id is not None:
+            query = query.filter(SendJob.user_id == user_id)
+
+        requeued = query.update(
+            {
+                SendJob.status: PENDING,
+                SendJob.permanent: None,
+                SendJob.attempts: 0,
+                SendJob.available_at: datetime.utcnow(),
+                SendJob.completed_at: None,
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        return requeued
+
+    # ---------------- introspection
+
+    def depth(self, db: Session, user_id: Optional[int] = None) -> Dict[str, int]:
+        query = db.query(SendJob.status, func.count(SendJob.id))
+        if user_id is not None:
+            query = query.filter(SendJob.user_id == user_id)
+        return {status: count for status, count in query.group_by(SendJob.status).all()}
+
+    def depth_by_user(self, db: Session) -> Dict[tuple, int]:
+        """(user_id, status) -> jobs, for every state except DONE"""
+        rows = (
+            db.query(SendJob.user_id, SendJob.status, func.count(SendJob.id))
+            .filter(SendJob.status != DONE)
+            .group_by(SendJob.user_id, SendJob.status)
+            .all()
+        )
+        return {(user_id, status): count for user_id, status, count in rows}
+
+
+send_queue = SendQueue(
+    SEND_JOB_MAX_ATTEMPTS,
+    SEND_JOB_CLAIM_TTL_SECONDS,
+    SEND_JOB_RETRY_BACKOFF_SECONDS
+)
+
+
+def collect_queue_depth():
+    """Scrape-time refresh of the per-user queue depth gauge"""
+    db = SessionLocal()
+    try:
+        SEND_QUEUE_DEPTH.replace(send_queue.depth_by_user(db))
+    finally:
+        db.close()
+
+
+if REGISTRY.enabled:
+    REGISTRY.add_collector(collect_queue_depth)
@@ -1,12 +1,11 @@
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from datetime import datetime
-from typing import List
+from typing import Iterable, List, Sequence, Tuple
 
 from backend.config import (
     SHEETS_SERVICE_ACCOUNT_FILE,
     DEFAULT_SHEET_NAME
 )
+from backend.services.metrics import SHEET_ROWS_READ, google_execute, timed
 from backend.utils.date_utils import (
     calculate_next_send_date,
     get_status_from_followup_count,
@@ -25,6 +24,10 @@ SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 # ======================================================
 
 def get_sheets_service():
+    # Deferred: Google client libraries are slow to import
+    from google.oauth2.service_account import Credentials
+    from googleapiclient.discovery import build
+
     creds = Credentials.from_service_account_file(
         SHEETS_SERVICE_ACCOUNT_FILE,
         scopes=SCOPES
@@ -36,23 +39,55 @@ def get_sheets_service():
 # READ OPERATIONS
 # ======================================================
 
+@timed("read_all_rows")
 def read_all_rows(sheet_id: str, sheet_name: str = DEFAULT_SHEET_NAME) -> List[list]:
     """
     Reads all data rows (excluding header)
     """
     service = get_sheets_service()
-    result = service.spreadsheets().values().get(
-        spreadsheetId=sheet_id,
-        range=f"{sheet_name}!A2:Z"
-    ).execute()
+    result = google_execute(
+        service.spreadsheets().values().get(
+            spreadsheetId=sheet_id,
+            range=f"{sheet_name}!A2:Z"
+        ),
+        "sheets"
+    )
+
+    rows = result.get("values", [])
+    SHEET_ROWS_READ.observe(len(rows))
+    return rows
 
-    return result.get("values", [])
+
+@timed("read_cells")
+def read_cells(sheet_id: str, cells: Sequence[str], sheet_name: str = DEFAULT_SHEET_NAME) -> List[str]:
+    """
+    Values of single cells (e.g. "A12") in one values.batchGet call,
+    in the order given; "" for empty cells.
+    """
+    if not cells:
+        return []
+
+    service = get_sheets_service()
+    result = google_execute(
+        service.spreadsheets().values().batchGet(
+            spreadsheetId=sheet_id,
+            ranges=[f"{sheet_name}!{cell}" for cell in cells]
+        ),
+        "sheets"
+    )
+
+    values = []
+    for value_range in result.get("valueRanges", []):
+        rows = value_range.get("values") or [[]]
+        values.append(str(rows[0][0]) if rows[0] else "")
+    return values
 
 
 # ======================================================
 # WRITE OPERATIONS
 # ======================================================
 
+@timed("update_cell")
 def update_cell(
     sheet_id: str,
     row_number: int,
@@ -61,12 +96,42 @@ def update_cell(
     sheet_name: str = DEFAULT_SHEET_NAME
 ):
     service = get_sheets_service()
-    service.spreadsheets().values().update(
-        spreadsheetId=sheet_id,
-        range=f"{sheet_name}!{column_letter}{row_number}",
-        valueInputOption="RAW",
-        body={"values": [[value]]}
-    ).execute()
+    google_execute(
+        service.spreadsheets().values().update(
+            spreadsheetId=sheet_id,
+            range=f"{sheet_name}!{column_letter}{row_number}",
+            valueInputOption="RAW",
+            body={"values": [[value]]}
+        ),
+        "sheets"
+    )
+
+
+@timed("update_cells")
+def update_cells(
+    sheet_id: str,
+    cells: Iterable[Tuple[int, str, object]],
+    sheet_name: str = DEFAULT_SHEET_NAME
+):
+    """
+    Write many (row_number, column_letter, value) cells in one
+    values.batchUpdate call.
+    """
+    data = [
+        {"range": f"{sheet_name}!{column_letter}{row_number}", "values": [[value]]}
+        for row_number, column_letter, value in cells
+    ]
+    if not data:
+        return
+
+    service = get_sheets_service()
+    google_execute(
+        service.spreadsheets().values().batchUpdate(
+            spreadsheetId=sheet_id,
+            body={"valueInputOption": "RAW", "data": data}
+        ),
+        "sheets"
+    )
 
 
 # ======================================================
@@ -97,11 +162,13 @@ def mark_email_sent(
     # Get appropriate status
     status = get_status_from_followup_count(new_followup_count)
     
-    # Update all columns
-    update_cell(sheet_id, row_number, "D", status, sheet_name)              # Status
-    update_cell(sheet_id, row_number, "G", new_followup_count, sheet_name)  # Followup_Count
-    update_cell(sheet_id, row_number, "H", today_str, sheet_name)           # Last_Sent_Date
-    update_cell(sheet_id, row_number, "I", next_send_date, sheet_name)      # Next_Send_Date ✅ CRITICAL!
+    # Update all columns (one API call)
+    update_cells(sheet_id, [
+        (row_number, "D", status),              # Status
+        (row_number, "G", new_followup_count),  # Followup_Count
+        (row_number, "H", today_str),           # Last_Sent_Date
+        (row_number, "I", next_send_date),      # Next_Send_Date ✅ CRITICAL!
+    ], sheet_name)
 
 
 def mark_bounced(
@@ -110,8 +177,10 @@ def mark_bounced(
     error_msg: str,
     sheet_name: str = DEFAULT_SHEET_NAME
 ):
-    update_cell(sheet_id, row_number, "F", "TRUE", sheet_name)          # Bounce
-    update_cell(sheet_id, row_number, "K", error_msg, sheet_name)       # Last_Error
+    update_cells(sheet_id, [
+        (row_number, "F", "TRUE"),          # Bounce
+        (row_number, "K", error_msg),       # Last_Error
+    ], sheet_name)
 
 
 def mark_replied(
@@ -0,0 +1,284 @@
+# backend/services/structured_log.py
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from backend.config import (
+    LOG_LEVEL,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLE_WINDOW_SECONDS,
+    LOG_SAMPLE_BURST,
+)
+
+ROOT_LOGGER = "outreach"
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+# Fields bound for the current pass / user / row
+_context: ContextVar[Dict[str, object]] = ContextVar("log_context", default={})
+
+
+# ======================================================
+# CORRELATION CONTEXT
+# ======================================================
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Bind fields (pass_id, user_id, sheet_id, row, followup_count, ...)
+    to every line logged inside the block, in this thread.
+    """
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def with_log_context(func):
+    """
+    Carry the caller's log context into another thread (e.g. a
+    ThreadPoolExecutor task), which would otherwise start empty.
+    """
+    fields = _context.get()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with log_context(**fields):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+# ======================================================
+# JSON FORMAT
+# ======================================================
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "context", None) or {})
+        entry.update(getattr(record, "fields", None) or {})
+
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if getattr(record, "dropped", 0):
+            entry["dropped"] = record.dropped
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+
+        return json.dumps(entry, default=str)
+
+
+# ======================================================
+# SAMPLING
+# ======================================================
+
+class ContextFilter(logging.Filter):
+    """Attach the fields bound in the calling thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = _context.get()
+        return True
+
+
+class RepeatSampler(logging.Filter):
+    """
+    Lets through the first `burst` warnings/errors per event and sheet
+    (or user) in each window and drops the rest. The next line that
+    gets through carries how many were suppressed, so a broken sheet
+    costs a handful of lines per window instead of one per row.
+    """
+
+    def __init__(self, window_seconds: float, burst: int):
+        super().__init__()
+        self.window_seconds = window_seconds
+        self.burst = burst
+        # key -> [window start, emitted, suppressed]
+        self._windows: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, record: logging.LogRecord) -> Tuple:
+        context = getattr(record, "context", None) or {}
+        scope = context.get("sheet_id") or context.get("user_id")
+        return record.name, record.levelno, record.msg, scope
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+
+        key = self._key(record)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window else 0
+                if window is None and len(self._windows) > 10000:
+                    self._prune(now)
+                self._windows[key] = [now, 1, 0]
+                record.suppressed = suppressed
+                return True
+
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+
+            window[2] += 1
+            return False
+
+    def _prune(self, now: float):
+        expired = [
+            key for key, window in self._windows.items()
+            if now - window[0] >= self.window_seconds
+        ]
+        for key in expired:
+            del self._windows[key]
+
+
+# ======================================================
+# NON-BLOCKING HANDLER
+# ======================================================
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the writer thread. When the queue is full the
+    record is dropped (and counted) rather than stalling a send.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Tracebacks are rendered here, while the frames still exist;
+        # everything else is formatted on the writer thread
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        if self.dropped:
+            record.dropped, self.dropped = self.dropped, 0
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# ======================================================
+# SETUP
+# ======================================================
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def configure_logging():
+    """
+    Route the "outreach" loggers through a bounded queue to a JSON
+    writer thread on stdout. Safe to call more than once.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        root = logging.getLogger(ROOT_LOGGER)
+        level = logging.getLevelName(LOG_LEVEL.upper())
+        root.setLevel(level if isinstance(level, int) else logging.INFO)
+        root.propagate = False
+        for old in list(root.handlers):
+            root.removeHandler(old)
+
+        writer = logging.StreamHandler(sys.stdout)
+        writer.setFormatter(JsonFormatter())
+
+        log_queue = queue.Queue(LOG_QUEUE_SIZE)
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(ContextFilter())
+        handler.addFilter(RepeatSampler(LOG_SAMPLE_WINDOW_SECONDS, LOG_SAMPLE_BURST))
+        root.addHandler(handler)
+
+        _listener = QueueListener(log_queue, writer)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued lines and stop the writer thread"""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        try:
+            _listener.stop()
+        except queue.Full:
+            # Writer is stuck; it's a daemon thread, so just let it go
+            pass
+        _listener = None
+
+
+# ======================================================
+# LOGGER
+# ======================================================
+
+class StructuredLogger:
+    """
+    logger.error("send_failed", to_email=..., error=str(e))
+
+    The event name should be a constant string: it's what repeats are
+    grouped by, and what you search for.
+    """
+
+    def __init__(self, name: str):
+        self._logger = logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+    def _log(self, level: int, event: str, exc_info=None, **fields):
+        # Level check first: disabled levels cost one comparison
+        if self._logger.isEnabledFor(level):
+            self._logger.log(level, event, exc_info=exc_info, extra={"fields": fields})
+
+    def debug(self, event: str, **fields):
+        self._log(logging.DEBUG, event, **fields)
+
+    def info(self, event: str, **fields):
+        self._log(logging.INFO, event, **fields)
+
+    def warning(self, event: str, **fields):
+        self._log(logging.WARNING, event, **fields)
+
+    def error(self, event: str, **fields):
+        self._log(logging.ERROR, event, **fields)
+
+    def exception(self, event: str, **fields):
+        """error() with the current traceback"""
+        self._log(logging.ERROR, event, exc_info=True, **fields)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    configure_logging()
+    return StructuredLogger(name)
@@ -0,0 +1,266 @@
+# backend/services/suppression.py
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.config import (
+    SUPPRESSION_BLOOM_CAPACITY,
+    SUPPRESSION_BLOOM_ERROR_RATE,
+    SUPPRESSION_REFRESH_SECONDS,
+    SUPPRESSION_CACHE_SIZE,
+)
+from backend.models.email_log import EmailLog
+from backend.models.suppression import SuppressionEntry
+
+# Never emailed again by anyone
+BOUNCED = "bounced"
+UNSUBSCRIBED = "unsubscribed"
+GLOBAL_REASONS = (BOUNCED, UNSUBSCRIBED)
+
+# Only for the user they belong to: no more emails after a reply, and
+# no second initial email to an address listed twice. Users send from
+# their own accounts, so one user's outreach doesn't block another's
+REPLIED = "replied"
+CONTACTED = "contacted"
+
+# Entries written by other nodes may commit slightly out of order
+_REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+def email_hash(email: str) -> str:
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+# ======================================================
+# BLOOM FILTER
+# ======================================================
+
+class BloomFilter:
+    """
+    Set of email hashes with no false negatives: "not present" is
+    certain, "present" is wrong about error_rate of the time.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, hex_hash: str):
+        # Double hashing over two 64-bit slices of the sha256
+        first = int(hex_hash[:16], 16)
+        step = int(hex_hash[16:32], 16) | 1
+        for i in range(self.hash_count):
+            yield (first + i * step) % self.size
+
+    def add(self, hex_hash: str) -> bool:
+        """
+        Set the hash's bits; False if they were all set already. Only
+        new hashes count toward capacity, so re-adding (refresh overlap,
+        rolled-back writes) doesn't bring the rebuild forward.
+        """
+        added = False
+        for position in self._positions(hex_hash):
+            byte, bit = position >> 3, 1 << (position & 7)
+            if not self._bits[byte] & bit:
+                self._bits[byte] |= bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, hex_hash: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(hex_hash)
+        )
+
+    @property
+    def full(self) -> bool:
+        return self.count > self.capacity
+
+
+# ======================================================
+# SUPPRESSION INDEX
+# ======================================================
+
+class SuppressionIndex:
+    """
+    Addresses that must not be emailed, shared by all users.
+
+    suppression_entries is the source of truth. Every hash is also in a
+    Bloom filter, so the usual answer ("not suppressed") costs no query;
+    only filter hits are looked up, and their entries are cached.
+    Entries added by other nodes are loaded every refresh_seconds.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, refresh_seconds: float, cache_size: int):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self.cache_size = cache_size
+
+        self._bloom: Optional[BloomFilter] = None
+        self._loaded_until: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        # email_hash -> ((user_id, reason), ...)
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, str], ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---------------- loading
+
+    def _load(self, db: Session, since: Optional[datetime]):
+        """Add entries created since `since` (all when None) to the filter"""
+        query = db.query(SuppressionEntry.email_hash, SuppressionEntry.created_at)
+        if since is not None:
+            query = query.filter(SuppressionEntry.created_at >= since - _REFRESH_OVERLAP)
+
+        loaded_until = since
+        for hex_hash, created_at in query.yield_per(10000):
+            self._bloom.add(hex_hash)
+            self._entries.pop(hex_hash, None)
+            if loaded_until is None or created_at > loaded_until:
+                loaded_until = created_at
+        self._loaded_until = loaded_until
+
+    def _ensure_fresh(self, db: Session):
+        now = time.monotonic()
+        if self._bloom is not None and now - self._refreshed_at < self.refresh_seconds:
+            return
+
+        with self._lock:
+            if self._bloom is not None and now - self._refreshed_at < self.refresh_seconds:
+                return
+
+            if self._bloom is None or self._bloom.full:
+                # First use, or past capacity: size for twice what is stored
+                stored = db.query(func.count(SuppressionEntry.id)).scalar() or 0
+                while self.capacity < stored * 2:
+                    self.capacity *= 2
+                self._bloom = BloomFilter(self.capacity, self.error_rate)
+                self._entries.clear()
+                self._load(db, None)
+            else:
+                self._load(db, self._loaded_until)
+
+            self._refreshed_at = now
+
+    def _lookup(self, db: Session, hex_hash: str) -> Tuple[Tuple[int, str], ...]:
+        with self._lock:
+            entries = self._entries.get(hex_hash)
+            if entries is not None:
+                self._entries.move_to_end(hex_hash)
+                return entries
+
+        entries = tuple(
+            db.query(SuppressionEntry.user_id, SuppressionEntry.reason)
+            .filter(SuppressionEntry.email_hash == hex_hash)
+            .all()
+        )
+
+        with self._lock:
+            self._entries[hex_hash] = entries
+            if len(self._entries) > self.cache_size:
+                self._entries.popitem(last=False)
+        return entries
+
+    # ---------------- checks
+
+    def check(self, db: Session, user_id: int, email: str, initial: bool = False) -> Optional[str]:
+        """
+        Why `email` must not be sent to by this user, or None.
+        initial: the send would be this address's first email.
+        """
+        if not email:
+            return None
+
+        self._ensure_fresh(db)
+        hex_hash = email_hash(email)
+        if hex_hash not in self._bloom:
+            return None
+
+        for owner_id, reason in self._lookup(db, hex_hash):
+            if reason in GLOBAL_REASONS:
+                return reason
+            if owner_id == user_id and (reason == REPLIED or (initial and reason == CONTACTED)):
+                return reason
+        return None
+
+    # ---------------- writes
+
+    def add(self, db: Session, user_id: int, email: str, reason: str):
+        """
+        Record an entry in the caller's transaction (committed with
+        whatever it is logged alongside). An existing entry is kept.
+        """
+        if not email:
+            return
+
+        hex_hash = email_hash(email)
+        statement = _insert_ignore(db).values(
+            email_hash=hex_hash,
+            user_id=user_id,
+            reason=reason,
+            created_at=datetime.utcnow()
+        )
+        db.execute(statement)
+
+        with self._lock:
+            # A filter hit for an entry that was rolled back only costs a lookup
+            if self._bloom is not None:
+                self._bloom.add(hex_hash)
+            self._entries.pop(hex_hash, None)
+
+    def backfill(self, db: Session, batch_size: int = 1000) -> int:
+        """
+        Add entries for every BOUNCED / REPLIED email log (for logs
+        written before the index existed). Returns the logs scanned.
+        """
+        reasons = {"BOUNCED": BOUNCED, "REPLIED": REPLIED}
+        scanned = 0
+        last_id = 0
+        while True:
+            logs = (
+                db.query(EmailLog.id, EmailLog.user_id, EmailLog.to_email, EmailLog.status)
+                .filter(EmailLog.status.in_(list(reasons)), EmailLog.id > last_id)
+                .order_by(EmailLog.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not logs:
+                break
+
+            for log in logs:
+                self.add(db, log.user_id, log.to_email, reasons[log.status])
+            db.commit()
+
+            scanned += len(logs)
+            last_id = logs[-1].id
+        return scanned
+
+
+def _insert_ignore(db: Session):
+    """INSERT ... ON CONFLICT DO NOTHING for the session's database"""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(SuppressionEntry).on_conflict_do_nothing()
+
+
+suppression_index = SuppressionIndex(
+    SUPPRESSION_BLOOM_CAPACITY,
+    SUPPRESSION_BLOOM_ERROR_RATE,
+    SUPPRESSION_REFRESH_SECONDS,
+    SUPPRESSION_CACHE_SIZE,
+)
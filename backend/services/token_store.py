@@ -0,0 +1,267 @@
+# backend/services/token_store.py
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+from sqlalchemy import text
+
+from backend.config import (
+    SECRET_KEY,
+    GMAIL_SCOPES,
+    GMAIL_TOKEN_DIR,
+    GMAIL_TOKEN_STORE,
+    GMAIL_TOKEN_ENCRYPTION_KEY,
+    GMAIL_TOKEN_REFRESH_MARGIN_SECONDS,
+)
+from backend.db.database import SessionLocal, engine
+from backend.models.gmail_token import GmailToken
+from backend.services.structured_log import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+logger = get_logger("token_store")
+
+# google-auth and cryptography are imported on first use (slow imports)
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+    from google.oauth2.credentials import Credentials
+
+# ======================================================
+# ENCRYPTION
+# ======================================================
+
+@lru_cache(maxsize=1)
+def _cipher() -> "Fernet":
+    from cryptography.fernet import Fernet
+
+    key = GMAIL_TOKEN_ENCRYPTION_KEY
+    if not key:
+        # Derive a stable key from SECRET_KEY when none is configured
+        key = base64.urlsafe_b64encode(hashlib.sha256(SECRET_KEY.encode()).digest())
+    return Fernet(key)
+
+
+def encrypt_token(token_json: str) -> str:
+    return _cipher().encrypt(token_json.encode()).decode()
+
+
+def decrypt_token(blob: str) -> str:
+    from cryptography.fernet import InvalidToken
+
+    try:
+        return _cipher().decrypt(blob.encode()).decode()
+    except InvalidToken:
+        # Plain JSON written before tokens were encrypted
+        return blob
+
+
+# ======================================================
+# STORAGE BACKENDS
+# ======================================================
+
+# Keeps token advisory locks apart from other pg_advisory_lock users
+TOKEN_LOCK_NAMESPACE = 0x6D61696C << 20
+
+
+class TokenStore(ABC):
+    """
+    Persists one encrypted authorized-user JSON per user.
+    lock() must serialise refresh-then-save across processes.
+    """
+
+    @abstractmethod
+    def load(self, user_id: int) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def save(self, user_id: int, token_json: str):
+        ...
+
+    @abstractmethod
+    def location(self, user_id: int) -> str:
+        """Value stored in User.gmail_token_path"""
+        ...
+
+    @contextmanager
+    def lock(self, user_id: int):
+        yield
+
+
+class FileTokenStore(TokenStore):
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def path_for(self, user_id: int) -> Path:
+        return self.directory / f"gmail_token_user_{user_id}.json"
+
+    def location(self, user_id: int) -> str:
+        return str(self.path_for(user_id))
+
+    def load(self, user_id: int) -> Optional[str]:
+        path = self.path_for(user_id)
+        if not path.exists():
+            return None
+        return decrypt_token(path.read_text())
+
+    def save(self, user_id: int, token_json: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(user_id)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(encrypt_token(token_json))
+        os.replace(tmp_path, path)  # atomic on POSIX and Windows
+
+    @contextmanager
+    def lock(self, user_id: int):
+        if fcntl is None:
+            yield
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lock_path = self.path_for(user_id).with_suffix(".lock")
+        with open(lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class DbTokenStore(TokenStore):
+    def location(self, user_id: int) -> str:
+        return f"db:gmail_tokens/{user_id}"
+
+    def load(self, user_id: int) -> Optional[str]:
+        db = SessionLocal()
+        try:
+            row = db.get(GmailToken, user_id)
+            return decrypt_token(row.token_encrypted) if row else None
+        finally:
+            db.close()
+
+    def save(self, user_id: int, token_json: str):
+        db = SessionLocal()
+        try:
+            db.merge(GmailToken(user_id=user_id, token_encrypted=encrypt_token(token_json)))
+            db.commit()
+        finally:
+            db.close()
+
+    @contextmanager
+    def lock(self, user_id: int):
+        # Advisory lock on Postgres; SQLite serialises writers anyway
+        with engine.connect() as conn:
+            if conn.dialect.name != "postgresql":
+                yield
+                return
+
+            key = TOKEN_LOCK_NAMESPACE + user_id
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+
+def create_token_store(kind: str = GMAIL_TOKEN_STORE) -> TokenStore:
+    if kind == "db":
+        return DbTokenStore()
+    return FileTokenStore(GMAIL_TOKEN_DIR)
+
+
+token_store = create_token_store()
+
+
+# ======================================================
+# CREDENTIAL CACHE
+# ======================================================
+
+class GmailCredentialCache:
+    """
+    Decrypted Credentials per user, refreshed ahead of expiry.
+    A refresh reloads from the store under lock first, so when another
+    worker already refreshed we reuse its token instead of refreshing again.
+    """
+
+    def __init__(self, store: TokenStore, refresh_margin_seconds: int):
+        self.store = store
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self._credentials: Dict[int, "Credentials"] = {}
+        self._locks: Dict[int, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _user_lock(self, user_id: int) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(user_id, threading.Lock())
+
+    def _needs_refresh(self, creds: "Credentials") -> bool:
+        if not creds.expiry:
+            return not creds.valid
+        return creds.expiry - datetime.utcnow() < self.refresh_margin
+
+    def _load(self, user_id: int) -> Optional["Credentials"]:
+        from google.oauth2.credentials import Credentials
+
+        token_json = self.store.load(user_id)
+        if not token_json:
+            return None
+        return Credentials.from_authorized_user_info(json.loads(token_json), GMAIL_SCOPES)
+
+    def put(self, user_id: int, creds: "Credentials"):
+        """Persist freshly issued credentials (OAuth callback)"""
+        with self._user_lock(user_id), self.store.lock(user_id):
+            self.store.save(user_id, creds.to_json())
+            self._credentials[user_id] = creds
+
+    def get(self, user_id: int) -> Optional["Credentials"]:
+        creds = self._credentials.get(user_id)
+        if creds and not self._needs_refresh(creds):
+            return creds
+        return self.refresh(user_id)
+
+    def refresh(self, user_id: int) -> Optional["Credentials"]:
+        from google.auth.transport.requests import Request as GoogleAuthRequest
+
+        with self._user_lock(user_id), self.store.lock(user_id):
+            creds = self._load(user_id)
+            if creds is None:
+                self._credentials.pop(user_id, None)
+                return None
+
+            if self._needs_refresh(creds) and creds.refresh_token:
+                creds.refresh(GoogleAuthRequest())
+                self.store.save(user_id, creds.to_json())
+
+            self._credentials[user_id] = creds
+            return creds
+
+    def prefetch(self, user_ids: Iterable[int]) -> int:
+        """
+        Refresh every token that will expire within the margin.
+        Returns how many users were refreshed.
+        """
+        refreshed = 0
+        for user_id in user_ids:
+            creds = self._credentials.get(user_id)
+            if creds and not self._needs_refresh(creds):
+                continue
+            try:
+                if self.refresh(user_id):
+                    refreshed += 1
+            except Exception as e:
+                logger.warning("token_prefetch_failed", user_id=user_id, error=str(e))
+        return refreshed
+
+
+credential_cache = GmailCredentialCache(token_store, GMAIL_TOKEN_REFRESH_MARGIN_SECONDS)
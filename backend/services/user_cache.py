@@ -0,0 +1,126 @@
+# backend/services/user_cache.py
+
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import USER_CACHE_TTL_SECONDS
+from backend.models.user import User
+
+# ======================================================
+# USER PROFILE SNAPSHOT
+# ======================================================
+
+@dataclass(frozen=True)
+class UserProfile:
+    """
+    Detached, read-only copy of a User row.
+    Safe to share across sessions and threads (no password hash).
+    """
+    id: int
+    email: str
+    full_name: Optional[str]
+    is_admin: bool
+    is_paused: bool
+    gmail_token_path: Optional[str]
+    sheet_id: Optional[str]
+    contact_source: Optional[str]
+    email_template: Optional[str]
+    followup_template: Optional[str]
+    email_subject: Optional[str]
+    resume_link: Optional[str]
+    timezone: Optional[str]
+    followup_cadence: Optional[str]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserProfile":
+        return cls(**{f.name: getattr(user, f.name) for f in fields(cls)})
+
+
+# ======================================================
+# CACHE
+# ======================================================
+
+class UserProfileCache:
+    """
+    In-process user_id -> UserProfile cache with a short TTL.
+    Writers call put() / invalidate() after commit; the TTL bounds
+    staleness for changes made by other processes.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, UserProfile]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[UserProfile]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if not entry:
+                return None
+            expires_at, profile = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            return profile
+
+    def put(self, profile: UserProfile) -> UserProfile:
+        with self._lock:
+            self._entries[profile.id] = (time.monotonic() + self.ttl_seconds, profile)
+        return profile
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserProfileCache(USER_CACHE_TTL_SECONDS)
+
+
+# ======================================================
+# LOOKUP HELPERS
+# ======================================================
+
+def get_user_profile(db: Session, user_id: int) -> Optional[UserProfile]:
+    """
+    Cached lookup for sync routes and the scheduler.
+    """
+    profile = user_cache.get(user_id)
+    if profile:
+        return profile
+
+    user = db.get(User, user_id)
+    if not user:
+        return None
+
+    return user_cache.put(UserProfile.from_user(user))
+
+
+async def get_user_profile_async(db: AsyncSession, user_id: int) -> Optional[UserProfile]:
+    """
+    Cached lookup for async routes.
+    """
+    profile = user_cache.get(user_id)
+    if profile:
+        return profile
+
+    user = await db.get(User, user_id)
+    if not user:
+        return None
+
+    return user_cache.put(UserProfile.from_user(user))
+
+
+def refresh_user_profile(user: User) -> UserProfile:
+    """
+    Write-through after a committed change to a User row.
+    """
+    return user_cache.put(UserProfile.from_user(user))
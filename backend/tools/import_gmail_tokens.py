@@ -0,0 +1,68 @@
+# backend/tools/import_gmail_tokens.py
+"""
+One-time import of file-based Gmail tokens (tokens/gmail_token_user_<id>.json)
+into the gmail_tokens table, for switching to GMAIL_TOKEN_STORE=db.
+
+Each token is re-encrypted with the current key (old plain-JSON files
+included) and the user's gmail_token_path is pointed at the table.
+Users who already have a row are left alone, so running it twice is
+harmless. The files are not deleted.
+
+Usage:
+    python -m backend.tools.import_gmail_tokens [--dir tokens] [--dry-run]
+"""
+
+import argparse
+from collections import Counter
+from pathlib import Path
+
+from backend.config import GMAIL_TOKEN_DIR
+
+
+def import_file_tokens(db, directory: Path, dry_run: bool = False) -> Counter:
+    """Copy every user's token file into gmail_tokens; returns counts per outcome"""
+    from backend.models.user import User
+    from backend.services.token_store import DbTokenStore, FileTokenStore
+
+    files = FileTokenStore(directory)
+    table = DbTokenStore()
+    counts = Counter()
+
+    for user in db.query(User).order_by(User.id).all():
+        token_json = files.load(user.id)
+        if token_json is None:
+            continue
+        if table.load(user.id) is not None:
+            counts["already_in_db"] += 1
+            continue
+
+        counts["imported"] += 1
+        if dry_run:
+            continue
+        table.save(user.id, token_json)
+        user.gmail_token_path = table.location(user.id)
+        db.commit()
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import file-based Gmail tokens into the gmail_tokens table")
+    parser.add_argument("--dir", default=GMAIL_TOKEN_DIR, help="token directory (default: GMAIL_TOKEN_DIR)")
+    parser.add_argument("--dry-run", action="store_true", help="count only, write nothing")
+    args = parser.parse_args(argv)
+
+    from backend.db.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        counts = import_file_tokens(db, Path(args.dir), dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    action = "Would import" if args.dry_run else "Imported"
+    print(f"{action} {counts['imported']} token(s); {counts['already_in_db']} already in the database")
+
+
+if __name__ == "__main__":
+    main()
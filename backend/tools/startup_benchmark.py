@@ -0,0 +1,117 @@
+# backend/tools/startup_benchmark.py
+"""
+Cold-start benchmark for the web app.
+
+Imports the app in fresh interpreters (so nothing is cached in
+sys.modules), reports the wall time, and prints the slowest imports
+from Python's -X importtime output.
+
+Usage:
+    python -m backend.tools.startup_benchmark [--runs 5] [--top 20] [--module backend.main]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# Modules that must NOT be imported just by loading the web app
+DEFERRED_MODULES = [
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "google.oauth2",
+    "passlib",
+    "bcrypt",
+    "cryptography",
+    "apscheduler",
+    "openpyxl",
+    "dns",
+]
+
+
+def run_once(module: str) -> Tuple[float, str]:
+    """
+    Import `module` in a fresh interpreter.
+    Returns (wall seconds, importtime report from stderr).
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    return elapsed, result.stderr
+
+
+def parse_importtime(report: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse "-X importtime" lines into {module: (self_us, cumulative_us)}.
+    """
+    timings = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            timings[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return timings
+
+
+def top_imports(timings: Dict[str, Tuple[int, int]], top: int) -> List[Tuple[str, int, int]]:
+    ranked = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)
+    return [(name, self_us, cumulative_us) for name, (self_us, cumulative_us) in ranked[:top]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app import/startup time")
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    # First run warms the bytecode cache and is not counted
+    run_once(args.module)
+
+    wall_times = []
+    report = ""
+    for _ in range(args.runs):
+        elapsed, report = run_once(args.module)
+        wall_times.append(elapsed)
+
+    timings = parse_importtime(report)
+
+    print("=" * 60)
+    print(f"STARTUP BENCHMARK: import {args.module} ({args.runs} runs)")
+    print("=" * 60)
+    print(f"min    {min(wall_times) * 1000:8.1f} ms")
+    print(f"median {statistics.median(wall_times) * 1000:8.1f} ms")
+    print(f"max    {max(wall_times) * 1000:8.1f} ms")
+    print()
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in top_imports(timings, args.top):
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+    eager = [
+        name for name in DEFERRED_MODULES
+        if any(loaded == name or loaded.startswith(name + ".") for loaded in timings)
+    ]
+    print()
+    if eager:
+        print(f"WARNING: imported eagerly at startup: {', '.join(eager)}")
+        return 1
+
+    print("OK: Google, crypto and scheduler libraries are loaded lazily")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
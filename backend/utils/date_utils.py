@@ -40,9 +40,10 @@ def is_future(d: date) -> bool:
 
 
 # ✅ NEW FUNCTION - CRITICAL FOR YOUR EMAIL FLOW
-def calculate_next_send_date(current_followup_count: int, last_sent_date: date) -> str:
+def calculate_next_send_date(current_followup_count: int, last_sent_date: date, cadence=None) -> str:
     """
-    Calculate next send date based on email sequence:
+    Calculate next send date based on the follow-up cadence
+    (backend.services.cadence; by default):
     
     Email Flow:
     - Email 0 (Initial) → Email 1 (Follow-up #1): +7 days
@@ -54,36 +55,21 @@ def calculate_next_send_date(current_followup_count: int, last_sent_date: date)
     Args:
         current_followup_count: The count AFTER this email is sent (1, 2, 3, 4, or 5)
         last_sent_date: The date this email was just sent
+        cadence: The user's Cadence (default cadence if None)
     
     Returns:
         Next send date as string "YYYY-MM-DD" or empty string if no more emails
     """
-    if current_followup_count == 1:
-        # Just sent initial email → schedule follow-up #1 in 7 days
-        return format_date(add_days(last_sent_date, 7))
-    
-    elif current_followup_count == 2:
-        # Just sent follow-up #1 → schedule follow-up #2 in 7 days
-        return format_date(add_days(last_sent_date, 7))
-    
-    elif current_followup_count == 3:
-        # Just sent follow-up #2 → schedule retry #1 in 60 days
-        return format_date(add_days(last_sent_date, 60))
-    
-    elif current_followup_count == 4:
-        # Just sent retry #1 → schedule retry #2 in 60 days
-        return format_date(add_days(last_sent_date, 60))
-    
-    else:
-        # Sent 5 emails total → permanently rejected, no more emails
-        return ""
+    cadence = cadence or _default_cadence()
+    next_send = cadence.next_send_date(current_followup_count, last_sent_date)
+    return format_date(next_send) if next_send else ""
 
 
-def get_status_from_followup_count(followup_count: int) -> str:
+def get_status_from_followup_count(followup_count: int, cadence=None) -> str:
     """
     Return appropriate status based on followup count.
     
-    Status progression:
+    Status progression (default cadence):
     0 → "Pending" (not sent yet)
     1 → "Sent" (initial email sent)
     2 → "Follow-up-1" (first follow-up sent)
@@ -91,12 +77,10 @@ def get_status_from_followup_count(followup_count: int) -> str:
     4 → "Retry-1" (first retry sent, waiting 60 days)
     5 → "Permanently-Rejected" (all attempts exhausted)
     """
-    status_map = {
-        0: "Pending",
-        1: "Sent",
-        2: "Follow-up-1",
-        3: "Follow-up-2",
-        4: "Retry-1",
-        5: "Permanently-Rejected"
-    }
-    return status_map.get(followup_count, "Unknown")
\ No newline at end of file
+    return (cadence or _default_cadence()).status(followup_count)
+
+
+def _default_cadence():
+    # Deferred: the cadence module reads config at import
+    from backend.services.cadence import DEFAULT_CADENCE
+    return DEFAULT_CADENCE
@@ -1,5 +1,8 @@
 # backend/utils/template_engine.py
 
+import re
+
+
 def render_template(template: str, context: dict) -> str:
     """
     Replace placeholders in email templates.
@@ -24,3 +27,33 @@ def render_template(template: str, context: dict) -> str:
         rendered = rendered.replace(placeholder, str(value))
 
     return rendered
+
+
+_PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+
+
+class CompiledTemplate:
+    """
+    A template split once into literal text and placeholders, so each
+    render is a single join instead of one replace() per context key.
+    Unknown placeholders are left as written, like render_template.
+    """
+
+    def __init__(self, template: str):
+        self.template = template or ""
+        # Even indexes: literal text; odd indexes: placeholder names
+        self.parts = _PLACEHOLDER.split(self.template)
+
+    def render(self, context: dict) -> str:
+        if not context:
+            return self.template
+        parts = self.parts
+        out = []
+        for index, part in enumerate(parts):
+            if index % 2 == 0:
+                out.append(part)
+            elif part in context:
+                out.append(str(context[part]))
+            else:
+                out.append("{" + part + "}")
+        return "".join(out)
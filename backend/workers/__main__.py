@@ -0,0 +1,44 @@
+# backend/workers/__main__.py
+"""
+Standalone scheduler process:
+
+    python -m backend.workers
+
+Runs the send loop, bounce checks, the daily reply checker and Gmail
+token prefetch. Set WORKER_METRICS_PORT to expose /metrics. Run web nodes with RUN_SCHEDULER_IN_WEB=false
+so only this process sends.
+"""
+
+import signal
+
+from backend.config import METRICS_ENABLED, WORKER_METRICS_PORT
+from backend.services.metrics import instrument_database, start_metrics_server
+from backend.workers.jobs import BackgroundWorkers
+
+
+def main():
+    workers = BackgroundWorkers()
+
+    def handle_signal(signum, frame):
+        print(f"Worker received signal {signum}, stopping after current pass")
+        workers.stop_event.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    instrument_database()
+    if METRICS_ENABLED and WORKER_METRICS_PORT:
+        start_metrics_server(WORKER_METRICS_PORT)
+        print(f"Worker metrics on :{WORKER_METRICS_PORT}/metrics")
+
+    print("Scheduler worker started")
+    workers.start(run_loop_in_thread=False)
+    try:
+        workers.run_loop()
+    finally:
+        workers.stop()
+        print("Scheduler worker stopped")
+
+
+if __name__ == "__main__":
+    main()
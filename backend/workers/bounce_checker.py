@@ -0,0 +1,213 @@
+# backend/workers/bounce_checker.py
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func
+
+from backend.db.database import SessionLocal  # ✅ Import SessionLocal directly
+from backend.models.email_log import EmailLog
+from backend.services.gmail_service import IncompleteBounceCheck, check_bounces
+from backend.services.user_cache import get_user_profile
+from backend.services.campaigns import campaign_list_ids
+from backend.services.cadence import MAX_CADENCE_EMAILS
+from backend.services.structured_log import get_logger, log_context, new_correlation_id
+from backend.config import (
+    BOUNCE_CHECK_INTERVAL_SECONDS,
+    BOUNCE_CHECK_MAX_INTERVAL_SECONDS,
+    BOUNCE_WINDOW_HOURS,
+)
+
+logger = get_logger("bounce_checker")
+
+# Bounces received shortly before the last check may not have been
+# listed yet; the ledger skips the ones that were
+_CHECK_OVERLAP = timedelta(minutes=30)
+
+# Only real sends can bounce (gmail_service logs email n as FOLLOWUP_n)
+SENT_STATUSES = ["SENT"] + [f"FOLLOWUP_{n}" for n in range(2, MAX_CADENCE_EMAILS + 1)]
+
+
+# ======================================================
+# Backoff
+# ======================================================
+
+@dataclass
+class BounceCheckState:
+    interval: float
+    next_check_at: datetime
+    last_checked_at: Optional[datetime] = None
+
+
+class BounceCheckBackoff:
+    """
+    Per-user bounce-check cadence. Every check that finds nothing
+    doubles the user's interval (up to max_interval); a bounce, or a
+    send after the last check, drops it back to the base interval.
+
+    last_checked_at is the start of the last complete check, where the
+    next search picks up. Failed checks back off the same way but keep
+    it, so their bounces are searched for again.
+    """
+
+    def __init__(self, base_interval: float, max_interval: float):
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval, base_interval)
+        self._states: Dict[int, BounceCheckState] = {}
+        self._lock = threading.Lock()
+
+    def is_due(self, user_id: int, last_sent_at: datetime, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.utcnow()
+        with self._lock:
+            state = self._states.get(user_id)
+            if state is None:
+                return True
+
+            # New sends since the last check: bounces are likely again
+            if state.last_checked_at and last_sent_at > state.last_checked_at:
+                state.interval = self.base_interval
+                state.next_check_at = state.last_checked_at + timedelta(seconds=self.base_interval)
+
+            return state.next_check_at <= now
+
+    def _next_state(self, user_id: int, found_bounces: bool, now: datetime, checked_at: Optional[datetime]):
+        state = self._states.get(user_id)
+        if state is None or found_bounces:
+            interval = self.base_interval
+        else:
+            interval = min(state.interval * 2, self.max_interval)
+
+        self._states[user_id] = BounceCheckState(
+            interval=interval,
+            next_check_at=now + timedelta(seconds=interval),
+            last_checked_at=checked_at
+        )
+
+    def record(self, user_id: int, found_bounces: bool, now: Optional[datetime] = None):
+        """A complete check that started at `now`"""
+        now = now or datetime.utcnow()
+        with self._lock:
+            self._next_state(user_id, found_bounces, now, checked_at=now)
+
+    def record_failure(self, user_id: int, found_bounces: bool = False, now: Optional[datetime] = None):
+        """A failed or partial check: back off, keep the last complete check"""
+        now = now or datetime.utcnow()
+        with self._lock:
+            state = self._states.get(user_id)
+            last_checked_at = state.last_checked_at if state else None
+            self._next_state(user_id, found_bounces, now, checked_at=last_checked_at)
+
+    def last_checked_at(self, user_id: int) -> Optional[datetime]:
+        with self._lock:
+            state = self._states.get(user_id)
+            return state.last_checked_at if state else None
+
+    def forget_others(self, active_user_ids):
+        """Drop users who haven't sent within the bounce window"""
+        with self._lock:
+            for user_id in set(self._states) - set(active_user_ids):
+                del self._states[user_id]
+
+
+bounce_backoff = BounceCheckBackoff(BOUNCE_CHECK_INTERVAL_SECONDS, BOUNCE_CHECK_MAX_INTERVAL_SECONDS)
+
+
+# ======================================================
+# Bounce Check Job (Run Every BOUNCE_CHECK_INTERVAL_SECONDS)
+# ======================================================
+
+def recent_senders(db) -> Dict[int, datetime]:
+    """user_id -> last send time, for users who sent within the bounce window"""
+    since = datetime.utcnow() - timedelta(hours=BOUNCE_WINDOW_HOURS)
+    return {
+        user_id: last_sent
+        for user_id, last_sent in
+        db.query(EmailLog.user_id, func.max(EmailLog.sent_at))
+        .filter(EmailLog.sent_at >= since, EmailLog.status.in_(SENT_STATUSES))
+        .group_by(EmailLog.user_id)
+        .all()
+    }
+
+
+def bounce_search_since(last_checked_at: Optional[datetime], now: Optional[datetime] = None) -> datetime:
+    """
+    Start of the Gmail search: just before the user's last check, but
+    never further back than BOUNCE_WINDOW_HOURS (first check, restart).
+    """
+    now = now or datetime.utcnow()
+    window_start = now - timedelta(hours=BOUNCE_WINDOW_HOURS)
+    if last_checked_at is None:
+        return window_start
+    return max(last_checked_at - _CHECK_OVERLAP, window_start)
+
+
+def check_user_bounces(user_id: int, api_calls: Counter) -> Optional[int]:
+    """
+    Bounce check for one user in its own session, recorded in the
+    backoff; None on error. Only a complete check moves the next
+    search's start forward.
+    """
+    started = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        user = get_user_profile(db, user_id)
+        sheet_ids = campaign_list_ids(db, user) if user else ()
+        if not sheet_ids or not user.gmail_token_path:
+            bounce_backoff.record_failure(user_id)
+            return None
+        since = bounce_search_since(bounce_backoff.last_checked_at(user_id))
+        found = check_bounces(db, user, sheet_ids, api_calls=api_calls, since=since)
+    except IncompleteBounceCheck as e:
+        logger.warning("bounce_check_incomplete", unfetched=len(e.message_ids), bounces=e.bounced_count)
+        bounce_backoff.record_failure(user_id, found_bounces=bool(e.bounced_count))
+        return e.bounced_count
+    except Exception as e:
+        # Errors back off like quiet checks so a broken account isn't hammered
+        logger.error("bounce_check_failed", error=str(e))
+        bounce_backoff.record_failure(user_id)
+        return None
+    finally:
+        db.close()  # ✅ Always close session
+
+    bounce_backoff.record(user_id, found_bounces=bool(found), now=started)
+    return found
+
+
+def check_recent_bounces():
+    """
+    Check bounces for users who sent recently and are due per their backoff.
+    """
+    pass_id = new_correlation_id()
+    db = SessionLocal()
+    try:
+        senders = recent_senders(db)
+    finally:
+        db.close()
+
+    bounce_backoff.forget_others(senders)
+
+    api_calls = Counter()
+    checked = 0
+    bounced = 0
+
+    for user_id, last_sent in senders.items():
+        if not bounce_backoff.is_due(user_id, last_sent):
+            continue
+
+        with log_context(pass_id=pass_id, user_id=user_id):
+            found = check_user_bounces(user_id, api_calls)
+        checked += 1
+        bounced += found or 0
+
+    if bounced:
+        logger.info(
+            "bounce_check_finished",
+            pass_id=pass_id,
+            users=checked,
+            bounces=bounced,
+            gmail_calls=api_calls["gmail"],
+            sheets_calls=api_calls["sheets"]
+        )
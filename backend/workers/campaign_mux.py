@@ -0,0 +1,85 @@
+# backend/workers/campaign_mux.py
+
+from collections import deque
+from typing import Deque, Dict, Hashable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# ======================================================
+# Daily shares
+# ======================================================
+
+def daily_allowances(
+    shares: Dict[Hashable, int],
+    daily_limit: int,
+    sent_today: Dict[Hashable, int]
+) -> Dict[Hashable, int]:
+    """
+    Sends each campaign has left today out of its share of daily_limit:
+    daily_limit * share / (sum of shares), minus what it already sent.
+    """
+    total = sum(max(share, 0) for share in shares.values())
+    if total <= 0:
+        return {key: 0 for key in shares}
+    return {
+        key: max(daily_limit * max(share, 0) // total - sent_today.get(key, 0), 0)
+        for key, share in shares.items()
+    }
+
+
+# ======================================================
+# Multiplexing
+# ======================================================
+
+def _weighted_round_robin(
+    queues: Dict[Hashable, Deque[T]],
+    weights: Dict[Hashable, int],
+    budget: Optional[Dict[Hashable, int]] = None
+) -> Iterator[Tuple[Hashable, T]]:
+    """
+    Smooth weighted round-robin over the non-empty queues: a campaign
+    with weight 3 gets 3 of every 4 picks against one with weight 1,
+    spread out (a, b, a, a, ...) rather than in runs. With `budget`, a
+    campaign drops out once its budget is used.
+    """
+    current = {key: 0 for key in queues}
+    while True:
+        eligible = [
+            key for key, queue in queues.items()
+            if queue and (budget is None or budget.get(key, 0) > 0)
+        ]
+        if not eligible:
+            return
+
+        total = 0
+        for key in eligible:
+            current[key] += weights[key]
+            total += weights[key]
+        key = max(eligible, key=lambda k: current[k])
+        current[key] -= total
+
+        if budget is not None:
+            budget[key] -= 1
+        yield key, queues[key].popleft()
+
+
+def multiplex(
+    candidates: Dict[Hashable, Iterable[T]],
+    shares: Dict[Hashable, int],
+    allowances: Dict[Hashable, int]
+) -> Iterator[Tuple[Hashable, T]]:
+    """
+    (campaign, candidate) pairs, interleaved fairly across campaigns.
+
+    First every campaign gets up to its allowance (what is left of its
+    daily share), weighted by share. Whatever a campaign can't use (it
+    ran out of due rows) then goes to the others, still weighted, so
+    the user's daily limit is not left idle. The caller stops reading
+    once it has queued enough.
+    """
+    queues: Dict[Hashable, Deque[T]] = {key: deque(items) for key, items in candidates.items()}
+    # Share 0: only what the others leave over
+    weights = {key: max(shares.get(key, 1), 1) for key in queues}
+
+    yield from _weighted_round_robin(queues, weights, dict(allowances))
+    yield from _weighted_round_robin(queues, weights)
@@ -0,0 +1,170 @@
+# backend/workers/domain_throttle.py
+
+import threading
+from collections import OrderedDict, deque
+from datetime import date, datetime, timedelta
+from typing import Deque, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from backend.config import (
+    DOMAIN_HOURLY_CAP,
+    DOMAIN_COOLDOWN_SECONDS,
+    PROVIDER_HOURLY_CAP,
+    PROVIDER_COOLDOWN_SECONDS,
+)
+
+# ======================================================
+# Domain Keys
+# ======================================================
+
+# Mailbox providers: many unrelated people, one set of rate limits
+PROVIDER_DOMAINS = {
+    "gmail.com": "google",
+    "googlemail.com": "google",
+    "outlook.com": "microsoft",
+    "hotmail.com": "microsoft",
+    "live.com": "microsoft",
+    "msn.com": "microsoft",
+    "yahoo.com": "yahoo",
+    "ymail.com": "yahoo",
+    "icloud.com": "apple",
+    "me.com": "apple",
+    "mac.com": "apple",
+    "aol.com": "aol",
+    "proton.me": "proton",
+    "protonmail.com": "proton",
+}
+
+
+def domain_key(email: str) -> str:
+    """Throttling key: the provider for big mailbox providers, else the domain"""
+    domain = email.rpartition("@")[2].strip().lower()
+    return PROVIDER_DOMAINS.get(domain, domain)
+
+
+def is_provider(key: str) -> bool:
+    return key in PROVIDER_DOMAINS.values()
+
+
+# ======================================================
+# Selection: round-robin across domains
+# ======================================================
+
+class Candidate(NamedTuple):
+    row_number: int
+    email: str
+    name: str
+    company: str
+    followup_count: int     # NEW count after this send
+    due_date: Optional[date] = None     # Next_Send_Date, None for "now"
+
+
+class DomainSpread:
+    """
+    Due rows bucketed by domain key and handed out round-robin, so 200
+    rows at one company are spread between everyone else instead of
+    going out back to back.
+
+    Rows are added best first (see send_order); each domain keeps that
+    order, and domains take turns in the order of their best row.
+    Holds at most `limit` rows (the jobs a pass may queue).
+    """
+
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self.size = 0
+        self._buckets: "OrderedDict[str, Deque[Candidate]]" = OrderedDict()
+
+    def add(self, candidate: Candidate):
+        if self.full:
+            return
+        self._buckets.setdefault(domain_key(candidate.email), deque()).append(candidate)
+        self.size += 1
+
+    @property
+    def full(self) -> bool:
+        return self.limit is not None and self.size >= self.limit
+
+    def __iter__(self) -> Iterator[Candidate]:
+        while self._buckets:
+            for key in list(self._buckets):
+                bucket = self._buckets[key]
+                yield bucket.popleft()
+                if not bucket:
+                    del self._buckets[key]
+
+
+# ======================================================
+# Sending: hourly caps and cooldowns
+# ======================================================
+
+class DomainThrottle:
+    """
+    Recent sends per (user, domain key), reloaded from the database
+    whenever this node takes a user's lease (see load). next_allowed()
+    says when the user may next email a domain: after `cooldown` since
+    the last send, and no more than `hourly_cap` in any hour. Mailbox
+    providers get their own, looser limits.
+    """
+
+    def __init__(self, hourly_cap: int, cooldown_seconds: int, provider_hourly_cap: int, provider_cooldown_seconds: int):
+        self.limits = {
+            False: (hourly_cap, timedelta(seconds=cooldown_seconds)),
+            True: (provider_hourly_cap, timedelta(seconds=provider_cooldown_seconds)),
+        }
+        self._sends: Dict[int, Dict[str, Deque[datetime]]] = {}
+        self._lock = threading.Lock()
+
+    def _limits(self, key: str) -> Tuple[int, timedelta]:
+        return self.limits[is_provider(key)]
+
+    def _recent(self, user_id: int, key: str, now: datetime) -> Deque[datetime]:
+        sends = self._sends.setdefault(user_id, {}).setdefault(key, deque())
+        while sends and sends[0] <= now - timedelta(hours=1):
+            sends.popleft()
+        return sends
+
+    def next_allowed(self, user_id: int, email: str, now: Optional[datetime] = None) -> datetime:
+        """Earliest time this user may send to the address's domain"""
+        now = now or datetime.utcnow()
+        key = domain_key(email)
+        hourly_cap, cooldown = self._limits(key)
+
+        with self._lock:
+            sends = self._recent(user_id, key, now)
+            allowed = now
+            if sends:
+                allowed = max(allowed, sends[-1] + cooldown)
+            if hourly_cap > 0 and len(sends) >= hourly_cap:
+                allowed = max(allowed, sends[-hourly_cap] + timedelta(hours=1))
+            if not sends:
+                del self._sends[user_id][key]
+            return allowed
+
+    def record(self, user_id: int, email: str, now: Optional[datetime] = None):
+        now = now or datetime.utcnow()
+        with self._lock:
+            self._recent(user_id, domain_key(email), now).append(now)
+
+    def load(self, user_id: int, recent_sends: Iterable[Tuple[str, datetime]]):
+        """
+        Replace the user's sends with their last hour from the database,
+        (email, sent_at), each time this node takes the lease: other
+        nodes may have sent for the user since this one last did.
+        """
+        user_sends: Dict[str, Deque[datetime]] = {}
+        for email, sent_at in sorted(recent_sends, key=lambda send: send[1]):
+            user_sends.setdefault(domain_key(email), deque()).append(sent_at)
+        with self._lock:
+            self._sends[user_id] = user_sends
+
+    def forget(self, user_id: int):
+        with self._lock:
+            self._sends.pop(user_id, None)
+
+
+domain_throttle = DomainThrottle(
+    DOMAIN_HOURLY_CAP,
+    DOMAIN_COOLDOWN_SECONDS,
+    PROVIDER_HOURLY_CAP,
+    PROVIDER_COOLDOWN_SECONDS
+)
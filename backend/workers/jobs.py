@@ -0,0 +1,106 @@
+# backend/workers/jobs.py
+
+import threading
+
+from backend.config import (
+    GMAIL_TOKEN_PREFETCH_INTERVAL_SECONDS,
+    BOUNCE_CHECK_INTERVAL_SECONDS,
+    REPLY_CHECK_RESUME_INTERVAL_SECONDS,
+)
+from backend.workers.scheduler import (
+    scheduler_loop,
+    prefetch_gmail_tokens,
+    prune_processed_messages,
+)
+from backend.workers.reply_checker import (
+    check_all_replies_daily,
+    resume_interrupted_reply_check,
+)
+from backend.workers.bounce_checker import check_recent_bounces
+
+# ======================================================
+# Job Wiring (shared by web process and worker process)
+# ======================================================
+
+def create_job_scheduler():
+    """
+    APScheduler with the periodic jobs (replies, bounces, token prefetch).
+    The continuous send loop runs separately via scheduler_loop().
+    """
+    # Deferred: APScheduler is only needed once jobs start
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    scheduler = BackgroundScheduler()
+
+    # Daily reply checker (runs once per day at 2 AM)
+    scheduler.add_job(
+        check_all_replies_daily,
+        'cron',
+        hour=2,
+        minute=0
+    )
+
+    # Finish a reply check that a restart cut short (runs once, now)
+    scheduler.add_job(resume_interrupted_reply_check, 'date')
+
+    # Retry users whose reply check timed out or failed today
+    scheduler.add_job(
+        resume_interrupted_reply_check,
+        'interval',
+        seconds=REPLY_CHECK_RESUME_INTERVAL_SECONDS
+    )
+
+    # Bounce checks for recent senders (per-user backoff inside)
+    scheduler.add_job(
+        check_recent_bounces,
+        'interval',
+        seconds=BOUNCE_CHECK_INTERVAL_SECONDS
+    )
+
+    # Expired processed-message ledger entries
+    scheduler.add_job(
+        prune_processed_messages,
+        'cron',
+        hour=3,
+        minute=30
+    )
+
+    # Keep Gmail access tokens warm
+    scheduler.add_job(
+        prefetch_gmail_tokens,
+        'interval',
+        seconds=GMAIL_TOKEN_PREFETCH_INTERVAL_SECONDS
+    )
+
+    return scheduler
+
+
+class BackgroundWorkers:
+    """
+    Send loop thread + periodic jobs, with a clean stop.
+    """
+
+    def __init__(self):
+        self.stop_event = threading.Event()
+        self.job_scheduler = create_job_scheduler()
+        self.loop_thread = None
+
+    def start(self, run_loop_in_thread: bool = True):
+        self.job_scheduler.start()
+
+        if run_loop_in_thread:
+            self.loop_thread = threading.Thread(
+                target=scheduler_loop,
+                args=(self.stop_event,),
+                name="scheduler-loop",
+                daemon=True
+            )
+            self.loop_thread.start()
+
+    def run_loop(self):
+        """Run the send loop in the calling thread until stop() is called"""
+        scheduler_loop(self.stop_event)
+
+    def stop(self):
+        self.stop_event.set()
+        self.job_scheduler.shutdown(wait=False)
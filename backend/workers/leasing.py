@@ -0,0 +1,228 @@
+# backend/workers/leasing.py
+
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Set
+
+from sqlalchemy import update, or_
+from sqlalchemy.exc import IntegrityError
+
+from backend.config import SCHEDULER_NODE_ID, SCHEDULER_LEASE_TTL_SECONDS
+from backend.db.database import SessionLocal
+from backend.models.scheduler_lease import SchedulerLease, SchedulerNode
+from backend.services.structured_log import get_logger
+
+logger = get_logger("leasing")
+
+# ======================================================
+# Node Identity
+# ======================================================
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+# ======================================================
+# Lease Manager
+# ======================================================
+
+class LeaseManager:
+    """
+    Per-user leases so each user's scheduler pass runs on exactly one
+    node at a time.
+
+    Acquiring is a single conditional UPDATE (owner is me, or the lease
+    expired), which takes a row lock on Postgres, so two nodes can never
+    both win. Held leases are renewed by a heartbeat thread; when a node
+    crashes its leases lapse after the TTL and other nodes take over.
+
+    The heartbeat also keeps a lease on the node itself, so other work
+    stamped with an owner (reply checks) can tell a crashed owner from
+    a busy one with is_live().
+    """
+
+    def __init__(self, owner: str, ttl_seconds: int):
+        self.owner = owner
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._held: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._heartbeat_thread = None
+
+    # ---------------- acquire / release
+
+    def try_acquire(self, user_id: int) -> bool:
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.user_id == user_id,
+                    or_(
+                        SchedulerLease.owner == self.owner,
+                        SchedulerLease.expires_at < now
+                    )
+                )
+                .values(owner=self.owner, expires_at=now + self.ttl)
+                .execution_options(synchronize_session=False)
+            )
+
+            if result.rowcount == 0:
+                # Either someone else holds it, or the row doesn't exist yet
+                if db.get(SchedulerLease, user_id):
+                    db.rollback()
+                    return False
+                db.add(SchedulerLease(user_id=user_id, owner=self.owner, expires_at=now + self.ttl))
+
+            db.commit()
+        except IntegrityError:
+            # Another node inserted the row first
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+        with self._lock:
+            self._held.add(user_id)
+        return True
+
+    def release(self, user_id: int):
+        with self._lock:
+            self._held.discard(user_id)
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.user_id == user_id, SchedulerLease.owner == self.owner)
+                .values(expires_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def holds(self, user_id: int) -> bool:
+        with self._lock:
+            return user_id in self._held
+
+    # ---------------- node lease
+
+    def renew_node(self):
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(SchedulerNode)
+                .where(SchedulerNode.owner == self.owner)
+                .values(expires_at=now + self.ttl)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                db.add(SchedulerNode(owner=self.owner, expires_at=now + self.ttl))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        finally:
+            db.close()
+
+    def release_node(self):
+        db = SessionLocal()
+        try:
+            db.query(SchedulerNode).filter(SchedulerNode.owner == self.owner).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def is_live(self, owner: str) -> bool:
+        """`owner` is this node, or a node whose heartbeat hasn't lapsed"""
+        if owner == self.owner:
+            return True
+        db = SessionLocal()
+        try:
+            return db.query(SchedulerNode.owner).filter(
+                SchedulerNode.owner == owner,
+                SchedulerNode.expires_at >= datetime.utcnow()
+            ).first() is not None
+        finally:
+            db.close()
+
+    # ---------------- heartbeat
+
+    def renew(self):
+        """
+        Extend the node lease and every held lease; forget the ones we
+        turn out to have lost.
+        """
+        self.renew_node()
+
+        with self._lock:
+            held = list(self._held)
+        if not held:
+            return
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.user_id.in_(held), SchedulerLease.owner == self.owner)
+                .values(expires_at=datetime.utcnow() + self.ttl)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            still_ours = {
+                row.user_id for row in
+                db.query(SchedulerLease.user_id)
+                .filter(SchedulerLease.user_id.in_(held), SchedulerLease.owner == self.owner)
+                .all()
+            }
+        finally:
+            db.close()
+
+        with self._lock:
+            self._held -= set(held) - still_ours
+
+    def _heartbeat(self):
+        interval = self.ttl.total_seconds() / 3
+        while not self._stop_event.wait(interval):
+            try:
+                self.renew()
+            except Exception as e:
+                logger.error("lease_heartbeat_failed", owner=self.owner, error=str(e))
+
+    def start_heartbeat(self):
+        if self._heartbeat_thread and self._heartbeat_thread.is_alive():
+            return
+        try:
+            self.renew_node()
+        except Exception as e:
+            logger.error("lease_heartbeat_failed", owner=self.owner, error=str(e))
+        self._stop_event.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat,
+            name="lease-heartbeat",
+            daemon=True
+        )
+        self._heartbeat_thread.start()
+
+    def stop_heartbeat(self):
+        self._stop_event.set()
+        with self._lock:
+            held = list(self._held)
+        for user_id in held:
+            try:
+                self.release(user_id)
+            except Exception as e:
+                logger.warning("lease_release_failed", user_id=user_id, error=str(e))
+        try:
+            self.release_node()
+        except Exception as e:
+            logger.warning("lease_release_failed", owner=self.owner, error=str(e))
+
+
+lease_manager = LeaseManager(SCHEDULER_NODE_ID or default_node_id(), SCHEDULER_LEASE_TTL_SECONDS)
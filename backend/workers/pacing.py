@@ -0,0 +1,255 @@
+# backend/workers/pacing.py
+
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from backend.config import (
+    MAX_EMAILS_PER_DAY,
+    MIN_DELAY_SECONDS,
+    MAX_DELAY_SECONDS,
+    SEND_WINDOW_START_HOUR,
+    SEND_WINDOW_END_HOUR,
+    SEND_WINDOW_DAYS,
+    DEFAULT_TIMEZONE,
+    SEND_PACING_JITTER,
+)
+
+# ======================================================
+# Timezones
+# ======================================================
+
+@lru_cache(maxsize=256)
+def resolve_timezone(name: Optional[str]) -> ZoneInfo:
+    """
+    ZoneInfo for an IANA name, falling back to DEFAULT_TIMEZONE
+    (then UTC) when the name is empty or unknown.
+    """
+    for candidate in (name, DEFAULT_TIMEZONE, "UTC"):
+        if not candidate:
+            continue
+        try:
+            return ZoneInfo(candidate)
+        except (ZoneInfoNotFoundError, ValueError):
+            continue
+    return ZoneInfo("UTC")
+
+
+def is_valid_timezone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+        return True
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+
+
+def to_local(now_utc: datetime, tz: ZoneInfo) -> datetime:
+    """Naive UTC (the repo-wide convention) -> aware local time"""
+    return now_utc.replace(tzinfo=timezone.utc).astimezone(tz)
+
+
+def to_utc(local: datetime) -> datetime:
+    """Aware local time -> naive UTC"""
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def local_day_start(user, now: Optional[datetime] = None) -> datetime:
+    """Naive UTC time of the last midnight in the user's timezone"""
+    local = to_local(now or datetime.utcnow(), resolve_timezone(user.timezone))
+    return to_utc(local.replace(hour=0, minute=0, second=0, microsecond=0))
+
+
+# ======================================================
+# Sending Window
+# ======================================================
+
+def parse_weekdays(spec: str) -> FrozenSet[int]:
+    """
+    "0-4" -> Mon..Fri, "0,2,4" -> Mon/Wed/Fri, "" -> every day.
+    """
+    days = set()
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            days.update(range(int(first), int(last) + 1))
+        else:
+            days.add(int(part))
+    return frozenset(d for d in days if 0 <= d <= 6) or frozenset(range(7))
+
+
+class SendWindow:
+    """
+    Daily sending hours on given weekdays, evaluated in local time.
+    end_hour <= start_hour means the window runs past midnight.
+    """
+
+    def __init__(self, start_hour: int, end_hour: int, weekdays: FrozenSet[int]):
+        self.start_hour = start_hour % 24
+        self.length = timedelta(hours=((end_hour - start_hour) % 24) or 24)
+        self.weekdays = weekdays
+
+    @property
+    def always_open(self) -> bool:
+        """All hours, every day: no window to spread sends across"""
+        return self.length == timedelta(hours=24) and len(self.weekdays) == 7
+
+    def _opening(self, local: datetime, day_offset: int) -> datetime:
+        day = (local + timedelta(days=day_offset)).date()
+        return datetime(day.year, day.month, day.day, self.start_hour, tzinfo=local.tzinfo)
+
+    def current(self, local: datetime) -> Optional[Tuple[datetime, datetime]]:
+        """(start, end) of the window containing `local`, if any"""
+        for offset in (0, -1):
+            start = self._opening(local, offset)
+            end = start + self.length
+            if start.weekday() in self.weekdays and start <= local < end:
+                return start, end
+        return None
+
+    def next_opening(self, local: datetime) -> datetime:
+        for offset in range(8):
+            start = self._opening(local, offset)
+            if start.weekday() in self.weekdays and start > local:
+                return start
+        return local + timedelta(days=1)
+
+
+# ======================================================
+# Pacer
+# ======================================================
+
+class SendPacer:
+    """
+    Per-user next-send timestamps.
+
+    Instead of sleeping after every email, the scheduler asks is_due()
+    and moves on to other users when it isn't. After a send the next
+    slot is the remaining window divided by the remaining quota, with
+    jitter, but never sooner than the old MIN/MAX delay range. Without
+    a window (always open) only the MIN/MAX delay applies. Nothing
+    is scheduled while the queue is empty, so the first email after a
+    quiet period goes out straight away.
+
+    Slots live in this process only; sync() reconciles them with the
+    user's last send whenever this node takes the user's lease.
+    """
+
+    def __init__(
+        self,
+        window: SendWindow,
+        daily_limit: int,
+        min_delay_seconds: int,
+        max_delay_seconds: int,
+        jitter: float
+    ):
+        self.window = window
+        self.daily_limit = daily_limit
+        self.min_delay = min_delay_seconds
+        self.max_delay = max(max_delay_seconds, min_delay_seconds)
+        self.jitter = min(max(jitter, 0.0), 0.9)
+        self._next: Dict[int, datetime] = {}
+        self._basis: Dict[int, datetime] = {}     # send each slot was paced from
+        self._lock = threading.Lock()
+
+    # ---------------- queries
+
+    def next_send_at(self, user_id: int) -> Optional[datetime]:
+        with self._lock:
+            return self._next.get(user_id)
+
+    def is_due(self, user, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.utcnow()
+        local = to_local(now, resolve_timezone(user.timezone))
+        if not self.window.current(local):
+            return False
+        next_at = self.next_send_at(user.id)
+        return next_at is None or next_at <= now
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> Optional[float]:
+        """
+        Time until the earliest future slot, so the loop can wake up
+        for it instead of waiting out a full poll interval.
+        """
+        now = now or datetime.utcnow()
+        with self._lock:
+            upcoming = [t for t in self._next.values() if t > now]
+        if not upcoming:
+            return None
+        return (min(upcoming) - now).total_seconds()
+
+    # ---------------- updates
+
+    def _human_delay(self) -> float:
+        return random.uniform(self.min_delay, self.max_delay)
+
+    def record_send(self, user, sent_today: int, now: Optional[datetime] = None) -> datetime:
+        """
+        Schedule the user's next send after one went out.
+        """
+        now = now or datetime.utcnow()
+        local = to_local(now, resolve_timezone(user.timezone))
+        remaining = self.daily_limit - sent_today
+        with self._lock:
+            self._basis[user.id] = now
+
+        if remaining <= 0:
+            return self.defer_to_next_window(user, now)
+
+        delay = self._human_delay()
+        window = self.window.current(local)
+        if window and not self.window.always_open:
+            spread = (window[1] - local).total_seconds() / remaining
+            delay = max(delay, spread * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+        next_at = now + timedelta(seconds=delay)
+        with self._lock:
+            self._next[user.id] = next_at
+        return next_at
+
+    def defer_to_next_window(self, user, now: Optional[datetime] = None) -> datetime:
+        """Daily quota used up: nothing until the next window opens"""
+        now = now or datetime.utcnow()
+        local = to_local(now, resolve_timezone(user.timezone))
+        opening = self.window.next_opening(local)
+        next_at = to_utc(opening) + timedelta(seconds=random.uniform(0, self.min_delay))
+        with self._lock:
+            self._next[user.id] = next_at
+        return next_at
+
+    def sync(self, user, last_sent_at: Optional[datetime], sent_today: int):
+        """
+        Reconcile with the user's last send (from the database) each
+        time this node takes the lease. The slot is kept when it was
+        paced from that send or a later one; otherwise (restart, or
+        another node sent since) the user is paced from last_sent_at
+        as if this node had sent it.
+        """
+        with self._lock:
+            if user.id in self._next:
+                basis = self._basis.get(user.id)
+                if last_sent_at is None or (basis is not None and last_sent_at <= basis):
+                    return
+            if last_sent_at is None:
+                self._next[user.id] = datetime.min  # never sent: due now
+                return
+        self.record_send(user, sent_today, now=last_sent_at)
+
+    def forget(self, user_id: int):
+        with self._lock:
+            self._next.pop(user_id, None)
+            self._basis.pop(user_id, None)
+
+
+send_pacer = SendPacer(
+    SendWindow(SEND_WINDOW_START_HOUR, SEND_WINDOW_END_HOUR, parse_weekdays(SEND_WINDOW_DAYS)),
+    MAX_EMAILS_PER_DAY,
+    MIN_DELAY_SECONDS,
+    MAX_DELAY_SECONDS,
+    SEND_PACING_JITTER
+)
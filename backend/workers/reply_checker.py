@@ -0,0 +1,316 @@
+# backend/workers/reply_checker.py
+
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import select, update, or_
+from sqlalchemy.exc import IntegrityError
+
+from backend.db.database import SessionLocal  # ✅ Import SessionLocal directly
+from backend.models.user import User
+from backend.models.campaign import Campaign
+from backend.models.reply_check import ReplyCheckRun, ReplyCheckProgress
+from backend.services.gmail_service import check_replies
+from backend.services.user_cache import get_user_profile
+from backend.services.campaigns import campaign_list_ids
+from backend.services.contact_sources import LOCAL_SOURCE, FILE_SOURCE
+from backend.services.profiler import profiled
+from backend.services.structured_log import get_logger, log_context, new_correlation_id, with_log_context
+from backend.workers.leasing import lease_manager
+from backend.config import (
+    REPLY_CHECK_WORKERS,
+    REPLY_CHECK_USER_BUDGET_SECONDS,
+    REPLY_CHECK_CHECKPOINT_ROWS,
+)
+
+logger = get_logger("reply_checker")
+
+# ======================================================
+# Progress States
+# ======================================================
+
+RUNNING = "RUNNING"
+DONE = "DONE"
+TIMED_OUT = "TIMED_OUT"    # budget ran out; resumes from next_row, same day too
+FAILED = "FAILED"          # resumes from the last checkpoint, same day too
+SKIPPED = "SKIPPED"        # not recorded: no Gmail, done today, or busy elsewhere
+
+# A RUNNING row older than this is taken over even if its node still
+# looks alive; one whose node's lease lapsed is taken over at once
+STALE_AFTER = timedelta(seconds=REPLY_CHECK_USER_BUDGET_SECONDS * 2)
+
+# Left unfinished today: picked up again by resume runs
+RESUMABLE = (RUNNING, TIMED_OUT, FAILED)
+
+
+# ======================================================
+# Checkpoints
+# ======================================================
+
+def claim_user(db, user_id: int, run_date: date, owner: str) -> Optional[Tuple[Optional[str], int]]:
+    """
+    Mark the user's reply check as RUNNING for this run.
+    Returns the list and sheet row to start from (list None: the
+    user's first list), or None when the user was already checked
+    today or another worker is checking them now. A check that timed
+    out or failed, or whose worker died, continues from its checkpoint.
+    """
+    now = datetime.utcnow()
+    progress = db.get(ReplyCheckProgress, user_id)
+
+    if progress is None:
+        db.add(ReplyCheckProgress(
+            user_id=user_id,
+            run_date=run_date,
+            status=RUNNING,
+            list_id=None,
+            next_row=2,
+            owner=owner,
+            started_at=now
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return None
+        return None, 2
+
+    if progress.run_date == run_date and progress.status == DONE:
+        return None
+    if (
+        progress.status == RUNNING
+        and progress.started_at > now - STALE_AFTER
+        and lease_manager.is_live(progress.owner)
+    ):
+        return None
+
+    # Pick up where an unfinished check stopped; a finished one starts over
+    if progress.status == DONE:
+        list_id, start_row = None, 2
+    else:
+        list_id, start_row = progress.list_id, progress.next_row
+
+    result = db.execute(
+        update(ReplyCheckProgress)
+        .where(
+            ReplyCheckProgress.user_id == user_id,
+            ReplyCheckProgress.status == progress.status,
+            ReplyCheckProgress.started_at == progress.started_at
+        )
+        .values(
+            run_date=run_date,
+            status=RUNNING,
+            list_id=list_id,
+            next_row=start_row,
+            owner=owner,
+            started_at=now,
+            finished_at=None,
+            error=None
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    # Lost the race to another node
+    if result.rowcount == 0:
+        return None
+    return list_id, start_row
+
+
+def save_progress(db, user_id: int, owner: str, **values):
+    db.execute(
+        update(ReplyCheckProgress)
+        .where(ReplyCheckProgress.user_id == user_id, ReplyCheckProgress.owner == owner)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+# ======================================================
+# Per-user Check
+# ======================================================
+
+def check_user_replies(user_id: int, run_date: date, owner: str) -> Tuple[str, Counter]:
+    """
+    Reply check for one user in its own session and time budget.
+    Returns the final status and the API calls made.
+    """
+    with log_context(user_id=user_id):
+        return _check_user_replies(user_id, run_date, owner)
+
+
+def _check_user_replies(user_id: int, run_date: date, owner: str) -> Tuple[str, Counter]:
+    api_calls = Counter()
+    db = SessionLocal()
+    try:
+        user = get_user_profile(db, user_id)
+        list_ids = campaign_list_ids(db, user) if user else ()
+        if not list_ids or not user.gmail_token_path:
+            return SKIPPED, api_calls
+
+        claimed = claim_user(db, user_id, run_date, owner)
+        if claimed is None:
+            return SKIPPED, api_calls
+
+        # Lists are checked one after another, all in one time budget.
+        # A list removed since the checkpoint: start from the first
+        list_id, start_row = claimed
+        if list_id not in list_ids:
+            list_id, start_row = list_ids[0], 2
+        deadline = time.monotonic() + REPLY_CHECK_USER_BUDGET_SECONDS
+
+        for sheet_id in list_ids[list_ids.index(list_id):]:
+            save_progress(db, user_id, owner, list_id=sheet_id, next_row=start_row)
+            try:
+                next_row = check_replies(
+                    db,
+                    user,
+                    sheet_id,
+                    start_row=start_row,
+                    deadline=deadline,
+                    on_checkpoint=lambda row: save_progress(db, user_id, owner, next_row=row),
+                    checkpoint_every=REPLY_CHECK_CHECKPOINT_ROWS,
+                    api_calls=api_calls
+                )
+            except Exception as e:
+                logger.error("reply_check_failed", sheet_id=sheet_id, start_row=start_row, error=str(e))
+                db.rollback()
+                save_progress(
+                    db, user_id, owner,
+                    status=FAILED,
+                    finished_at=datetime.utcnow(),
+                    error=str(e)[:500]
+                )
+                return FAILED, api_calls
+
+            if next_row is not None:
+                logger.warning("reply_check_timed_out", sheet_id=sheet_id, row=next_row)
+                save_progress(db, user_id, owner, status=TIMED_OUT, next_row=next_row, finished_at=datetime.utcnow())
+                return TIMED_OUT, api_calls
+
+            start_row = 2
+
+        save_progress(db, user_id, owner, status=DONE, list_id=None, next_row=2, finished_at=datetime.utcnow())
+        return DONE, api_calls
+    except Exception as e:
+        # DB trouble around the check itself
+        logger.error("reply_check_failed", error=str(e))
+        return FAILED, api_calls
+    finally:
+        db.close()  # ✅ Always close session
+
+
+# ======================================================
+# Daily Run
+# ======================================================
+
+@profiled("reply_check", thread_prefix="reply-check")
+def check_all_replies_daily(resume_only: bool = False):
+    """
+    Check replies for every user on a worker pool. Users already checked
+    today are skipped, so re-running after a crash resumes the run.
+    With resume_only, only continues what today's run left unfinished:
+    the whole run if it was cut short, else the users whose check
+    timed out, failed or lost its worker.
+    """
+    with log_context(pass_id=new_correlation_id()):
+        _check_all_replies(resume_only)
+
+
+def _check_all_replies(resume_only: bool):
+    run_date = date.today()
+    owner = lease_manager.owner
+    started = time.monotonic()
+
+    db = SessionLocal()
+    try:
+        run = db.get(ReplyCheckRun, run_date)
+        if resume_only and run is None:
+            return
+
+        if run is None:
+            db.add(ReplyCheckRun(run_date=run_date, started_at=datetime.utcnow()))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another node started today's run; users are claimed one by one
+                db.rollback()
+
+        user_ids = [
+            row.id for row in
+            db.query(User.id).filter(or_(
+                User.sheet_id.isnot(None),
+                User.contact_source.in_((LOCAL_SOURCE, FILE_SOURCE)),
+                User.id.in_(select(Campaign.user_id))
+            )).all()
+        ]
+
+        if resume_only and run.finished_at is not None:
+            unfinished = {
+                row.user_id for row in
+                db.query(ReplyCheckProgress.user_id).filter(
+                    ReplyCheckProgress.run_date == run_date,
+                    ReplyCheckProgress.status.in_(RESUMABLE)
+                ).all()
+            }
+            user_ids = [user_id for user_id in user_ids if user_id in unfinished]
+            if not user_ids:
+                return
+    finally:
+        db.close()
+
+    statuses = Counter()
+    api_calls = Counter()
+
+    with ThreadPoolExecutor(max_workers=REPLY_CHECK_WORKERS, thread_name_prefix="reply-check") as pool:
+        results = pool.map(
+            with_log_context(lambda user_id: check_user_replies(user_id, run_date, owner)),
+            user_ids
+        )
+        for status, user_calls in results:
+            statuses[status] += 1
+            api_calls.update(user_calls)
+
+    duration = time.monotonic() - started
+
+    db = SessionLocal()
+    try:
+        run = db.get(ReplyCheckRun, run_date)
+        run.finished_at = datetime.utcnow()
+        run.users_done = (run.users_done or 0) + statuses[DONE]
+        run.users_failed = (run.users_failed or 0) + statuses[FAILED]
+        run.users_timed_out = (run.users_timed_out or 0) + statuses[TIMED_OUT]
+        run.gmail_calls = (run.gmail_calls or 0) + api_calls["gmail"]
+        run.sheets_calls = (run.sheets_calls or 0) + api_calls["sheets"]
+        run.duration_seconds = (run.duration_seconds or 0) + duration
+        db.commit()
+    except Exception as e:
+        logger.error("reply_check_summary_failed", error=str(e))
+    finally:
+        db.close()
+
+    logger.info(
+        "reply_check_finished",
+        run_date=run_date.isoformat(),
+        users=len(user_ids),
+        duration_seconds=round(duration, 1),
+        done=statuses[DONE],
+        timed_out=statuses[TIMED_OUT],
+        failed=statuses[FAILED],
+        skipped=statuses[SKIPPED],
+        gmail_calls=api_calls["gmail"],
+        sheets_calls=api_calls["sheets"]
+    )
+
+
+def resume_interrupted_reply_check():
+    """
+    Run at startup and every REPLY_CHECK_RESUME_INTERVAL_SECONDS: finish
+    today's reply check if it was cut short, and retry users it didn't
+    finish
+    """
+    check_all_replies_daily(resume_only=True)
@@ -1,66 +1,102 @@
 # backend/workers/scheduler.py
 
-import time
-import random
-from datetime import datetime, date
+import threading
+from datetime import datetime, date, timedelta
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import func
 
 from backend.db.database import SessionLocal  # ✅ Import SessionLocal directly
 from backend.models.user import User
-
-from backend.services.sheets_service import read_all_rows
+from backend.services.user_cache import get_user_profile
+from backend.services.token_store import credential_cache
+from backend.services.message_ledger import message_ledger
+from backend.services.metrics import SCHEDULER_PASS_SECONDS, SENDS_SUPPRESSED, track
+from backend.services.profiler import profiled, profile_phase
+from backend.services.structured_log import get_logger, log_context, new_correlation_id
+from backend.workers.campaign_mux import daily_allowances, multiplex
+from backend.workers.leasing import lease_manager
+from backend.workers.domain_throttle import Candidate, DomainSpread, domain_throttle
+from backend.workers.pacing import local_day_start, send_pacer
+from backend.workers.send_order import select_candidates
+
+from backend.services.campaigns import CampaignProfile, active_campaigns, campaign_source, find_campaign
+from backend.services.contact_sources import BOUNCED, ContactSource, RowUpdate, contact_list_id, source_for_list
+from backend.services.email_validation import email_validator
 from backend.services.gmail_service import (
     send_email,
-    check_replies,
-    check_bounces
+    is_bounce_error,
+    PostSendError,
 )
-from backend.utils.template_engine import render_template
+from backend.services.send_queue import send_queue, make_idempotency_key, DONE, DEAD
+from backend.services import suppression
+from backend.services.suppression import suppression_index
 from backend.config import (
     MAX_EMAILS_PER_DAY,
-    MIN_DELAY_SECONDS,
-    MAX_DELAY_SECONDS
+    SCHEDULER_POLL_SECONDS,
+    SEND_JOB_BATCH_SIZE,
 )
 
+logger = get_logger("scheduler")
+
 # ======================================================
 # Scheduler Helpers
 # ======================================================
 
-def daily_send_count(db, user_id):
+def daily_send_count(db, user):
+    """Emails sent since midnight in the user's timezone"""
     from backend.models.email_log import EmailLog
-    today = date.today()
     return db.query(EmailLog).filter(
-        EmailLog.user_id == user_id,
-        EmailLog.sent_at >= today
+        EmailLog.user_id == user.id,
+        EmailLog.sent_at >= local_day_start(user)
     ).count()
 
 
-# ======================================================
-# Per-user Scheduler
-# ======================================================
+def last_sent_at(db, user_id):
+    """The user's latest send (bounce and reply records aren't sends)"""
+    from backend.models.email_log import EmailLog
+    return db.query(func.max(EmailLog.sent_at)).filter(
+        EmailLog.user_id == user_id,
+        EmailLog.status.notin_(["BOUNCED", "REPLIED"])
+    ).scalar()
 
-def run_scheduler_for_user(db, user):
-    if not user.sheet_id:
-        return
 
-    sheet_id = user.sheet_id
+def campaign_sends_today(db, user):
+    """campaign_id (None for the default campaign) -> emails sent today (user's timezone)"""
+    from backend.models.send_job import SendJob
+    rows = db.query(SendJob.campaign_id, func.count(SendJob.id)).filter(
+        SendJob.user_id == user.id,
+        SendJob.status == DONE,
+        SendJob.completed_at >= local_day_start(user)
+    ).group_by(SendJob.campaign_id).all()
+    return {campaign_id: count for campaign_id, count in rows}
 
-    # 1️⃣ Check bounces first
-    try:
-        check_bounces(db, user, sheet_id)
-    except Exception as e:
-        print(f"Error checking bounces for {user.email}: {e}")
 
-    try:
-        rows = read_all_rows(sheet_id)
-    except Exception as e:
-        print(f"Error reading sheet for {user.email}: {e}")
-        return
+def recent_sends(db, user_id):
+    """(to_email, sent_at) for the user's sends in the last hour"""
+    from backend.models.email_log import EmailLog
+    return db.query(EmailLog.to_email, EmailLog.sent_at).filter(
+        EmailLog.user_id == user_id,
+        EmailLog.sent_at >= datetime.utcnow() - timedelta(hours=1),
+        EmailLog.status.notin_(["BOUNCED", "REPLIED"])
+    ).all()
 
-    for row_index, row in enumerate(rows, start=2):
 
-        # Gmail daily safety
-        if daily_send_count(db, user.id) >= MAX_EMAILS_PER_DAY:
-            return
+# ======================================================
+# Send Queue Producer
+# ======================================================
 
+# Rows whose queue status is looked up in one query
+_STATUS_CHUNK = 500
+
+
+def _due_candidates(rows, cadence):
+    """
+    Rows from `rows` that should get their next email, as Candidates.
+    """
+    for row_index, row in rows:
         email = row[0] if len(row) > 0 else ""
         name = row[1] if len(row) > 1 else ""
         company = row[2] if len(row) > 2 else ""
@@ -78,113 +114,494 @@ def run_scheduler_for_user(db, user):
         if replied == "TRUE" or bounced == "TRUE":
             continue
         
-        # Stop if already sent 5 emails
-        if current_followup_count >= 5:
+        # Stop once the cadence has run out (5 emails by default)
+        if cadence.is_finished(current_followup_count):
             continue
 
         # Respect scheduled date
+        due_date = None
         if next_send:
             try:
-                if datetime.strptime(next_send, "%Y-%m-%d").date() > date.today():
+                due_date = datetime.strptime(next_send, "%Y-%m-%d").date()
+                if due_date > date.today():
                     continue
             except ValueError:
                 pass
 
-        # Choose template based on followup count
-        if current_followup_count == 0:
-            # Initial email
-            template = user.email_template or "Hi {Name},\n\nBest regards,\n{MyName}"
-        else:
-            # Follow-up emails (use followup template if available, else use initial)
-            template = user.followup_template or user.email_template or "Hi {Name},\n\nBest regards,\n{MyName}"
-
-        # Use user's custom subject or default
-        subject = user.email_subject or "Application / Follow-up"
-
-        # Proper placeholder replacement
-        email_body = render_template(template, {
-            "Name": name or "Hiring Manager",
-            "Company": company or "",
+        # Calculate NEW followup count (increment before sending)
+        yield Candidate(row_index, email, name, company, current_followup_count + 1, due_date)
+
+
+def _unqueued(db, user, contacts, candidates: Iterable[Candidate]) -> Iterator[Candidate]:
+    """
+    The candidates that may still be sent: no finished job for the same
+    email, and not suppressed. Runs before ranking: a DEAD job never
+    updates its row, so such rows stay due and, ranked first, would
+    take the whole pass's budget every day.
+    """
+    candidates = iter(candidates)
+    while True:
+        chunk = list(islice(candidates, _STATUS_CHUNK))
+        if not chunk:
+            return
+
+        keys = [
+            make_idempotency_key(contacts.list_id, c.row_number, c.followup_count, c.email)
+            for c in chunk
+        ]
+        statuses = send_queue.statuses(db, keys)
+
+        for candidate, key in zip(chunk, keys):
+            status = statuses.get(key)
+            if status == DEAD:
+                continue
+
+            # Sent earlier but the sheet update was lost: repair the row
+            if status == DONE:
+                try:
+                    contacts.mark_sent(candidate.row_number, candidate.followup_count)
+                except Exception as e:
+                    logger.error("sheet_repair_failed", row=candidate.row_number, followup_count=candidate.followup_count, error=str(e))
+                continue
+
+            # Bounced / unsubscribed anywhere, replied to this user, or an
+            # initial email to an address this user already contacted
+            if suppression_index.check(db, user.id, candidate.email, initial=candidate.followup_count == 1):
+                continue
+
+            yield candidate
+
+
+def select_rows(db, user, contacts, rows, limit: Optional[int] = None) -> List[Candidate]:
+    """
+    The rows from the ContactSource `contacts` that this pass should
+    queue, at most `limit`, in the order to queue them. Addresses that
+    can't receive mail are marked bounced (in one write) instead, and
+    suppressed like real bounces so nobody validates them again.
+
+    Which due rows get the budget is decided by SEND_ORDER_POLICY over
+    the whole list, once per pass. The chosen rows come back
+    round-robin across recipient domains, so the queue (sent in id
+    order) alternates companies instead of working through one
+    company's rows back to back.
+    """
+    invalid = []
+    spread = DomainSpread(limit)
+    due = _unqueued(db, user, contacts, _due_candidates(rows, contacts.cadence))
+
+    for candidate in select_candidates(due, limit):
+        # Bad syntax or no mail server: don't spend quota and a pacing slot on it
+        error = email_validator.validate(candidate.email)
+        if error:
+            invalid.append(RowUpdate(candidate.row_number, BOUNCED, error=error))
+            suppression_index.add(db, user.id, candidate.email, suppression.BOUNCED)
+            continue
+
+        spread.add(candidate)
+        if spread.full:
+            break
+
+    if invalid:
+        # Suppressed even if the sheet write below fails
+        db.commit()
+        try:
+            contacts.apply(invalid)
+            logger.info("invalid_addresses_marked", count=len(invalid))
+        except Exception as e:
+            logger.error("invalid_addresses_mark_failed", count=len(invalid), error=str(e))
+
+    return list(spread)
+
+
+def _enqueue(db, user, contacts, candidate: Candidate, campaign_id: Optional[int] = None):
+    return send_queue.enqueue(
+        db,
+        user_id=user.id,
+        sheet_id=contacts.list_id,
+        row_number=candidate.row_number,
+        to_email=candidate.email,
+        followup_count=candidate.followup_count,
+        name=candidate.name,
+        company=candidate.company,
+        campaign_id=campaign_id
+    )
+
+
+def enqueue_eligible_rows(db, user, contacts, rows, limit: Optional[int] = None, campaign_id: Optional[int] = None):
+    """
+    Turn every (row_number, row) from the ContactSource `contacts`
+    that is due into a send job. Jobs are keyed by list/row/followup
+    step, so re-scanning the list never queues the same email twice.
+    Stops once `limit` jobs are waiting: more than today's quota would
+    only sit in the queue.
+    """
+    waiting = 0
+    for candidate in select_rows(db, user, contacts, rows, limit):
+        if limit is not None and waiting >= limit:
+            break
+        job = _enqueue(db, user, contacts, candidate, campaign_id)
+        if job.status not in (DONE, DEAD):
+            waiting += 1
+
+
+def campaign_sources(db, user, campaigns) -> Dict[Optional[int], ContactSource]:
+    """
+    campaign id -> its contact list for this pass. Sent marks are held
+    and written once at the end of the pass (see flush_sources).
+    """
+    sources = {}
+    for campaign in campaigns:
+        try:
+            contacts = campaign_source(db, user, campaign)
+        except Exception as e:
+            logger.error("sheet_read_failed", campaign_id=campaign.id, error=str(e))
+            continue
+        contacts.hold_sent_marks()
+        sources[campaign.id] = contacts
+    return sources
+
+
+def flush_sources(sources: Dict[Optional[int], ContactSource]):
+    for campaign_id, contacts in sources.items():
+        try:
+            contacts.flush()
+        except Exception as e:
+            # The rows are repaired from the queue on the next pass
+            logger.error("sheet_update_failed", campaign_id=campaign_id, error=str(e))
+
+
+def enqueue_campaigns(db, user, campaigns, sources: Dict[Optional[int], ContactSource], limit: int):
+    """
+    enqueue_eligible_rows across the user's campaigns, sharing one
+    budget of `limit` waiting jobs. Each campaign's due rows are picked
+    as for a single list; the campaigns are then interleaved by daily
+    share (see campaign_mux), and a campaign with nothing due leaves
+    its part of the budget to the others. A campaign whose list can't
+    be read is skipped for this pass.
+    """
+    candidates = {}
+    for campaign in campaigns:
+        contacts = sources.get(campaign.id)
+        if contacts is None:
+            continue
+        try:
+            # Due rows only, one batch at a time
+            rows = contacts.iter_rows(due_only=True)
+            candidates[campaign.id] = select_rows(db, user, contacts, rows, limit)
+        except Exception as e:
+            logger.error("sheet_read_failed", campaign_id=campaign.id, error=str(e))
+
+    shares = {campaign.id: campaign.daily_share for campaign in campaigns}
+    allowances = daily_allowances(shares, MAX_EMAILS_PER_DAY, campaign_sends_today(db, user))
+
+    waiting = 0
+    for campaign_id, candidate in multiplex(candidates, shares, allowances):
+        if waiting >= limit:
+            break
+        job = _enqueue(db, user, sources[campaign_id], candidate, campaign_id)
+        if job.status not in (DONE, DEAD):
+            waiting += 1
+
+
+# ======================================================
+# Send Queue Consumer
+# ======================================================
+
+def process_send_job(
+    db,
+    user,
+    job,
+    campaign: Optional[CampaignProfile] = None,
+    contacts: Optional[ContactSource] = None
+) -> bool:
+    """
+    Render and send one job with the templates and subject of
+    `campaign` (the user's own settings if not given), writing back to
+    `contacts` (the campaign's list if not given). Returns True if the
+    email went out.
+    """
+    campaign = campaign or CampaignProfile.default_for(user)
+
+    # Re-checked here: entries may have been added since the job was
+    # queued, and an initial email must not repeat one sent from another row
+    reason = suppression_index.check(db, user.id, job.to_email, initial=job.followup_count == 1)
+    if reason:
+        SENDS_SUPPRESSED.inc(reason=reason)
+        logger.info("send_suppressed", to_email=job.to_email, reason=reason)
+        send_queue.fail(db, job, f"Suppressed: {reason}", permanent=True)
+        return False
+
+    # Initial or follow-up template, compiled once per campaign snapshot
+    template = campaign.template_for(job.followup_count)
+
+    # Proper placeholder replacement
+    with profile_phase("render"):
+        email_body = template.render({
+            "Name": job.name or "Hiring Manager",
+            "Company": job.company or "",
             "MyName": user.full_name or user.email,
             "ResumeLink": user.resume_link or "",
             # Alternative placeholder formats
             "My Name": user.full_name or user.email,
-            "company": company or "",
+            "company": job.company or "",
             "Resume Link": user.resume_link or ""
         })
 
-        # Calculate NEW followup count (increment before sending)
-        new_followup_count = current_followup_count + 1
+    # Queued before the user switched lists: write back to the old one
+    if job.sheet_id == campaign.list_id:
+        contacts = contacts or campaign_source(db, user, campaign)
+    else:
+        contacts = source_for_list(db, user, job.sheet_id, cadence=campaign.cadence)
+
+    send_queue.mark_sending(db, job)
+
+    try:
+        send_email(
+            db=db,
+            user=user,
+            sheet_id=job.sheet_id,
+            to_email=job.to_email,
+            subject=campaign.email_subject,
+            body=email_body,
+            row_number=job.row_number,
+            followup_count=job.followup_count,
+            contacts=contacts
+        )
+    except PostSendError as e:
+        # Gmail accepted it; only the sheet/log update failed
+        logger.error("send_bookkeeping_failed", to_email=job.to_email, error=str(e))
+    except Exception as e:
+        permanent = is_bounce_error(str(e))
+        logger.error("send_failed", to_email=job.to_email, permanent=permanent, attempt=job.attempts, error=str(e))
+        send_queue.fail(db, job, str(e), permanent=permanent)
+        return False
+
+    send_queue.ack(db, job)
+    logger.info("email_sent", to_email=job.to_email)
+    return True
+
+
+# ======================================================
+# Per-user Scheduler
+# ======================================================
+
+def run_scheduler_for_user(db, user, still_owner: Optional[Callable[[], bool]] = None):
+    """
+    One send pass for a user: queue due rows, then send queued jobs
+    for as long as the pacer says the user is due. Returns as soon as
+    the next slot is in the future instead of sleeping, so other users
+    get their turn. still_owner() is checked before every send so a
+    node that lost its lease stops sending for this user.
+
+    All of the user's active campaigns share the one daily limit; see
+    enqueue_campaigns. Only passes that get past the pacer and quota
+    checks are profiled (see _run_send_pass).
+    """
+    campaigns = active_campaigns(db, user)
+    if not campaigns:
+        return
+
+    # Leases move between nodes every pass: other nodes may have sent
+    # for this user since this one last did, so pace from the database
+    sent_today = daily_send_count(db, user)
+    send_pacer.sync(user, last_sent_at(db, user.id), sent_today)
+    domain_throttle.load(user.id, recent_sends(db, user.id))
+
+    # Outside the sending window or between slots: skip the sheet read too
+    if not send_pacer.is_due(user):
+        return
+
+    # Quota used up: skip the contact read too
+    remaining = MAX_EMAILS_PER_DAY - sent_today
+    if remaining <= 0:
+        send_pacer.defer_to_next_window(user)
+        return
+
+    _run_send_pass(db, user, campaigns, remaining, still_owner)
+
+
+@profiled("send_pass", label=lambda db, user, *args, **kwargs: user.id)
+def _run_send_pass(db, user, campaigns, remaining: int, still_owner: Optional[Callable[[], bool]]):
+    """The part of a pass that reads contacts and sends"""
+    by_id = {campaign.id: campaign for campaign in campaigns}
+
+    # Jobs left behind by a crashed pass
+    send_queue.recover_stale(db, user.id, lease_manager.owner)
+
+    sources = campaign_sources(db, user, campaigns)
+    try:
+        enqueue_campaigns(db, user, campaigns, sources, limit=remaining)
+        _send_queued(db, user, by_id, sources, still_owner)
+    finally:
+        flush_sources(sources)
+
+
+def _park_orphaned_job(db, user, job):
+    """
+    A claimed job whose campaign isn't active. Deleted campaigns
+    dead-letter it; paused ones (or ones without a contact list) drop
+    it, so the row is queued afresh once the campaign is active again
+    instead of the job being deferred over and over.
+    """
+    if find_campaign(db, user, job.campaign_id) is None:
+        logger.info("send_job_campaign_deleted", job_id=job.id, campaign_id=job.campaign_id)
+        send_queue.fail(db, job, "Campaign deleted", permanent=True)
+    else:
+        logger.info("send_job_campaign_inactive", job_id=job.id, campaign_id=job.campaign_id)
+        send_queue.drop(db, job)
+
+
+def _send_queued(db, user, by_id, sources, still_owner: Optional[Callable[[], bool]]):
+    """Send queued jobs while the pacer says the user is due"""
+    while True:
+        # Gmail daily safety
+        remaining = MAX_EMAILS_PER_DAY - daily_send_count(db, user)
+        if remaining <= 0:
+            send_pacer.defer_to_next_window(user)
+            return
+
+        jobs = send_queue.claim_batch(
+            db,
+            user.id,
+            lease_manager.owner,
+            min(SEND_JOB_BATCH_SIZE, remaining)
+        )
+        if not jobs:
+            return
 
         try:
-            thread_id = send_email(
-                db=db,
-                user=user,
-                sheet_id=sheet_id,
-                to_email=email,
-                subject=subject,
-                body=email_body,
-                row_number=row_index,
-                followup_count=new_followup_count
-            )
-
-            # Human-like delay
-            time.sleep(random.randint(
-                MIN_DELAY_SECONDS,
-                MAX_DELAY_SECONDS
-            ))
+            for job in jobs:
+                # Next slot not reached yet: yield to the other users
+                if not send_pacer.is_due(user):
+                    return
+
+                # Another node took over this user
+                if still_owner and not still_owner():
+                    return
+
+                # Domain at its cap or cooling down: the next job may not be
+                allowed = domain_throttle.next_allowed(user.id, job.to_email)
+                if allowed > datetime.utcnow():
+                    logger.info("send_deferred_for_domain", to_email=job.to_email, until=allowed.isoformat())
+                    send_queue.defer(db, job, allowed)
+                    continue
 
-        except Exception as e:
-            print(f"Error sending to {email}: {e}")
-            continue
+                # Campaign paused or deleted since the job was queued
+                campaign = by_id.get(job.campaign_id)
+                if campaign is None:
+                    _park_orphaned_job(db, user, job)
+                    continue
+
+                with log_context(row=job.row_number, followup_count=job.followup_count, campaign_id=job.campaign_id):
+                    sent = process_send_job(db, user, job, campaign, sources.get(campaign.id))
+                if sent:
+                    domain_throttle.record(user.id, job.to_email)
+                    send_pacer.record_send(user, daily_send_count(db, user))
+        finally:
+            send_queue.release(db, jobs)
 
 
 # ======================================================
-# Reply Checker (Separate Function - Run Once Daily)
+# Token Prefetch (Run Periodically)
 # ======================================================
 
-def check_all_replies_daily():
+def prefetch_gmail_tokens():
     """
-    Separate task that runs once per day to check for replies.
+    Refresh access tokens that expire soon so sends never block on OAuth.
     """
-    db = SessionLocal()  # ✅ Create session properly
+    db = SessionLocal()
     try:
-        users = db.query(User).all()
+        user_ids = [
+            row.id for row in
+            db.query(User.id).filter(User.gmail_token_path.isnot(None)).all()
+        ]
+    finally:
+        db.close()
 
-        for user in users:
-            if not user.sheet_id:
-                continue
-            
-            try:
-                check_replies(db, user, user.sheet_id)
-            except Exception as e:
-                print(f"Error checking replies for {user.email}: {e}")
+    credential_cache.prefetch(user_ids)
+
+
+# ======================================================
+# Ledger Cleanup (Run Daily)
+# ======================================================
+
+def prune_processed_messages():
+    """
+    Drop expired entries from the processed-message ledger.
+    """
+    db = SessionLocal()
+    try:
+        message_ledger.prune(db)
+    except Exception as e:
+        logger.error("ledger_prune_failed", error=str(e))
     finally:
-        db.close()  # ✅ Always close session
+        db.close()
 
 
 # ======================================================
 # Main Loop
 # ======================================================
 
-def scheduler_loop():
+def run_scheduler_pass(stop_event: threading.Event):
     """
-    Main sending loop - checks continuously for emails to send.
+    One pass over all users: every user this node can lease gets a
+    send pass.
     """
-    while True:
-        db = SessionLocal()  # ✅ Create new session for each iteration
-        try:
-            users = db.query(User).all()
+    db = SessionLocal()  # ✅ Create new session for each iteration
+    try:
+        user_ids = [row.id for row in db.query(User.id).all()]
 
-            for user in users:
-                if user.is_paused:
-                    continue
+        for user_id in user_ids:
+            if stop_event.is_set():
+                break
 
-                try:
-                    run_scheduler_for_user(db, user)
-                except Exception as e:
-                    print(f"Scheduler error for {user.email}: {e}")
-        finally:
-            db.close()  # ✅ Always close session
+            # Settings come from the shared profile cache
+            user = get_user_profile(db, user_id)
+            if not user or user.is_paused:
+                continue
+
+            # Skip users another scheduler node is working on
+            if not lease_manager.try_acquire(user_id):
+                continue
+
+            try:
+                with log_context(user_id=user_id, sheet_id=contact_list_id(user)):
+                    run_scheduler_for_user(
+                        db,
+                        user,
+                        still_owner=partial(lease_manager.holds, user_id)
+                    )
+            except Exception:
+                logger.exception("user_pass_failed", user_id=user_id)
+            finally:
+                lease_manager.release(user_id)
+    finally:
+        db.close()  # ✅ Always close session
+
+
+def scheduler_loop(stop_event: threading.Event = None):
+    """
+    Main sending loop - checks continuously for emails to send.
+    Runs until stop_event is set (forever if none is given).
+    """
+    stop_event = stop_event or threading.Event()
+    lease_manager.start_heartbeat()
 
-        time.sleep(60)  # Check every minute
\ No newline at end of file
+    try:
+        while not stop_event.is_set():
+            try:
+                # One correlation id for every line of this pass
+                with log_context(pass_id=new_correlation_id()), track(SCHEDULER_PASS_SECONDS):
+                    run_scheduler_pass(stop_event)
+            except Exception:
+                # Keep the loop alive across DB outages
+                logger.exception("scheduler_pass_failed")
+
+            # Wake up early for the next paced send, otherwise every minute
+            wait_seconds = SCHEDULER_POLL_SECONDS
+            next_due = send_pacer.seconds_until_next()
+            if next_due is not None:
+                wait_seconds = max(1, min(wait_seconds, next_due))
+            stop_event.wait(wait_seconds)
+    finally:
+        lease_manager.stop_heartbeat()
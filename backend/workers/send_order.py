@@ -0,0 +1,121 @@
+# backend/workers/send_order.py
+
+import heapq
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.config import (
+    SEND_ORDER_POLICY,
+    SEND_ORDER_WEIGHTS,
+    SEND_CANDIDATE_LOOKAHEAD,
+)
+from backend.workers.domain_throttle import Candidate, domain_key
+
+# ======================================================
+# Policies
+# ======================================================
+
+SHEET = "sheet"
+OVERDUE = "overdue"
+FOLLOWUP = "followup"
+ROUND_ROBIN = "round_robin"
+WEIGHTED = "weighted"
+
+# Priority of a candidate: smaller goes first
+SortKey = Callable[[Candidate], Tuple]
+
+
+def days_overdue(candidate: Candidate, today: date) -> int:
+    """Days past Next_Send_Date; rows without one are due today"""
+    if candidate.due_date is None:
+        return 0
+    return max((today - candidate.due_date).days, 0)
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """ "overdue=1,followup=2,initial=1" """
+    weights = {"overdue": 1.0, "followup": 0.0, "initial": 0.0}
+    for item in spec.split(","):
+        name, _, value = item.strip().partition("=")
+        if name in weights:
+            try:
+                weights[name] = float(value)
+            except ValueError:
+                pass
+    return weights
+
+
+def priority(policy: str, today: date, weights: Optional[Dict[str, float]] = None) -> SortKey:
+    """
+    The priority function for `policy`. Unknown policies fall back to
+    sheet order (every row equal).
+    """
+    if policy == OVERDUE:
+        return lambda c: (-days_overdue(c, today),)
+
+    if policy == FOLLOWUP:
+        return lambda c: (-c.followup_count, -days_overdue(c, today))
+
+    if policy == ROUND_ROBIN:
+        # n-th row of its stage: every stage's first row, then every
+        # stage's second row, ... Counted as rows stream past, in sheet order
+        seen: Dict[int, int] = {}
+
+        def turn(c: Candidate) -> Tuple:
+            position = seen.get(c.followup_count, 0)
+            seen[c.followup_count] = position + 1
+            return (position, c.followup_count)
+        return turn
+
+    if policy == WEIGHTED:
+        weights = weights or parse_weights(SEND_ORDER_WEIGHTS)
+
+        def score(c: Candidate) -> Tuple:
+            stage = weights["initial"] if c.followup_count == 1 else weights["followup"] * (c.followup_count - 1)
+            return (-(weights["overdue"] * days_overdue(c, today) + stage),)
+        return score
+
+    return lambda c: ()
+
+
+def sort_key(policy: str, today: date) -> SortKey:
+    """
+    Priority, then the row's turn within its domain (so equally good
+    rows alternate companies, see domain_throttle), then sheet order.
+    """
+    rank = priority(policy, today)
+    if policy == SHEET:
+        return lambda c: (c.row_number,)
+
+    seen: Dict[str, int] = {}
+
+    def key(c: Candidate) -> Tuple:
+        domain = domain_key(c.email)
+        turn = seen.get(domain, 0)
+        seen[domain] = turn + 1
+        return rank(c) + (turn, c.row_number)
+    return key
+
+
+# ======================================================
+# Selection
+# ======================================================
+
+def select_candidates(
+    candidates: Iterable[Candidate],
+    limit: Optional[int],
+    policy: str = SEND_ORDER_POLICY,
+    lookahead: int = SEND_CANDIDATE_LOOKAHEAD,
+    today: Optional[date] = None
+) -> List[Candidate]:
+    """
+    The best candidates for this pass, best first.
+
+    Reads every candidate once, keeping only the best `limit * lookahead`
+    in a bounded heap. The spare rows stand in for ones dropped at
+    enqueue time (bad address, already sent) so the budget still fills.
+    """
+    key = sort_key(policy, today or date.today())
+    if limit is None:
+        return sorted(candidates, key=key)
+    return heapq.nsmallest(limit * max(lookahead, 1), candidates, key=key)
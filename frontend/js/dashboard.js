@@ -17,9 +17,13 @@ async function loadUserInfo() {
                 : '❌ Not Connected';
             
             // Sheet status
-            document.getElementById('sheetStatus').innerHTML = user.sheet_id 
-                ? '✅ Connected' 
-                : '❌ Not Connected';
+            document.getElementById('sheetStatus').innerHTML = user.contact_source === 'local'
+                ? '✅ Imported contacts'
+                : user.contact_source === 'file'
+                ? '✅ Contacts file'
+                : user.sheet_id 
+                    ? '✅ Connected' 
+                    : '❌ Not Connected';
             
             // Resume status
             document.getElementById('resumeStatus').innerHTML = user.resume_link 
@@ -64,6 +68,13 @@ async function loadTemplateStatus() {
     }
 }
 
+// Same limit as the API (backend/services/cadence.py)
+const MAX_FOLLOWUP_DELAY_DAYS = 3650;
+
+// Cadence as last loaded: only sent back when the form changes it, and
+// max_emails (not shown in the form) survives a business_days toggle
+let loadedCadence = null;
+
 // Load settings
 async function loadSettings() {
     try {
@@ -75,6 +86,12 @@ async function loadSettings() {
             document.getElementById('resume_link').value = data.resume_link || '';
             document.getElementById('sheet_id').value = data.sheet_id || '';
             document.getElementById('email_subject').value = data.email_subject || '';
+            document.getElementById('timezone').value = data.timezone || Intl.DateTimeFormat().resolvedOptions().timeZone || '';
+            loadedCadence = data.followup_cadence || null;
+            if (loadedCadence) {
+                document.getElementById('followup_delays').value = loadedCadence.delays.join(', ');
+                document.getElementById('followup_business_days').checked = loadedCadence.business_days;
+            }
             document.getElementById('email_template').value = data.email_template || '';
             document.getElementById('followup_template').value = data.followup_template || '';
         }
@@ -90,6 +107,7 @@ async function saveSettings() {
         resume_link: document.getElementById('resume_link').value,
         sheet_id: document.getElementById('sheet_id').value,
         email_subject: document.getElementById('email_subject').value,
+        timezone: document.getElementById('timezone').value.trim(),
         email_template: document.getElementById('email_template').value,
         followup_template: document.getElementById('followup_template').value
     };
@@ -115,6 +133,31 @@ async function saveSettings() {
         return;
     }
 
+    const delays = document.getElementById('followup_delays').value
+        .split(',')
+        .map(days => days.trim())
+        .filter(days => days !== '')
+        .map(Number);
+    const businessDays = document.getElementById('followup_business_days').checked;
+
+    if (delays.some(days => !Number.isInteger(days) || days < 0 || days > MAX_FOLLOWUP_DELAY_DAYS)) {
+        alert('❌ Follow-up delays must be whole numbers of days (at most ' + MAX_FOLLOWUP_DELAY_DAYS + '), e.g. 7, 7, 60, 60');
+        return;
+    }
+
+    const loadedDelays = loadedCadence ? loadedCadence.delays : [];
+    const loadedBusinessDays = loadedCadence ? loadedCadence.business_days : false;
+    const delaysChanged = delays.join(',') !== loadedDelays.join(',');
+
+    if (delaysChanged || businessDays !== loadedBusinessDays) {
+        settings.followup_cadence = {
+            delays: delays,
+            // New delays set the number of emails; otherwise keep the stored one
+            max_emails: !delaysChanged && loadedCadence ? loadedCadence.max_emails : null,
+            business_days: businessDays
+        };
+    }
+
     try {
         const response = await fetch('/user/settings', {
             method: 'POST',
@@ -129,6 +172,9 @@ async function saveSettings() {
 
         if (result.status === 'success') {
             statusElement.innerHTML = '<span style="color: green;">✅ Settings saved!</span>';
+            if (settings.followup_cadence) {
+                await loadSettings();
+            }
             // Reload user info to update status
             await loadUserInfo();
             await loadTemplateStatus();
@@ -146,6 +192,39 @@ async function saveSettings() {
     }
 }
 
+// Import contacts from a CSV / XLSX file
+async function importContacts() {
+    const input = document.getElementById('contacts_file');
+    const statusElement = document.getElementById('importStatus');
+
+    if (!input.files.length) {
+        alert('❌ Choose a .csv or .xlsx file first');
+        return;
+    }
+
+    const form = new FormData();
+    form.append('file', input.files[0]);
+
+    statusElement.innerHTML = '⏳ Importing...';
+    try {
+        const response = await fetch('/contacts/import', {
+            method: 'POST',
+            body: form
+        });
+        const result = await response.json();
+
+        if (response.ok) {
+            statusElement.innerHTML = '<span style="color: green;">✅ ' + result.inserted + ' added, ' + result.updated + ' updated, ' + result.skipped + ' skipped</span>';
+            await loadUserInfo();
+        } else {
+            statusElement.innerHTML = '<span style="color: red;">❌ Error: ' + (result.error || 'Import failed') + '</span>';
+        }
+    } catch (err) {
+        console.error('Error importing contacts:', err);
+        statusElement.innerHTML = '<span style="color: red;">❌ Error importing contacts</span>';
+    }
+}
+
 // Connect Gmail
 function connectGmail() {
     window.location.href = '/auth/gmail/connect';
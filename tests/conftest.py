@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+# Config is read at import time: point everything at throwaway locations first
+_tmp = tempfile.mkdtemp(prefix="outreach-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/test.db")
+os.environ.setdefault("CONTACT_FILE_DIR", f"{_tmp}/contact_files")
+os.environ.setdefault("MX_RESOLVER", "static")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import pytest
+
+from backend.db.database import Base, SessionLocal, engine
+from backend.models import (  # noqa: F401
+    campaign,
+    contact,
+    email_log,
+    gmail_token,
+    processed_message,
+    profiling,
+    reply_check,
+    scheduler_lease,
+    send_job,
+    suppression,
+    user,
+)
+from backend.services.suppression import suppression_index
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(engine)
+    suppression_index._bloom = None
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def make_user(db):
+    def make(email="me@example.com", **fields):
+        account = user.User(email=email, password_hash="x", full_name="Me", **fields)
+        db.add(account)
+        db.commit()
+        return account
+    return make
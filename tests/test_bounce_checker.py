@@ -0,0 +1,68 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from googleapiclient.errors import HttpError
+
+from backend.workers import bounce_checker
+from backend.workers.bounce_checker import SENT_STATUSES, BounceCheckBackoff, bounce_search_since
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def test_first_check_searches_the_whole_window():
+    assert bounce_search_since(None, NOW) == NOW - timedelta(hours=48)
+
+
+def test_later_checks_start_just_before_the_last_one():
+    last_check = NOW - timedelta(hours=2)
+    assert bounce_search_since(last_check, NOW) == last_check - timedelta(minutes=30)
+
+    # A check long ago (backoff at its max) is still capped to the window
+    assert bounce_search_since(NOW - timedelta(days=5), NOW) == NOW - timedelta(hours=48)
+
+
+def test_backoff_remembers_the_last_check():
+    backoff = BounceCheckBackoff(300, 7200)
+    assert backoff.last_checked_at(1) is None
+
+    backoff.record(1, found_bounces=False, now=NOW)
+    assert backoff.last_checked_at(1) == NOW
+
+
+def test_every_follow_up_can_bounce():
+    assert SENT_STATUSES[0] == "SENT"
+    assert "FOLLOWUP_2" in SENT_STATUSES
+    assert "FOLLOWUP_20" in SENT_STATUSES
+
+
+def test_failed_check_keeps_the_search_start():
+    backoff = BounceCheckBackoff(300, 7200)
+    backoff.record(1, found_bounces=False, now=NOW)
+
+    later = NOW + timedelta(minutes=10)
+    backoff.record_failure(1, now=later)
+    assert backoff.last_checked_at(1) == NOW
+    # Still backs off
+    assert not backoff.is_due(1, NOW - timedelta(hours=1), later + timedelta(seconds=300))
+    assert backoff.is_due(1, NOW - timedelta(hours=1), later + timedelta(seconds=1200))
+
+
+def test_list_error_does_not_move_the_search_start(db, make_user, monkeypatch):
+    account = make_user(gmail_token_path="db:1")
+    backoff = BounceCheckBackoff(300, 7200)
+    last_check = datetime.utcnow() - timedelta(hours=1)
+    backoff.record(account.id, found_bounces=False, now=last_check)
+    searched = []
+
+    def failing_check(db, user, sheet_ids, api_calls, since):
+        searched.append(since)
+        raise HttpError(resp=type("Resp", (), {"status": 500, "reason": "error"})(), content=b"")
+
+    monkeypatch.setattr(bounce_checker, "bounce_backoff", backoff)
+    monkeypatch.setattr(bounce_checker, "campaign_list_ids", lambda db, user: ["sheet"])
+    monkeypatch.setattr(bounce_checker, "check_bounces", failing_check)
+
+    assert bounce_checker.check_user_bounces(account.id, Counter()) is None
+    assert bounce_checker.check_user_bounces(account.id, Counter()) is None
+    assert backoff.last_checked_at(account.id) == last_check
+    assert searched == [last_check - timedelta(minutes=30)] * 2
@@ -0,0 +1,155 @@
+import multiprocessing
+
+import pytest
+
+from backend.services import contact_sources
+from backend.services.contact_sources import (
+    BOUNCED,
+    REPLIED,
+    BaseContactSource,
+    FileContactSource,
+    MemoryContactSource,
+    RowUpdate,
+    SheetsContactSource,
+    write_contacts_file,
+)
+
+
+def _file_source(tmp_path, count=4):
+    path = tmp_path / "contacts.csv"
+    write_contacts_file(path, [[f"c{i}@example.com", f"C{i}"] for i in range(count)])
+    return FileContactSource(path, "file:1")
+
+
+def _rows(source):
+    return {row_number: row for row_number, row in source.iter_rows()}
+
+
+def test_base_source_requires_read_and_apply():
+    class Incomplete(BaseContactSource):
+        def read_batch(self, after_row, limit, due_only=False, sent_only=False):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_file_source_reads_due_rows_and_finds_emails(tmp_path):
+    source = _file_source(tmp_path)
+    assert [row_number for row_number, _ in source.iter_rows(due_only=True)] == [2, 3, 4, 5]
+    assert source.find_rows(["C2@example.com"])["c2@example.com"][0] == 4
+    assert source.read_batch(3, 2) == [(4, ["c2@example.com", "C2"]), (5, ["c3@example.com", "C3"])]
+
+
+def test_file_source_apply_patches_only_the_given_rows(tmp_path):
+    source = _file_source(tmp_path)
+    source.apply([RowUpdate(2, BOUNCED, error="gone"), RowUpdate(4, REPLIED)])
+
+    rows = _rows(source)
+    assert rows[2][5] == "TRUE" and rows[2][10] == "gone"
+    assert rows[4][4] == "TRUE"
+    assert rows[3] == ["c1@example.com", "C1"]
+    assert [row_number for row_number, _ in source.iter_rows(due_only=True)] == [3, 5]
+
+
+def test_held_sent_marks_are_written_once_on_flush(tmp_path, monkeypatch):
+    source = _file_source(tmp_path)
+    writes = []
+    apply = source.apply
+    monkeypatch.setattr(source, "apply", lambda updates: (writes.append(list(updates)), apply(writes[-1])))
+
+    source.hold_sent_marks()
+    source.mark_sent(2, 1)
+    source.mark_sent(3, 1)
+    assert writes == []
+    assert _rows(source)[2] == ["c0@example.com", "C0"]
+
+    source.flush()
+    assert len(writes) == 1
+    rows = _rows(source)
+    assert rows[2][3] == "Sent" and rows[3][6] == "1"
+
+    # No longer holding: marks go straight out
+    source.mark_sent(4, 1)
+    assert len(writes) == 2
+
+
+def test_memory_source_holds_marks_too():
+    source = MemoryContactSource([["a@example.com"]])
+    source.hold_sent_marks()
+    source.mark_sent(2, 1)
+    assert len(source.rows[0]) == 1
+    source.flush()
+    assert source.rows[0][6] == "1"
+
+
+def _mark_rows(path, rows):
+    source = FileContactSource(path, "file:1")
+    for row_number in rows:
+        source.mark_replied(row_number)
+
+
+def test_concurrent_writers_in_separate_processes_keep_every_update(tmp_path):
+    source = _file_source(tmp_path, count=40)
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_mark_rows, args=(source.path, range(start, 42, 2)))
+        for start in (2, 3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    assert all(row[4] == "TRUE" for row in _rows(source).values())
+
+
+class FakeSheet:
+    """The three Sheets helpers SheetsContactSource calls, over a list of rows"""
+
+    def __init__(self, monkeypatch, rows):
+        self.rows = rows
+        self.writes = []
+        monkeypatch.setattr(contact_sources, "read_all_rows", lambda sheet_id, sheet_name: [list(r) for r in self.rows])
+        monkeypatch.setattr(contact_sources, "read_cells", self.read_cells)
+        monkeypatch.setattr(contact_sources, "update_cells", lambda sheet_id, cells, sheet_name: self.writes.extend(cells))
+
+    def read_cells(self, sheet_id, cells, sheet_name):
+        indexes = [int(cell[1:]) - 2 for cell in cells]
+        return [self.rows[index][0] if index < len(self.rows) else "" for index in indexes]
+
+
+def test_snapshot_writes_follow_contacts_that_moved(monkeypatch):
+    sheet = FakeSheet(monkeypatch, [["a@example.com", "A"], ["b@example.com", "B"]])
+    source = SheetsContactSource("SHEET", verify_rows=True)
+    list(source.iter_rows())
+
+    # A row is inserted above both contacts after the snapshot was read
+    sheet.rows.insert(0, ["new@example.com", "New"])
+    source.apply([RowUpdate(3, REPLIED)])
+
+    assert sheet.writes == [(4, "E", "TRUE")]
+    assert source.find_rows(["b@example.com"])["b@example.com"][0] == 4
+
+
+def test_snapshot_drops_writes_for_deleted_contacts(monkeypatch):
+    sheet = FakeSheet(monkeypatch, [["a@example.com", "A"], ["b@example.com", "B"]])
+    source = SheetsContactSource("SHEET", verify_rows=True)
+    list(source.iter_rows())
+
+    del sheet.rows[0]
+    source.apply([RowUpdate(2, REPLIED), RowUpdate(3, REPLIED)])
+
+    assert sheet.writes == [(2, "E", "TRUE")]
+
+
+def test_unchanged_sheet_costs_one_check(monkeypatch):
+    sheet = FakeSheet(monkeypatch, [["a@example.com", "A"], ["b@example.com", "B"]])
+    source = SheetsContactSource("SHEET", verify_rows=True)
+    list(source.iter_rows())
+
+    source.apply([RowUpdate(2, REPLIED)])
+
+    assert sheet.writes == [(2, "E", "TRUE")]
+    assert source.api_calls["sheets"] == 3  # read, check, write
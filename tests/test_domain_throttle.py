@@ -0,0 +1,20 @@
+from datetime import datetime, timedelta
+
+from backend.workers.domain_throttle import DomainThrottle
+
+
+def test_load_picks_up_other_nodes_sends():
+    throttle = DomainThrottle(hourly_cap=2, cooldown_seconds=60, provider_hourly_cap=10, provider_cooldown_seconds=0)
+    now = datetime(2026, 10, 19, 9, 0)
+
+    throttle.load(1, [])
+    throttle.record(1, "a@acme.com", now - timedelta(minutes=30))
+    assert throttle.next_allowed(1, "b@acme.com", now) == now
+
+    # Another node sent to acme.com while it held the lease
+    throttle.load(1, [
+        ("a@acme.com", now - timedelta(minutes=30)),
+        ("c@acme.com", now - timedelta(seconds=10)),
+    ])
+    # Cooldown since the other node's send, and the hourly cap is reached
+    assert throttle.next_allowed(1, "b@acme.com", now) == now + timedelta(minutes=30)
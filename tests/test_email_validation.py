@@ -0,0 +1,91 @@
+from backend.services.email_validation import (
+    HAS_MAIL,
+    NO_MAIL,
+    UNKNOWN,
+    EmailValidator,
+    StaticMxResolver,
+    TtlCache,
+    syntax_error,
+)
+
+
+class CountingResolver(StaticMxResolver):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookups = []
+
+    def lookup(self, domain: str) -> str:
+        self.lookups.append(domain)
+        return super().lookup(domain)
+
+
+def _validator(resolver, **kwargs):
+    return EmailValidator(resolver, TtlCache(100), 3600, 600, canary_domain=None, **kwargs)
+
+
+def test_syntax():
+    assert syntax_error("jane.doe+tag@example.com") is None
+    assert syntax_error('"jane doe"@example.com') is None
+    assert syntax_error("jane..doe@example.com") == "bad local part"
+    assert syntax_error("jane@localhost") == "bad domain"
+    assert syntax_error("jane") == "missing @"
+
+
+def test_internationalized_local_parts_are_valid():
+    assert syntax_error("josé@example.com") is None
+    assert syntax_error("用户@例子.广告") is None
+    assert syntax_error("jo sé@example.com") == "bad local part"
+
+    validator = _validator(StaticMxResolver())
+    assert validator.validate("müller@example.de") is None
+
+
+def test_domain_without_mail_is_invalid_and_cached():
+    resolver = CountingResolver({"bad.example": NO_MAIL})
+    validator = _validator(resolver)
+
+    assert validator.validate("a@bad.example") == "Invalid address: domain does not accept mail"
+    assert validator.validate("b@BAD.example") is not None
+    assert validator.validate("c@good.example") is None
+    assert resolver.lookups == ["bad.example", "good.example"]
+
+
+def test_lookup_failures_never_invalidate():
+    validator = _validator(StaticMxResolver({"flaky.example": UNKNOWN}))
+    assert validator.validate("a@flaky.example") is None
+
+
+def test_unreliable_resolver_is_detected_by_the_canary():
+    resolver = StaticMxResolver({"gmail.com": UNKNOWN}, default=NO_MAIL)
+    validator = EmailValidator(resolver, TtlCache(100), 3600, 600, canary_domain="gmail.com")
+    assert validator.validate("a@example.com") is None
+
+
+def test_breaker_stops_lookups_after_consecutive_failures():
+    resolver = CountingResolver(default=UNKNOWN)
+    validator = _validator(resolver, breaker_failures=3, breaker_cooloff_seconds=60)
+
+    for i in range(10):
+        assert validator.validate(f"user@domain{i}.example") is None
+    assert len(resolver.lookups) == 3
+
+    # Cool-off over: lookups resume, and a success resets the count
+    validator._suspended_until = 0
+    resolver.default = HAS_MAIL
+    assert validator.validate("user@fresh.example") is None
+    assert resolver.lookups[-1] == "fresh.example"
+    assert validator._failures == 0
+
+
+def test_breaker_counts_only_consecutive_failures():
+    resolver = CountingResolver({"ok1.example": HAS_MAIL, "ok2.example": HAS_MAIL}, default=UNKNOWN)
+    validator = _validator(resolver, breaker_failures=2)
+
+    for domain in ("bad1.example", "ok1.example", "bad2.example", "ok2.example", "bad3.example"):
+        validator.validate(f"user@{domain}")
+    assert len(resolver.lookups) == 5
+
+
+def test_disabled_validator_accepts_anything():
+    validator = _validator(StaticMxResolver(default=NO_MAIL), enabled=False)
+    assert validator.validate("not an address") is None
@@ -0,0 +1,75 @@
+from backend.auth import passwords
+from backend.auth.passwords import LoginThrottle
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _throttle(monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(passwords.time, "monotonic", clock)
+    return LoginThrottle(3, 60, **kwargs), clock
+
+
+def test_blocks_after_max_failures_until_the_window_ends(monkeypatch):
+    throttle, clock = _throttle(monkeypatch)
+    for _ in range(3):
+        assert not throttle.is_blocked("a@example.com")
+        throttle.record_failure("a@example.com")
+    assert throttle.is_blocked("a@example.com")
+
+    clock.now += 61
+    assert not throttle.is_blocked("a@example.com")
+
+
+def test_expired_entries_are_evicted_without_being_looked_up(monkeypatch):
+    throttle, clock = _throttle(monkeypatch)
+    for i in range(100):
+        throttle.record_failure(f"user{i}@example.com")
+
+    clock.now += 61
+    throttle.record_failure("late@example.com")
+    assert list(throttle._failures) == ["late@example.com"]
+
+
+def test_size_is_capped_oldest_first(monkeypatch):
+    throttle, clock = _throttle(monkeypatch, max_keys=10)
+    throttle.record_failure("target@example.com")
+    for i in range(20):
+        clock.now += 1
+        throttle.record_failure(f"user{i}@example.com")
+
+    assert len(throttle._failures) == 10
+    assert "target@example.com" not in throttle._failures
+    assert "user19@example.com" in throttle._failures
+
+
+def test_restarted_window_moves_the_key_to_the_back(monkeypatch):
+    throttle, clock = _throttle(monkeypatch)
+    throttle.record_failure("a@example.com")
+    clock.now += 30
+    throttle.record_failure("b@example.com")
+    clock.now += 31
+    throttle.record_failure("a@example.com")  # a's old window is over
+
+    assert list(throttle._failures) == ["b@example.com", "a@example.com"]
+    assert throttle._failures["a@example.com"] == (1, clock.now)
+
+
+def test_flood_cannot_lift_a_lockout(monkeypatch):
+    throttle, clock = _throttle(monkeypatch, max_keys=10)
+    for _ in range(3):
+        throttle.record_failure("target@example.com")
+    for i in range(100):
+        throttle.record_failure(f"made-up{i}@example.com")
+
+    assert len(throttle._failures) == 10
+    assert throttle.is_blocked("target@example.com")
+
+    clock.now += 61
+    assert not throttle.is_blocked("target@example.com")
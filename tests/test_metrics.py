@@ -0,0 +1,37 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from backend.services import metrics
+
+
+def _get(server, token=None):
+    request = urllib.request.Request(f"http://127.0.0.1:{server.server_address[1]}/metrics")
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+@pytest.fixture
+def worker_server():
+    server = metrics.start_metrics_server(0)
+    yield server
+    server.shutdown()
+
+
+def test_worker_exporter_needs_a_configured_token(worker_server, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", None)
+    assert _get(worker_server) == 403
+    assert _get(worker_server, "anything") == 403
+
+
+def test_worker_exporter_checks_the_bearer_token(worker_server, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "secret")
+    assert _get(worker_server) == 401
+    assert _get(worker_server, "wrong") == 401
+    assert _get(worker_server, "secret") == 200
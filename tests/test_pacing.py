@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from backend.workers.pacing import SendPacer, SendWindow, local_day_start, parse_weekdays
+
+
+def _user(timezone=None):
+    return SimpleNamespace(id=1, timezone=timezone)
+
+
+def test_day_starts_at_the_users_midnight():
+    now = datetime(2026, 10, 19, 3, 30)  # UTC
+
+    assert local_day_start(_user(), now) == datetime(2026, 10, 19, 0, 0)
+    # 23:30 on the 18th in New York (UTC-4)
+    assert local_day_start(_user("America/New_York"), now) == datetime(2026, 10, 18, 4, 0)
+    # 12:30 on the 19th in Tokyo (UTC+9)
+    assert local_day_start(_user("Asia/Tokyo"), now) == datetime(2026, 10, 18, 15, 0)
+
+
+def test_default_window_is_always_open():
+    window = SendWindow(0, 0, parse_weekdays(""))
+    assert window.always_open
+
+    pacer = SendPacer(window, daily_limit=50, min_delay_seconds=120, max_delay_seconds=300, jitter=0.3)
+    saturday_night = datetime(2026, 10, 17, 23, 0)
+    assert pacer.is_due(_user(), saturday_night)
+
+    # No window to spread across: only the MIN/MAX delay applies
+    next_at = pacer.record_send(_user(), sent_today=1, now=saturday_night)
+    assert timedelta(seconds=120) <= next_at - saturday_night <= timedelta(seconds=300)
+
+
+def test_quota_used_up_waits_for_the_users_midnight():
+    pacer = SendPacer(SendWindow(0, 0, parse_weekdays("")), 50, 0, 0, 0)
+    now = datetime(2026, 10, 19, 3, 30)
+
+    assert pacer.defer_to_next_window(_user("America/New_York"), now) == datetime(2026, 10, 19, 4, 0)
+
+
+def test_business_hours_window_spreads_the_quota():
+    window = SendWindow(9, 17, parse_weekdays("0-4"))
+    assert not window.always_open
+
+    pacer = SendPacer(window, daily_limit=10, min_delay_seconds=1, max_delay_seconds=1, jitter=0)
+    monday_9am = datetime(2026, 10, 19, 9, 0)
+    assert not pacer.is_due(_user(), datetime(2026, 10, 18, 12, 0))
+
+    # 8 hours left, 8 emails left
+    assert pacer.record_send(_user(), sent_today=2, now=monday_9am) == monday_9am + timedelta(hours=1)
+
+
+def test_sync_paces_from_another_nodes_send():
+    pacer = SendPacer(SendWindow(0, 0, parse_weekdays("")), 50, 120, 120, 0)
+    user = _user()
+    first = datetime(2026, 10, 19, 9, 0)
+
+    # Never sent: due straight away
+    pacer.sync(user, None, 0)
+    assert pacer.is_due(user, first)
+
+    # This node's own send is already paced for
+    own_slot = pacer.record_send(user, sent_today=1, now=first)
+    pacer.sync(user, first, 1)
+    assert pacer.next_send_at(user.id) == own_slot
+
+    # Another node sent later while holding the lease
+    other = first + timedelta(minutes=10)
+    pacer.sync(user, other, 2)
+    assert pacer.next_send_at(user.id) == other + timedelta(seconds=120)
+    assert not pacer.is_due(user, other + timedelta(seconds=60))
@@ -0,0 +1,21 @@
+from backend.services.profiler import ProfilingSwitch
+
+
+def test_flag_is_never_read_without_the_runtime_switch(monkeypatch):
+    switch = ProfilingSwitch(env_enabled=False, runtime_switch=False)
+    monkeypatch.setattr(switch, "_read_flag", lambda: _fail_on_read())
+    assert not switch.is_enabled()
+
+
+def test_runtime_flag_is_cached(monkeypatch):
+    switch = ProfilingSwitch(env_enabled=False, runtime_switch=True)
+    reads = []
+    monkeypatch.setattr(switch, "_read_flag", lambda: reads.append(1) or True)
+
+    assert switch.is_enabled()
+    assert switch.is_enabled()
+    assert reads == [1]
+
+
+def _fail_on_read():
+    raise AssertionError("runtime flag read")
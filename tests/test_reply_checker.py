@@ -0,0 +1,58 @@
+from datetime import date, datetime, timedelta
+
+from backend.models.reply_check import ReplyCheckProgress
+from backend.models.scheduler_lease import SchedulerNode
+from backend.workers.leasing import lease_manager
+from backend.workers.reply_checker import DONE, FAILED, RUNNING, TIMED_OUT, claim_user
+
+TODAY = date(2026, 10, 19)
+
+
+def _progress(db, user_id, status, owner="other-node", started_ago=timedelta(seconds=30), next_row=40):
+    db.add(ReplyCheckProgress(
+        user_id=user_id,
+        run_date=TODAY,
+        status=status,
+        list_id="SHEET",
+        next_row=next_row,
+        owner=owner,
+        started_at=datetime.utcnow() - started_ago,
+    ))
+    db.commit()
+
+
+def test_first_claim_starts_at_the_top(db, make_user):
+    account = make_user()
+    assert claim_user(db, account.id, TODAY, lease_manager.owner) == (None, 2)
+
+
+def test_running_check_of_a_live_node_is_left_alone(db, make_user):
+    account = make_user()
+    _progress(db, account.id, RUNNING)
+    db.add(SchedulerNode(owner="other-node", expires_at=datetime.utcnow() + timedelta(minutes=1)))
+    db.commit()
+
+    assert claim_user(db, account.id, TODAY, lease_manager.owner) is None
+
+
+def test_running_check_of_a_dead_node_resumes_from_its_checkpoint(db, make_user):
+    account = make_user()
+    _progress(db, account.id, RUNNING)
+    db.add(SchedulerNode(owner="other-node", expires_at=datetime.utcnow() - timedelta(minutes=1)))
+    db.commit()
+
+    assert claim_user(db, account.id, TODAY, lease_manager.owner) == ("SHEET", 40)
+
+
+def test_timed_out_and_failed_checks_resume_the_same_day(db, make_user):
+    for status in (TIMED_OUT, FAILED):
+        account = make_user(email=f"{status}@example.com")
+        _progress(db, account.id, status)
+        assert claim_user(db, account.id, TODAY, lease_manager.owner) == ("SHEET", 40)
+
+
+def test_finished_check_is_not_repeated_the_same_day(db, make_user):
+    account = make_user()
+    _progress(db, account.id, DONE)
+    assert claim_user(db, account.id, TODAY, lease_manager.owner) is None
+    assert claim_user(db, account.id, TODAY + timedelta(days=1), lease_manager.owner) == (None, 2)
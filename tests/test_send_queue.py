@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+from backend.models.send_job import SendJob
+from backend.services.send_queue import DEAD, DONE, PENDING, SendQueue
+
+OWNER = "node-1"
+
+
+def _queue():
+    return SendQueue(max_attempts=3, claim_ttl_seconds=60, retry_backoff_seconds=300)
+
+
+def _enqueue(db, queue, user_id, email="lead@example.com"):
+    return queue.enqueue(db, user_id, "SHEET", 2, email, 1)
+
+
+def _attempt(db, queue, user_id, error, permanent=False):
+    """Claim the user's due job, try it, fail it"""
+    (job,) = queue.claim_batch(db, user_id, OWNER, 10)
+    queue.mark_sending(db, job)
+    queue.fail(db, job, error, permanent=permanent)
+    return job
+
+
+def test_enqueue_is_idempotent(db, make_user):
+    account = make_user()
+    queue = _queue()
+    assert _enqueue(db, queue, account.id).id == _enqueue(db, queue, account.id).id
+    assert db.query(SendJob).count() == 1
+
+
+def test_failures_back_off_exponentially_then_dead_letter(db, make_user):
+    account = make_user()
+    queue = _queue()
+    job = _enqueue(db, queue, account.id)
+
+    before = datetime.utcnow()
+    _attempt(db, queue, account.id, "timeout")
+    assert (job.status, job.attempts) == (PENDING, 1)
+    assert job.available_at >= before + timedelta(seconds=300)
+    # Not claimable until the backoff is over
+    assert queue.claim_batch(db, account.id, OWNER, 10) == []
+
+    job.available_at = datetime.utcnow()
+    db.commit()
+    before = datetime.utcnow()
+    _attempt(db, queue, account.id, "timeout")
+    assert (job.status, job.attempts) == (PENDING, 2)
+    assert job.available_at >= before + timedelta(seconds=600)
+
+    job.available_at = datetime.utcnow()
+    db.commit()
+    _attempt(db, queue, account.id, "timeout")
+    assert (job.status, job.attempts, job.permanent) == (DEAD, 3, False)
+    assert job.last_error == "timeout"
+
+
+def test_permanent_failures_dead_letter_at_once(db, make_user):
+    account = make_user()
+    queue = _queue()
+    job = _enqueue(db, queue, account.id)
+
+    _attempt(db, queue, account.id, "550 no such user", permanent=True)
+    assert (job.status, job.attempts, job.permanent) == (DEAD, 1, True)
+
+
+def test_interrupted_sends_are_dead_lettered_for_good(db, make_user):
+    account = make_user()
+    queue = _queue()
+    sending = _enqueue(db, queue, account.id, "a@example.com")
+    claimed = _enqueue(db, queue, account.id, "b@example.com")
+    queue.claim_batch(db, account.id, "crashed-node", 10)
+    queue.mark_sending(db, sending)
+
+    assert queue.recover_stale(db, account.id, OWNER) == 2
+    assert (sending.status, sending.permanent) == (DEAD, True)
+    assert claimed.status == PENDING
+
+
+def test_requeue_revives_only_exhausted_jobs(db, make_user):
+    account = make_user()
+    other = make_user(email="other@example.com")
+    queue = SendQueue(max_attempts=1, claim_ttl_seconds=60, retry_backoff_seconds=300)
+
+    exhausted = _enqueue(db, queue, account.id, "a@example.com")
+    _attempt(db, queue, account.id, "timeout")
+    bounced = _enqueue(db, queue, account.id, "b@example.com")
+    _attempt(db, queue, account.id, "550 no such user", permanent=True)
+    elsewhere = _enqueue(db, queue, other.id, "c@example.com")
+    _attempt(db, queue, other.id, "timeout")
+
+    assert queue.requeue_dead(db, account.id) == 1
+    db.refresh(exhausted)
+    db.refresh(bounced)
+    db.refresh(elsewhere)
+    assert (exhausted.status, exhausted.attempts, exhausted.completed_at) == (PENDING, 0, None)
+    assert bounced.status == DEAD
+    assert elsewhere.status == DEAD
+
+    # Claimable straight away, and it gets the full set of attempts again
+    (job,) = queue.claim_batch(db, account.id, OWNER, 10)
+    queue.mark_sending(db, job)
+    queue.ack(db, job)
+    assert (job.status, job.attempts) == (DONE, 1)
+
+    assert queue.requeue_dead(db) == 1
+    db.refresh(elsewhere)
+    assert elsewhere.status == PENDING
@@ -0,0 +1,106 @@
+from backend.models.campaign import Campaign
+from backend.models.send_job import SendJob
+from backend.services.contact_sources import MemoryContactSource
+from backend.services.campaigns import campaign_cache
+from backend.services.send_queue import DEAD, make_idempotency_key
+from backend.services.suppression import BOUNCED, CONTACTED, suppression_index
+from backend.workers.scheduler import _park_orphaned_job, select_rows
+from backend.workers.send_order import select_candidates
+
+
+def _dead_job(db, user_id, list_id, row_number, email):
+    db.add(SendJob(
+        user_id=user_id,
+        sheet_id=list_id,
+        row_number=row_number,
+        to_email=email,
+        followup_count=1,
+        idempotency_key=make_idempotency_key(list_id, row_number, 1, email),
+        status=DEAD,
+        attempts=3,
+    ))
+
+
+def test_dead_rows_do_not_starve_fresh_rows(db, make_user):
+    account = make_user()
+    limit = 5
+    dead = limit * 3 + 10
+
+    # Dead rows first in the sheet, long overdue: they rank ahead of everything
+    rows = [[f"dead{i}@d{i}.example", "Dead", "", "", "", "", "", "", "2020-01-01"] for i in range(dead)]
+    rows += [[f"fresh{i}@f{i}.example", "Fresh"] for i in range(limit)]
+    contacts = MemoryContactSource(rows)
+    for i in range(dead):
+        _dead_job(db, account.id, contacts.list_id, i + 2, f"dead{i}@d{i}.example")
+    db.commit()
+
+    selected = select_rows(db, account, contacts, contacts.iter_rows(due_only=True), limit)
+
+    assert sorted(c.email for c in selected) == sorted(f"fresh{i}@f{i}.example" for i in range(limit))
+
+
+def test_duplicate_initial_is_dropped_before_ranking(db, make_user):
+    account = make_user()
+    suppression_index.add(db, account.id, "twice@example.com", CONTACTED)
+    db.commit()
+
+    contacts = MemoryContactSource([["twice@example.com", "A"], ["once@example.com", "B"]])
+    selected = select_rows(db, account, contacts, contacts.iter_rows(due_only=True), 1)
+
+    assert [c.email for c in selected] == ["once@example.com"]
+
+
+def test_invalid_addresses_are_suppressed_even_if_the_sheet_write_fails(db, make_user, monkeypatch):
+    account = make_user()
+    other = make_user(email="other@example.com")
+    contacts = MemoryContactSource([["broken@@example.com", "A"], ["ok@example.com", "B"]])
+
+    def failing_apply(updates):
+        raise RuntimeError("sheet unavailable")
+
+    monkeypatch.setattr(contacts, "apply", failing_apply)
+    selected = select_rows(db, account, contacts, contacts.iter_rows(due_only=True), 5)
+
+    assert [c.email for c in selected] == ["ok@example.com"]
+    assert suppression_index.check(db, other.id, "broken@@example.com") == BOUNCED
+
+
+def test_select_candidates_keeps_lookahead(db):
+    from backend.workers.domain_throttle import Candidate
+
+    candidates = [Candidate(row, f"a{row}@x{row}.example", "", "", 1) for row in range(2, 50)]
+    assert len(select_candidates(candidates, 4, policy="sheet", lookahead=3)) == 12
+
+
+def _claimed_job(db, user_id, campaign_id):
+    job = SendJob(
+        user_id=user_id,
+        campaign_id=campaign_id,
+        sheet_id="SHEET",
+        row_number=2,
+        to_email="lead@example.com",
+        followup_count=1,
+        idempotency_key=make_idempotency_key("SHEET", 2, 1, f"lead{campaign_id}@example.com"),
+        status="CLAIMED",
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_jobs_of_inactive_campaigns_leave_the_queue(db, make_user):
+    account = make_user()
+    paused = Campaign(user_id=account.id, name="Paused", sheet_id="OTHER", contact_source="sheets", is_paused=True)
+    db.add(paused)
+    db.commit()
+    campaign_cache.invalidate(account.id)
+
+    # Paused: dropped, to be queued again from the sheet on resume
+    job = _claimed_job(db, account.id, paused.id)
+    _park_orphaned_job(db, account, job)
+    assert db.query(SendJob).count() == 0
+
+    # Deleted (the user's own list, here: no sheet set any more): dead-lettered
+    job = _claimed_job(db, account.id, None)
+    _park_orphaned_job(db, account, job)
+    assert (job.status, job.last_error) == (DEAD, "Campaign deleted")
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from backend.api.contacts import UnsubscribeRequest, unsubscribe
+from backend.services.suppression import (
+    CONTACTED,
+    UNSUBSCRIBED,
+    BloomFilter,
+    email_hash,
+    suppression_index,
+)
+
+
+def test_bloom_counts_only_new_hashes():
+    bloom = BloomFilter(100, 0.01)
+    hashes = [email_hash(f"user{i}@example.com") for i in range(10)]
+
+    assert all(bloom.add(hex_hash) for hex_hash in hashes)
+    assert not any(bloom.add(hex_hash) for hex_hash in hashes)
+    assert bloom.count == 10
+    assert all(hex_hash in bloom for hex_hash in hashes)
+
+
+def test_refresh_overlap_does_not_fill_the_filter(db, make_user):
+    account = make_user()
+    for i in range(5):
+        suppression_index.add(db, account.id, f"user{i}@example.com", CONTACTED)
+    db.commit()
+
+    suppression_index._ensure_fresh(db)
+    for _ in range(3):
+        suppression_index._refreshed_at = 0
+        suppression_index._ensure_fresh(db)
+    assert suppression_index._bloom.count == 5
+
+
+def test_contacted_only_blocks_that_users_initial_email(db, make_user):
+    me = make_user()
+    other = make_user(email="other@example.com")
+    suppression_index.add(db, me.id, "lead@example.com", CONTACTED)
+    db.commit()
+
+    assert suppression_index.check(db, me.id, "lead@example.com", initial=True) == CONTACTED
+    assert suppression_index.check(db, me.id, "lead@example.com") is None
+    assert suppression_index.check(db, other.id, "lead@example.com", initial=True) is None
+
+
+def test_unsubscribe_is_admin_only(db, make_user):
+    account = make_user()
+    admin = make_user(email="admin@example.com", is_admin=True)
+    payload = UnsubscribeRequest(email="Lead@Example.com")
+
+    response = unsubscribe(payload, SimpleNamespace(session={"user_id": account.id}), db)
+    assert response.status_code == 403
+    assert suppression_index.check(db, account.id, "lead@example.com") is None
+
+    session = {"user_id": admin.id, "is_admin": True}
+    assert unsubscribe(payload, SimpleNamespace(session=session), db) == {"status": "success"}
+    assert suppression_index.check(db, account.id, "lead@example.com") == UNSUBSCRIBED
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from backend.models.user import User
+from backend.services.token_store import DbTokenStore, FileTokenStore, TokenStore
+from backend.tools.import_gmail_tokens import import_file_tokens
+
+TOKEN = json.dumps({"token": "t", "refresh_token": "r"})
+
+
+def test_token_store_requires_load_save_and_location():
+    class Incomplete(TokenStore):
+        def load(self, user_id):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_file_tokens_are_imported_once(db, make_user, tmp_path):
+    files = FileTokenStore(tmp_path)
+    with_file = make_user(email="a@example.com")
+    already = make_user(email="b@example.com")
+    make_user(email="c@example.com")  # never connected Gmail
+
+    files.save(with_file.id, TOKEN)
+    with_file.gmail_token_path = files.location(with_file.id)
+    # Plain JSON, as written before tokens were encrypted
+    files.path_for(already.id).write_text(TOKEN)
+    DbTokenStore().save(already.id, json.dumps({"token": "newer"}))
+    db.commit()
+
+    assert import_file_tokens(db, tmp_path, dry_run=True) == {"imported": 1, "already_in_db": 1}
+    assert DbTokenStore().load(with_file.id) is None
+
+    assert import_file_tokens(db, tmp_path) == {"imported": 1, "already_in_db": 1}
+    assert DbTokenStore().load(with_file.id) == TOKEN
+    assert DbTokenStore().load(already.id) == json.dumps({"token": "newer"})
+    assert db.get(User, with_file.id).gmail_token_path == f"db:gmail_tokens/{with_file.id}"
+
+    assert import_file_tokens(db, tmp_path) == {"already_in_db": 2}